@@ -1,13 +1,15 @@
 """Dashboard de partidos en vivo con predicciones"""
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 import time
 
 from config import config
 from src.data.api_consumer import FootballAPI7Consumer
 from src.data.primatips_scraper import PrimaTipsScraper
-from src.utils.match_matcher import enrich_matches_with_predictions
+from src.utils.http import PooledSession
+from src.utils.logger import request_metrics, setup_logging
+from src.utils.replay import use_transport
+from src.utils.match_matcher import CandidateFilter, MatchLinkCache, enrich_matches_with_predictions
 
 # Configuración de la página
 st.set_page_config(
@@ -17,6 +19,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+setup_logging(config.LOG_LEVEL)
+
 # CSS personalizado
 st.markdown("""
 <style>
@@ -116,13 +120,44 @@ def get_api_clients():
         st.error("❌ API Key no configurada. Por favor configura FOOTBALL_API_KEY en tu archivo .env")
         st.stop()
     
-    football_api = FootballAPI7Consumer(api_key)
-    primatips = PrimaTipsScraper()
+    # Un único pool de conexiones (keep-alive) compartido por ambos clientes
+    session = PooledSession(
+        pool_maxsize=config.HTTP_POOL_SIZE,
+        pool_block=config.HTTP_POOL_BLOCK,
+        max_retries=config.HTTP_MAX_RETRIES,
+        backoff_factor=config.HTTP_BACKOFF_FACTOR
+    )
+    use_transport(session, config.HTTP_TRANSPORT_MODE, config.HTTP_RECORDINGS_DIR)
+    football_api = FootballAPI7Consumer(
+        api_key,
+        session=session,
+        max_workers=config.FETCH_MAX_WORKERS,
+        rate_limit_per_minute=config.API_RATE_LIMIT_PER_MIN,
+        rate_limit_burst=config.API_RATE_LIMIT_BURST,
+        max_rate_limit_retries=config.API_MAX_429_RETRIES,
+        snapshot_ttl=config.MATCHES_SNAPSHOT_TTL,
+        stream_parse=config.API_STREAM_PARSE,
+        base_url=config.FOOTBALL_API_URL
+    )
+    primatips = PrimaTipsScraper(session=session, max_workers=config.FETCH_MAX_WORKERS,
+                                 base_url=config.PRIMATIPS_URL, parser=config.PRIMATIPS_PARSER,
+                                 cache_dir=config.PRIMATIPS_CACHE_DIR)
     
     return football_api, primatips
 
 football_api, primatips = get_api_clients()
 
+@st.cache_resource
+def get_match_link_cache():
+    return MatchLinkCache()
+
+candidate_filter = CandidateFilter(
+    date_tolerance_days=config.MATCH_DATE_TOLERANCE_DAYS,
+    kickoff_tolerance_minutes=config.MATCH_KICKOFF_TOLERANCE_MIN,
+    score_tolerance=config.MATCH_SCORE_TOLERANCE,
+    minute_tolerance=config.MATCH_MINUTE_TOLERANCE
+)
+
 # Obtener datos
 @st.cache_data(ttl=config.REFRESH_INTERVAL)
 def fetch_data(date_str, only_live, include_predictions):
@@ -140,7 +175,11 @@ def fetch_data(date_str, only_live, include_predictions):
             predictions = primatips.get_predictions_by_date(primatips_date)
             
             # Enriquecer partidos con predicciones
-            matches = enrich_matches_with_predictions(matches, predictions)
+            matches = enrich_matches_with_predictions(
+                matches, predictions,
+                cache=get_match_link_cache(),
+                candidate_filter=candidate_filter
+            )
     else:
         # Sin predicciones
         for match in matches:
@@ -150,6 +189,23 @@ def fetch_data(date_str, only_live, include_predictions):
 
 matches = fetch_data(date_str, show_only_live, show_predictions)
 
+with st.sidebar:
+    with st.expander("📡 Conexiones HTTP"):
+        # Peticiones y latencias por endpoint; por host, solo la reutilización de conexiones
+        for endpoint, stats in request_metrics.summary().items():
+            retries = sum(stats['retries'].values())
+            st.caption(
+                f"**/{endpoint}**: {stats['requests']} peticiones, "
+                f"p50 ≤ {stats['p50_latency_ms']} ms, p95 ≤ {stats['p95_latency_ms']} ms, "
+                f"{stats['bytes'] / 1e6:.1f} MB, estados {stats['status']}, {retries} reintentos, "
+                f"{stats['items']} elementos, parseo {stats['avg_parse_ms']} ms promedio"
+            )
+        for host, stats in football_api.session.stats().items():
+            st.caption(
+                f"**{host}**: {stats['connections']} conexiones TCP abiertas, "
+                f"{stats['reused']} peticiones por conexión reutilizada"
+            )
+
 # Métricas generales
 col1, col2, col3, col4, col5 = st.columns(5)
 
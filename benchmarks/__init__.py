@@ -0,0 +1 @@
+"""Benchmarks de rendimiento del proyecto"""
@@ -0,0 +1,79 @@
+"""
+Benchmark de parseo de páginas de PrimaTips por modo de parser
+
+Compara `PrimaTipsScraper.parse_page` con BeautifulSoup ("html.parser",
+el comportamiento original) y con el extractor directo de lxml, sobre
+páginas guardadas (cuerpos grabados con HTTP_TRANSPORT_MODE=record o
+ficheros .html) o, si no se indican, páginas sintéticas del servidor
+local de varios tamaños. Comprueba que ambos modos devuelven lo mismo.
+
+Uso:
+    python -m benchmarks.bench_html_parse [partidos ...] [--pages fichero ...] [--repeat N]
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from benchmarks.standin_server import synthetic_day
+from src.data.primatips_scraper import PrimaTipsScraper
+
+DATE = "2026-10-17"
+URL = f"https://primatips.com/tips/{DATE}"
+
+
+def pages_from_sizes(sizes: List[int]) -> List[Tuple[str, str]]:
+    return [(f"sintética {size}", synthetic_day(DATE, size)[1].decode('utf-8')) for size in sizes]
+
+
+def pages_from_files(paths: List[str]) -> List[Tuple[str, str]]:
+    return [(Path(path).name[:28], Path(path).read_text(encoding='utf-8')) for path in paths]
+
+
+def time_parse(scraper: PrimaTipsScraper, html: str, repeat: int):
+    """Mediana del tiempo de parseo (s) y resultado"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predictions = scraper.parse_page(html, DATE, URL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), predictions
+
+
+def main(pages: List[Tuple[str, str]], repeat: int = 5):
+    scrapers = {parser: PrimaTipsScraper(parser=parser) for parser in PrimaTipsScraper.PARSERS}
+    # Importaciones perezosas (bs4, lxml) fuera de la medición
+    for scraper in scrapers.values():
+        scraper.parse_page(pages_from_sizes([1])[0][1], DATE, URL)
+
+    print(f"{'Página':<30}{'KB':>8}  {'Parser':<13}{'Partidos':>9}{'ms/página':>11}"
+          f"{'µs/partido':>12}{'Speedup':>9}{'= original':>12}")
+    for name, html in pages:
+        reference = baseline = None
+        for parser in ("html.parser", "lxml"):
+            elapsed, predictions = time_parse(scrapers[parser], html, repeat)
+            if reference is None:
+                reference, baseline = predictions, elapsed
+            same = 'sí' if predictions == reference else 'NO'
+            per_game = 1e6 * elapsed / max(len(predictions), 1)
+            print(f"{name:<30}{len(html.encode('utf-8')) / 1e3:>8.0f}  {parser:<13}{len(predictions):>9}"
+                  f"{1000 * elapsed:>11.1f}{per_game:>12.1f}{baseline / elapsed:>8.1f}x{same:>12}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    repeat = 5
+    if "--repeat" in args:
+        i = args.index("--repeat")
+        repeat = int(args[i + 1])
+        del args[i:i + 2]
+    files = []
+    if "--pages" in args:
+        i = args.index("--pages")
+        files = args[i + 1:]
+        args = args[:i]
+    sizes = [int(arg) for arg in args]
+
+    pages = pages_from_files(files) + pages_from_sizes(sizes if sizes or files else [50, 200, 1000, 5000])
+    main(pages, repeat)
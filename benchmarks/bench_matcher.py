@@ -0,0 +1,251 @@
+"""
+Benchmark de velocidad y precisión de enrich_matches_with_predictions
+
+Genera días sintéticos de partidos (Football API 7) y predicciones
+(PrimaTips) con las diferencias de nombres que se ven entre ambas fuentes:
+acentos, sufijos "FC"/"CF"/"Utd", abreviaturas ("Atl.", "Dep."), notación
+de reservas y juveniles ("U21" / "U-21", "II" / "B") y erratas. Incluye
+partidos de filiales que juegan el mismo día que el primer equipo, el caso
+más fácil de confundir.
+
+Para cada tamaño y variante del matcher mide tiempo, memoria pico
+(tracemalloc) y precisión / recall frente a la verdad sintética, y compara
+contra el barrido completo original en los tamaños pequeños.
+
+Uso:
+    python -m benchmarks.bench_matcher [tamaño ...] [--no-memory]
+"""
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.data.database import Database
+from src.utils.match_matcher import (
+    CandidateFilter, MatchLinkCache, enrich_matches_with_predictions, find_matching_prediction
+)
+
+DAY = "2026-10-17"
+FULL_SCAN_LIMIT = 1500
+
+SYLLABLES = ["ar", "ba", "ce", "do", "el", "fa", "gi", "lo", "ma", "ne", "or", "pa",
+             "ri", "sa", "to", "ul", "va", "ze", "mon", "ter", "ven", "bur", "gal", "lin",
+             "ão", "ñe", "ló", "ré", "kö", "zü", "bé", "mí"]
+PREFIXES = ["", "", "", "Real", "Atlético", "Deportivo", "Sporting", "Racing", "Club",
+            "Olympique", "Dynamo", "Inter", "Independiente", "Union"]
+SUFFIXES = ["", "", "", "FC", "CF", "SC", "AC", "United", "City", "Rovers", "Wanderers", "Town"]
+SQUADS = [" U21", " U19", " II", " Reserves"]
+
+ABBREVIATIONS = {"Atlético": "Atl.", "Deportivo": "Dep.", "Sporting": "Sp.", "Olympique": "Ol.",
+                 "Independiente": "Ind.", "United": "Utd"}
+SUFFIX_SWAPS = {"FC": "CF", "CF": "FC", "SC": "", "AC": ""}
+SQUAD_VARIANTS = {" U21": [" U-21", " Under 21"], " U19": [" U-19", " Under 19"],
+                  " II": [" B", " 2"], " Reserves": [" Res.", " Reserve"]}
+
+
+def club_name(rng: random.Random) -> str:
+    """Nombre de club con prefijo / sufijo opcionales"""
+    city = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+    return " ".join(part for part in (rng.choice(PREFIXES), city, rng.choice(SUFFIXES)) if part)
+
+
+def strip_accents(name: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", name) if not unicodedata.combining(c))
+
+
+def perturb(name: str, rng: random.Random) -> str:
+    """Nombre tal como lo publicaría la otra fuente"""
+    if rng.random() < 0.5:
+        name = strip_accents(name)
+
+    words = name.split(" ")
+    for i, word in enumerate(words):
+        if word in ABBREVIATIONS and rng.random() < 0.4:
+            words[i] = ABBREVIATIONS[word]
+        elif word in SUFFIX_SWAPS and rng.random() < 0.4:
+            words[i] = SUFFIX_SWAPS[word]
+    name = " ".join(word for word in words if word)
+
+    for squad, variants in SQUAD_VARIANTS.items():
+        if name.endswith(squad) and rng.random() < 0.5:
+            name = name[:-len(squad)] + rng.choice(variants)
+
+    if rng.random() < 0.1 and len(name) > 6:
+        i = rng.randrange(1, len(name) - 1)
+        name = name[:i] + name[i + 1:]
+
+    return name
+
+
+def _kickoff(rng: random.Random) -> int:
+    return rng.randrange(10 * 60, 23 * 60, 15)
+
+
+def _live_state(rng: random.Random) -> Tuple[bool, int, Tuple[int, int]]:
+    if rng.random() < 0.3:
+        return True, rng.randint(1, 90), (rng.randint(0, 3), rng.randint(0, 3))
+    return False, 0, (0, 0)
+
+
+def synthetic_day(size: int, seed: int = 0) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Partidos y predicciones de un día sintético
+
+    Aproximadamente la mitad de los partidos tiene predicción; el resto de
+    predicciones corresponde a partidos que la API no devuelve. Un 30% de
+    los partidos está en vivo (marcador y minuto en ambas fuentes); el
+    resto muestra la hora de inicio en PrimaTips. Uno de cada diez
+    partidos tiene además el partido de sus filiales ese mismo día.
+
+    Returns:
+        (partidos, predicciones); la predicción del partido i tiene id p{i}
+    """
+    rng = random.Random(seed)
+    fixtures = []
+
+    while len(fixtures) < size:
+        home, away = club_name(rng), club_name(rng)
+        fixtures.append((home, away))
+        if rng.random() < 0.1 and len(fixtures) < size:
+            squad = rng.choice(SQUADS)
+            fixtures.append((home + squad, away + squad))
+
+    matches, predictions = [], []
+    for i, (home, away) in enumerate(fixtures):
+        kickoff = _kickoff(rng)
+        live, minute, score = _live_state(rng)
+        matches.append({
+            'match_id': str(i),
+            'home_team': {'name': home, 'score': score[0]},
+            'away_team': {'name': away, 'score': score[1]},
+            'status': {'is_live': live, 'game_time': minute},
+            'start_time': f"{DAY}T{kickoff // 60:02d}:{kickoff % 60:02d}:00-03:00",
+        })
+        if rng.random() < 0.5:
+            predictions.append(_prediction(f"p{i}", perturb(home, rng), perturb(away, rng),
+                                           kickoff, live, minute, score))
+
+    while len(predictions) < size:
+        live, minute, score = _live_state(rng)
+        predictions.append(_prediction(f"x{len(predictions)}", club_name(rng), club_name(rng),
+                                       _kickoff(rng), live, minute, score))
+
+    rng.shuffle(predictions)
+    return matches, predictions
+
+
+def _prediction(prediction_id: str, home: str, away: str, kickoff: int = 0,
+                live: bool = False, minute: int = 0, score: Tuple[int, int] = (0, 0)) -> Dict:
+    return {
+        'id': prediction_id, 'home_team': home, 'away_team': away,
+        'minute': f"{minute}'" if live else f"{kickoff // 60:02d}:{kickoff % 60:02d}",
+        'is_live': live, 'home_score': score[0], 'away_score': score[1], 'date': DAY,
+        'predicted': '1', 'predicted_name': 'Local', 'odds': {}, 'probabilities': {},
+        'source': 'PrimaTips', 'link': prediction_id
+    }
+
+
+def full_scan(matches: List[Dict], predictions: List[Dict]) -> List[Optional[str]]:
+    """Comportamiento original: barrido completo por partido"""
+    return [p['link'] if p else None
+            for p in (find_matching_prediction(match, predictions) for match in matches)]
+
+
+def enrich_ids(matches: List[Dict], predictions: List[Dict], **kwargs) -> List[Optional[str]]:
+    """Id de la predicción asignada a cada partido (el link sintético es el id)"""
+    enriched = enrich_matches_with_predictions(matches, predictions, **kwargs)
+    return [m['prediction']['link'] if m['prediction'] else None for m in enriched]
+
+
+def accuracy(found: List[Optional[str]], predictions: List[Dict]) -> Tuple[float, float]:
+    """(precisión, recall) frente a la verdad sintética: partido i ↔ predicción p{i}"""
+    truth = sum(p['id'].startswith('p') for p in predictions)
+    correct = sum(found_id == f"p{i}" for i, found_id in enumerate(found))
+    assigned = sum(found_id is not None for found_id in found)
+    return correct / max(assigned, 1), correct / max(truth, 1)
+
+
+def warm_cache(matches: List[Dict], predictions: List[Dict], workdir: str, **kwargs):
+    """
+    Variante en estado estacionario: un primer refresh puebla el cache de
+    enlaces en una base dentro de `workdir` y solo se mide el siguiente
+    """
+    database = Database(str(Path(workdir) / "bench.db"))
+    enrich_ids(matches, predictions, cache=MatchLinkCache(database), **kwargs)
+    return lambda: enrich_ids(matches, predictions, cache=MatchLinkCache(database), **kwargs)
+
+
+# Los datos sintéticos usan la misma hora local en ambas fuentes, así que
+# aquí sí se puede podar por hora de inicio
+KICKOFF_TOLERANCE_MIN = 90
+
+
+def pruning() -> CandidateFilter:
+    return CandidateFilter(kickoff_tolerance_minutes=KICKOFF_TOLERANCE_MIN)
+
+
+# (nombre, preparación): la preparación recibe partidos, predicciones y un
+# directorio temporal, y devuelve la función a medir
+VARIANTS = [
+    ('barrido completo', lambda m, p, _: lambda: full_scan(m, p)),
+    ('greedy', lambda m, p, _: lambda: enrich_ids(m, p, strategy='greedy')),
+    ('greedy + poda', lambda m, p, _: lambda: enrich_ids(m, p, strategy='greedy', candidate_filter=pruning())),
+    ('asignación', lambda m, p, _: lambda: enrich_ids(m, p)),
+    ('asignación + poda', lambda m, p, _: lambda: enrich_ids(m, p, candidate_filter=pruning())),
+    ('+ cache (2º refresh)', lambda m, p, workdir: warm_cache(m, p, workdir, candidate_filter=pruning())),
+]
+
+
+def measure(run, memory: bool):
+    """Tiempo (s), memoria pico (MB, None si no se mide) y resultado de una variante"""
+    start = time.perf_counter()
+    found = run()
+    elapsed = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+    return elapsed, peak, found
+
+
+def main(sizes: List[int], memory: bool = True):
+    # Importaciones perezosas (scipy) fuera de la medición
+    enrich_ids(*synthetic_day(10))
+
+    print(f"{'Partidos':>9}  {'Variante':<22}{'Tiempo (s)':>11}{'Memoria (MB)':>14}"
+          f"{'Precisión':>11}{'Recall':>9}{'= barrido':>11}")
+    for size in sizes:
+        matches, predictions = synthetic_day(size)
+        reference = None
+
+        for name, prepare in VARIANTS:
+            is_full_scan = name == VARIANTS[0][0]
+            if is_full_scan and size > FULL_SCAN_LIMIT:
+                continue
+
+            with tempfile.TemporaryDirectory() as workdir:
+                # tracemalloc multiplica el coste de SequenceMatcher: el barrido solo se cronometra
+                elapsed, peak, found = measure(prepare(matches, predictions, workdir),
+                                               memory and not is_full_scan)
+            if is_full_scan:
+                reference = found
+
+            precision, recall = accuracy(found, predictions)
+            same = f"{sum(a == b for a, b in zip(reference, found)) / size:.1%}" if reference else '-'
+            peak_column = f"{peak:>14.1f}" if peak is not None else f"{'-':>14}"
+            print(f"{size:>9}  {name:<22}{elapsed:>11.3f}{peak_column}"
+                  f"{precision:>11.1%}{recall:>9.1%}{same:>11}")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    main([int(arg) for arg in args] or [200, 1000, 5000, 20000],
+         memory="--no-memory" not in sys.argv)
@@ -0,0 +1,47 @@
+"""
+Precisión y velocidad de la tabla 1X2 precalculada vs motor exacto
+
+Uso:
+    python -m benchmarks.bench_outcome_table [n_partidos]
+"""
+import sys
+import time
+
+import numpy as np
+
+from src.models.inplay_predictor import InPlayPredictor
+from src.models.outcome_table import OutcomeTable
+
+
+def main(n_matches: int = 5000):
+    start = time.perf_counter()
+    outcome_table = OutcomeTable.load_or_build()
+    print(f"Tabla lista en {(time.perf_counter() - start) * 1e3:.0f} ms "
+          f"(forma {outcome_table.shape})")
+
+    report = outcome_table.accuracy_report()
+    print("Precisión vs motor exacto:")
+    for key, value in report.items():
+        print(f"  {key:<16} {value}")
+
+    rng = np.random.default_rng(7)
+    probs = rng.dirichlet([3, 2, 2], n_matches)
+    minutes = rng.integers(0, 95, n_matches)
+    home_scores = rng.integers(0, 4, n_matches)
+    away_scores = rng.integers(0, 4, n_matches)
+
+    results = {}
+    for mode in InPlayPredictor.MODES:
+        predictor = InPlayPredictor(mode=mode, outcome_table=outcome_table)
+        start = time.perf_counter()
+        results[mode] = predictor.predict_batch(probs, minutes, home_scores, away_scores)
+        elapsed = time.perf_counter() - start
+        print(f"predict_batch modo {mode:<6} {n_matches} partidos: {elapsed * 1e3:.2f} ms")
+
+    diff = max(np.abs(results['exact'][key] - results['table'][key]).max()
+               for key in ('prob_home', 'prob_draw', 'prob_away'))
+    print(f"Máx. diferencia en predicciones redondeadas: {diff:.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,110 @@
+"""
+Benchmark de la cache de páginas de PrimaTips en estado estacionario
+
+Contra el servidor local (benchmarks/standin_server.py) mide el coste de
+`get_predictions_by_date` en cada escenario de refresh:
+
+- frío: primera descarga y parseo completo (el coste de cada refresh antes
+  de la cache)
+- sin cambios con ETag: 304, sin cuerpo ni parseo
+- sin cambios sin ETag: mismo hash de contenido, sin parseo
+- N% de minutos cambiados: solo se re-parsean los a.game modificados
+- día terminado: se lee de disco, sin petición
+
+En cada escenario comprueba que el resultado coincide con un parseo
+completo de la misma página.
+
+Uso:
+    python -m benchmarks.bench_page_cache [partidos] [--repeat N]
+"""
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pytz
+
+from benchmarks.standin_server import StandInServer, synthetic_day
+from src.data.primatips_scraper import PrimaTipsScraper
+from src.utils.logger import request_metrics
+
+PAST_DATE = "2020-01-15"
+MINUTE = re.compile(r'<span class="lvs">(\d+)\'</span>')
+
+
+def change_minutes(html: str, fraction: float) -> str:
+    """Avanzar un minuto una fracción de los partidos en vivo"""
+    live = len(MINUTE.findall(html))
+    count = max(1, round(fraction * live))
+    return MINUTE.sub(lambda m: f'<span class="lvs">{int(m.group(1)) + 1}\'</span>', html, count=count)
+
+
+def main(size: int = 5000, repeat: int = 5):
+    today = datetime.now(pytz.timezone("America/Santiago")).strftime("%Y-%m-%d")
+    path = f"/tips/{today}"
+    page = synthetic_day(today, size)[1].decode('utf-8')
+
+    with StandInServer(size=size) as server, tempfile.TemporaryDirectory() as cache_dir:
+        scraper = PrimaTipsScraper(base_url=server.primatips_url, cache_dir=cache_dir)
+
+        def reference(html: str):
+            return PrimaTipsScraper().parse_page(html, today, f"{server.primatips_url}{today}")
+
+        def run(name: str, date: str = today, html: str = None, etag: bool = True, check: str = None):
+            server.etag = etag
+            timings = []
+            for _ in range(repeat):
+                if html is not None:
+                    # Cada vuelta parte de la página original ya cacheada
+                    server.set_page(path, page.encode('utf-8'))
+                    scraper.get_predictions_by_date(date)
+                    server.set_page(path, html.encode('utf-8'))
+                request_metrics.reset()
+                start = time.perf_counter()
+                predictions = scraper.get_predictions_by_date(date)
+                timings.append(time.perf_counter() - start)
+            stats = request_metrics.summary().get(scraper.ENDPOINT, {})
+            same = '-' if check is None else ('sí' if predictions == reference(check) else 'NO')
+            print(f"{name:<32}{1000 * min(timings):>10.1f}{stats.get('requests', 0):>11}"
+                  f"{stats.get('bytes', 0) / 1e3:>9.0f}{len(predictions):>10}{same:>12}")
+
+        print(f"{size} partidos, página de {len(page.encode('utf-8')) / 1e6:.1f} MB")
+        print(f"{'Escenario':<32}{'ms':>10}{'Peticiones':>11}{'KB':>9}{'Partidos':>10}{'= completo':>12}")
+
+        # Frío: una instancia nueva por repetición
+        timings = []
+        for _ in range(repeat):
+            cold = PrimaTipsScraper(base_url=server.primatips_url)
+            start = time.perf_counter()
+            predictions = cold.get_predictions_by_date(today)
+            timings.append(time.perf_counter() - start)
+        print(f"{'frío (parseo completo)':<32}{1000 * min(timings):>10.1f}{1:>11}"
+              f"{len(page.encode('utf-8')) / 1e3:>9.0f}{len(predictions):>10}{'-':>12}")
+
+        scraper.get_predictions_by_date(today)
+        run("sin cambios, con ETag (304)", check=page)
+        run("sin cambios, sin ETag (hash)", etag=False, check=page)
+        for fraction in (0.02, 0.25, 1.0):
+            changed = change_minutes(page, fraction)
+            run(f"{fraction:.0%} de minutos en vivo cambian", html=changed, etag=False, check=changed)
+        server.set_page(path, page.encode('utf-8'))
+
+        scraper.get_predictions_by_date(PAST_DATE)
+        from_disk = PrimaTipsScraper(base_url=server.primatips_url, cache_dir=cache_dir)
+        request_metrics.reset()
+        start = time.perf_counter()
+        predictions = from_disk.get_predictions_by_date(PAST_DATE)
+        elapsed = time.perf_counter() - start
+        requests = request_metrics.summary().get(scraper.ENDPOINT, {}).get('requests', 0)
+        print(f"{'día terminado (disco)':<32}{1000 * elapsed:>10.1f}{requests:>11}{0:>9}{len(predictions):>10}{'-':>12}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    repeat = 5
+    if "--repeat" in args:
+        i = args.index("--repeat")
+        repeat = int(args[i + 1])
+        del args[i:i + 2]
+    main(int(args[0]) if args else 5000, repeat)
@@ -0,0 +1,164 @@
+"""
+Benchmark de memoria y tiempo del parseo de /matches (Football API 7)
+
+Compara el parseo completo original (`json.loads` del cuerpo + aplanado)
+con el parseo incremental de `FootballAPI7Consumer.parse_matches_stream`
+(una competición cada vez, solo los campos usados) sobre una respuesta
+grabada o, si no se indica, una sintética con la forma de la real
+(incluidos los campos que el parser no usa: cuotas, colores, flags...).
+
+Para cada modo mide tiempo total, tiempo hasta el primer partido y
+memoria pico (tracemalloc), y comprueba que ambos devuelven lo mismo.
+
+Uso:
+    python -m benchmarks.bench_parse [partidos ...] [--payload respuesta.json]
+"""
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+from src.data.api_consumer import FootballAPI7Consumer
+
+GAMES_PER_COMPETITION = 12
+
+
+def _competitor(rng: random.Random, index: int) -> Dict:
+    return {
+        'id': index, 'countryId': rng.randint(1, 200), 'sportId': 1,
+        'name': f"Club {index}", 'shortName': f"C{index}", 'symbolicName': f"CLB{index % 1000}",
+        'nameForURL': f"club-{index}", 'score': rng.choice([-1, 0, 1, 2, 3]),
+        'isQualified': False, 'toQualify': False, 'isWinner': False,
+        'redCards': rng.choice([0, 0, 0, 1]), 'type': 1, 'imageVersion': rng.randint(1, 9),
+        'mainCompetitionId': rng.randint(1, 5000), 'color': '#1A2B3C', 'awayColor': '#FFFFFF',
+        'logo': f"https://imagecache.example/competitors/{index}.png"
+    }
+
+
+def _game(rng: random.Random, index: int) -> Dict:
+    status_group = rng.choice([2, 2, 3, 4])
+    return {
+        'id': 4000000 + index, 'sportId': 1, 'competitionId': index // GAMES_PER_COMPETITION,
+        'seasonNum': 87, 'stageNum': 1, 'groupNum': 0, 'roundNum': rng.randint(1, 38),
+        'roundName': f"Round {rng.randint(1, 38)}", 'stageName': None,
+        'competitionDisplayName': f"Liga {index // GAMES_PER_COMPETITION}",
+        'startTime': f"2026-10-17T{rng.randint(8, 22):02d}:{rng.choice(['00', '30'])}:00-03:00",
+        'statusGroup': status_group, 'statusText': 'Scheduled' if status_group == 2 else 'Live',
+        'shortStatusText': '', 'gameTimeAndStatusDisplayType': 1, 'justEnded': False,
+        'gameTime': rng.randint(1, 90) if status_group == 3 else -1,
+        'gameTimeDisplay': '', 'hasLineups': rng.random() < 0.5, 'hasMissingPlayers': False,
+        'hasFieldPositions': False, 'hasTVNetworks': True, 'hasBetsTeaser': True,
+        'hasVideo': False, 'isHomeAwayInverted': False, 'winDescription': '',
+        'homeCompetitor': _competitor(rng, 2 * index),
+        'awayCompetitor': _competitor(rng, 2 * index + 1),
+        'odds': {
+            'lineId': rng.randint(1, 10 ** 9), 'bookmakerId': 14, 'lineTypeId': 1,
+            'options': [
+                {'num': n, 'rate': {'decimal': round(rng.uniform(1.1, 9), 2),
+                                    'fractional': '5/4', 'american': '+125'},
+                 'trend': rng.randint(1, 3), 'link': f"https://bookmaker.example/bet/{index}/{n}"}
+                for n in (1, 2, 3)
+            ]
+        },
+        'tvNetworks': [{'id': n, 'name': f"Canal {n}"} for n in range(rng.randint(0, 3))]
+    }
+
+
+def synthetic_payload(size: int, seed: int = 0) -> List[Dict]:
+    """Respuesta sintética de /matches con `size` partidos"""
+    rng = random.Random(seed)
+    payload = []
+    for start in range(0, size, GAMES_PER_COMPETITION):
+        competition = start // GAMES_PER_COMPETITION
+        payload.append({
+            'competition': {
+                'id': competition, 'countryId': rng.randint(1, 200), 'sportId': 1,
+                'name': f"Liga {competition}", 'nameForURL': f"liga-{competition}",
+                'popularityRank': rng.randint(1, 10 ** 6), 'hasStandings': True,
+                'hasBrackets': False, 'color': '#000000', 'logo': f"https://imagecache.example/{competition}.png"
+            },
+            'games': [_game(rng, index) for index in range(start, min(start + GAMES_PER_COMPETITION, size))]
+        })
+    return payload
+
+
+def read_chunks(path: Path, chunk_size: int):
+    """Trozos del fichero, como `response.iter_content()`"""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def full_parse(api: FootballAPI7Consumer, path: Path):
+    """Comportamiento original: cuerpo completo → json → aplanado"""
+    data = json.loads(path.read_bytes())
+    return api.parse_matches(data)
+
+
+def stream_parse(api: FootballAPI7Consumer, path: Path):
+    return api.parse_matches_stream(read_chunks(path, api.STREAM_CHUNK_SIZE))
+
+
+MODES = [
+    ('completo (json.loads)', full_parse),
+    ('incremental + proyección', stream_parse),
+]
+
+
+def measure(parse, api: FootballAPI7Consumer, path: Path):
+    """Tiempo total, tiempo al primer partido, memoria pico (MB) y partidos"""
+    start = time.perf_counter()
+    matches = parse(api, path)
+    first = next(matches, None)
+    first_at = time.perf_counter() - start
+    found = ([first] if first is not None else []) + list(matches)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    list(parse(api, path))
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+
+    return elapsed, first_at, peak, found
+
+
+def main(sizes: List[int], payload: str = None):
+    api = FootballAPI7Consumer(api_key="")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if payload:
+            sources = [(None, Path(payload))]
+        else:
+            sources = []
+            for size in sizes:
+                path = Path(tmp) / f"matches_{size}.json"
+                path.write_text(json.dumps(synthetic_payload(size)), encoding='utf-8')
+                sources.append((size, path))
+
+        print(f"{'Cuerpo (MB)':>12}  {'Modo':<26}{'Partidos':>9}{'Tiempo (s)':>11}"
+              f"{'1er partido (ms)':>18}{'Memoria (MB)':>14}{'= completo':>12}")
+        for _, path in sources:
+            body = path.stat().st_size / 1e6
+            reference = None
+            for name, parse in MODES:
+                elapsed, first_at, peak, found = measure(parse, api, path)
+                if reference is None:
+                    reference = found
+                same = 'sí' if found == reference else 'NO'
+                print(f"{body:>12.1f}  {name:<26}{len(found):>9}{elapsed:>11.3f}"
+                      f"{1000 * first_at:>18.1f}{peak:>14.1f}{same:>12}")
+
+
+if __name__ == "__main__":
+    payload = None
+    if "--payload" in sys.argv:
+        payload = sys.argv[sys.argv.index("--payload") + 1]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--") and arg != payload]
+    main([int(arg) for arg in args] or [2000, 10000, 50000], payload)
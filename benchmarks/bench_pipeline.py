@@ -0,0 +1,75 @@
+"""
+Benchmark del pipeline completo contra el servidor local (sin cuota)
+
+Levanta benchmarks/standin_server.py en un hilo y ejecuta varios refresh
+del dashboard: partidos de Football API 7, predicciones de PrimaTips y
+emparejado. Reporta el tiempo por etapa y las métricas de
+src.utils.logger por endpoint (latencias, bytes, 429, parseo).
+
+Uso:
+    python -m benchmarks.bench_pipeline [--size 1000] [--refreshes 5]
+        [--latency-ms 80] [--rate-429 0.1] [--recordings data/recordings]
+"""
+import argparse
+import time
+from datetime import datetime
+
+from benchmarks.standin_server import StandInServer
+from src.data.api_consumer import FootballAPI7Consumer
+from src.data.primatips_scraper import PrimaTipsScraper
+from src.utils.http import PooledSession
+from src.utils.logger import request_metrics
+from src.utils.match_matcher import CandidateFilter, enrich_matches_with_predictions
+
+
+def run(size: int, refreshes: int, latency_ms: float, rate_429: float, recordings: str = None):
+    server = StandInServer(size=size, latency_ms=latency_ms, jitter_ms=latency_ms / 4,
+                           rate_429=rate_429, retry_after=0.2, recordings=recordings)
+    date = datetime.now()
+    api_date, tips_date = date.strftime('%d/%m/%Y'), date.strftime('%Y-%m-%d')
+
+    with server:
+        session = PooledSession()
+        # Sin límite de cuota ni snapshot: cada refresh descarga de nuevo
+        api = FootballAPI7Consumer("", session=session, base_url=server.api_url,
+                                   rate_limit_per_minute=60000, rate_limit_burst=100,
+                                   snapshot_ttl=0)
+        primatips = PrimaTipsScraper(session=session, base_url=server.primatips_url)
+        # El día sintético usa la misma hora local en ambas fuentes
+        candidate_filter = CandidateFilter(kickoff_tolerance_minutes=90)
+        request_metrics.reset()
+
+        print(f"{'Refresh':>8}{'Partidos (s)':>14}{'PrimaTips (s)':>15}{'Emparejado (s)':>16}"
+              f"{'Total (s)':>11}{'Con predicción':>16}")
+        for refresh in range(1, refreshes + 1):
+            start = time.perf_counter()
+            matches = api.get_matches_by_date(api_date)
+            fetched = time.perf_counter()
+            predictions = primatips.get_predictions_by_date(tips_date)
+            scraped = time.perf_counter()
+            matches = enrich_matches_with_predictions(matches, predictions,
+                                                      candidate_filter=candidate_filter)
+            end = time.perf_counter()
+
+            with_prediction = sum(1 for match in matches if match.get('prediction'))
+            print(f"{refresh:>8}{fetched - start:>14.3f}{scraped - fetched:>15.3f}"
+                  f"{end - scraped:>16.3f}{end - start:>11.3f}{with_prediction:>10}/{len(matches)}")
+
+    print()
+    print(f"{'Endpoint':<18}{'Peticiones':>11}{'p50 (ms)':>10}{'p95 (ms)':>10}{'MB':>8}"
+          f"{'429':>6}{'Parseo (ms)':>13}{'Elementos':>11}")
+    for endpoint, stats in request_metrics.summary().items():
+        print(f"{endpoint:<18}{stats['requests']:>11}{str(stats['p50_latency_ms']):>10}"
+              f"{str(stats['p95_latency_ms']):>10}{stats['bytes'] / 1e6:>8.2f}"
+              f"{stats['status'].get(429, 0):>6}{str(stats['avg_parse_ms']):>13}{stats['items']:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--refreshes", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--rate-429", type=float, default=0.1)
+    parser.add_argument("--recordings", default=None)
+    args = parser.parse_args()
+    run(args.size, args.refreshes, args.latency_ms, args.rate_429, args.recordings)
@@ -0,0 +1,100 @@
+"""
+Benchmark del motor de matriz de marcadores vs implementación original
+
+Compara la versión anterior de `_calculate_match_odds_poisson` (doble bucle
+con scipy.stats.poisson.pmf) contra `src.models.score_matrix.match_odds`,
+tanto en velocidad como en igualdad numérica.
+
+Uso:
+    python -m benchmarks.bench_score_matrix [n_casos]
+"""
+import sys
+import time
+
+import numpy as np
+from scipy.stats import poisson
+
+from src.models.score_matrix import match_odds
+
+MAX_GOALS = 10
+
+
+def legacy_match_odds(lambda_home, lambda_away, home_score, away_score, max_goals=MAX_GOALS):
+    """Implementación original (doble bucle + scipy), usada como referencia"""
+    prob_matrix = np.zeros((max_goals, max_goals))
+
+    for i in range(max_goals):
+        for j in range(max_goals):
+            prob_matrix[i, j] = (
+                poisson.pmf(i, lambda_home) *
+                poisson.pmf(j, lambda_away)
+            )
+
+    prob_home_win = 0
+    prob_draw = 0
+    prob_away_win = 0
+
+    for i in range(max_goals):
+        for j in range(max_goals):
+            final_home = home_score + i
+            final_away = away_score + j
+
+            if final_home > final_away:
+                prob_home_win += prob_matrix[i, j]
+            elif final_home == final_away:
+                prob_draw += prob_matrix[i, j]
+            else:
+                prob_away_win += prob_matrix[i, j]
+
+    total = prob_home_win + prob_draw + prob_away_win
+    if total > 0:
+        prob_home_win /= total
+        prob_draw /= total
+        prob_away_win /= total
+
+    return prob_home_win, prob_draw, prob_away_win
+
+
+def main(n_cases: int = 500):
+    rng = np.random.default_rng(42)
+    lambdas_home = rng.uniform(0.0, 4.0, n_cases)
+    lambdas_away = rng.uniform(0.0, 4.0, n_cases)
+    home_scores = rng.integers(0, 5, n_cases)
+    away_scores = rng.integers(0, 5, n_cases)
+
+    # Referencia
+    start = time.perf_counter()
+    legacy = np.array([
+        legacy_match_odds(lh, la, hs, as_)
+        for lh, la, hs, as_ in zip(lambdas_home, lambdas_away, home_scores, away_scores)
+    ])
+    legacy_time = time.perf_counter() - start
+
+    # Motor nuevo, una llamada por partido
+    start = time.perf_counter()
+    single = np.array([
+        match_odds(lh, la, hs - as_, MAX_GOALS)[:3]
+        for lh, la, hs, as_ in zip(lambdas_home, lambdas_away, home_scores, away_scores)
+    ])
+    single_time = time.perf_counter() - start
+
+    # Motor nuevo, vectorizado sobre todos los partidos
+    start = time.perf_counter()
+    batch = np.stack(match_odds(lambdas_home, lambdas_away,
+                                home_scores - away_scores, MAX_GOALS)[:3], axis=1)
+    batch_time = time.perf_counter() - start
+
+    print(f"Casos: {n_cases}")
+    print(f"{'Implementación':<24}{'Total (ms)':>12}{'Por caso (µs)':>16}{'Speedup':>10}")
+    for name, elapsed in [("scipy doble bucle", legacy_time),
+                          ("motor (por partido)", single_time),
+                          ("motor (batch)", batch_time)]:
+        print(f"{name:<24}{elapsed * 1e3:>12.2f}{elapsed / n_cases * 1e6:>16.2f}"
+              f"{legacy_time / elapsed:>9.0f}x")
+
+    print(f"Máx. diferencia absoluta (por partido): {np.abs(single - legacy).max():.2e}")
+    print(f"Máx. diferencia absoluta (batch):       {np.abs(batch - legacy).max():.2e}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
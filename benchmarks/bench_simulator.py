@@ -0,0 +1,54 @@
+"""
+Velocidad y convergencia del simulador Monte Carlo in-play
+
+Con dynamic_adjustments=False el simulador debe converger al modelo
+analítico (`InPlayPredictor.predict_batch`), lo que permite medir el
+error real frente al error estándar estimado para cada número de caminos.
+
+Uso:
+    python -m benchmarks.bench_simulator [n_partidos]
+"""
+import sys
+import time
+
+import numpy as np
+
+from src.models.inplay_predictor import InPlayPredictor
+from src.models.simulator import InPlaySimulator
+
+PATH_COUNTS = (1000, 5000, 20000, 50000)
+
+
+def main(n_matches: int = 300):
+    rng = np.random.default_rng(3)
+    probs = rng.dirichlet([3, 2, 2], n_matches)
+    minutes = rng.integers(0, 90, n_matches)
+    home_scores = rng.integers(0, 3, n_matches)
+    away_scores = rng.integers(0, 3, n_matches)
+
+    exact = InPlayPredictor().predict_batch(probs, minutes, home_scores, away_scores)
+    exact_probs = np.stack([exact['prob_home'], exact['prob_draw'], exact['prob_away']])
+
+    simulator = InPlaySimulator(seed=11)
+
+    print(f"Partidos: {n_matches}")
+    print(f"{'Modo':<10}{'Caminos':>10}{'Tiempo (s)':>12}{'Error est. máx':>16}{'Error real máx':>16}")
+    for dynamic in (False, True):
+        for n_paths in PATH_COUNTS:
+            start = time.perf_counter()
+            result = simulator.simulate(probs, minutes, home_scores, away_scores,
+                                        n_paths=n_paths, dynamic_adjustments=dynamic)
+            elapsed = time.perf_counter() - start
+
+            simulated = np.stack([result['prob_home'], result['prob_draw'], result['prob_away']])
+            # En modo dinámico el modelo difiere del analítico: solo se reporta el error estándar
+            real_error = f"{np.abs(simulated - exact_probs).max():.4f}" if not dynamic else "-"
+            print(f"{'dinámico' if dynamic else 'fijo':<10}{n_paths:>10}{elapsed:>12.2f}"
+                  f"{result['std_error'].max():>16.4f}{real_error:>16}")
+
+    for target in (0.01, 0.005, 0.0025):
+        print(f"Caminos para error estándar <= {target}: {InPlaySimulator.paths_for_error(target)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,91 @@
+"""
+Tiempo de arranque en frío (python -X importtime) de app.py y cada módulo
+
+Cada objetivo se importa en un proceso nuevo y se suma el tiempo
+acumulado reportado por -X importtime. Para app.py se importan sus
+dependencias (sin ejecutar el dashboard, que haría st.rerun en bucle).
+
+Uso:
+    python -m benchmarks.bench_startup [--top N]
+"""
+import ast
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = [
+    "config",
+    "src.data.api_consumer",
+    "src.data.primatips_scraper",
+    "src.data.database",
+    "src.models.inplay_predictor",
+    "src.utils.match_matcher",
+]
+
+
+def app_imports() -> str:
+    """Sentencias import de primer nivel de app.py"""
+    tree = ast.parse((ROOT / "app.py").read_text(encoding="utf-8"))
+    statements = [
+        ast.unparse(node) for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+    return "; ".join(statements)
+
+
+def measure(statement: str) -> List[Tuple[int, str, int]]:
+    """
+    Ejecutar una sentencia con -X importtime en un proceso nuevo
+
+    Returns:
+        Lista de (profundidad, paquete, µs acumulados); profundidad 0 =
+        importado directamente por la sentencia
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        name = raw_name.strip()
+        # Un espacio + dos por nivel de anidamiento antes del nombre
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        imports.append((depth, name, int(cumulative_us)))
+
+    return imports
+
+
+def main(top: int = 5):
+    # Lo que el intérprete importa siempre (site, encodings...) no cuenta
+    baseline = {name for _, name, _ in measure("pass")}
+    targets = [("app.py", app_imports())] + [(module, f"import {module}") for module in MODULES]
+
+    print(f"{'Objetivo':<32}{'Arranque (ms)':>14}  Imports más pesados")
+    for label, statement in targets:
+        try:
+            imports = measure(statement)
+        except RuntimeError as e:
+            print(f"{label:<32}{'error':>14}  {e}")
+            continue
+
+        total_ms = sum(us for depth, name, us in imports
+                       if depth == 0 and name not in baseline) / 1000.0
+        heaviest = sorted(((us, name) for depth, name, us in imports
+                           if depth == 1 and name not in baseline), reverse=True)
+
+        summary = ", ".join(f"{name} {us / 1000:.0f}ms" for us, name in heaviest[:top])
+        print(f"{label:<32}{total_ms:>14.1f}  {summary}")
+
+
+if __name__ == "__main__":
+    top = int(sys.argv[sys.argv.index("--top") + 1]) if "--top" in sys.argv else 5
+    main(top)
@@ -0,0 +1,276 @@
+"""
+Servidor HTTP local que sustituye a Football API 7 y PrimaTips
+
+Sirve las rutas que usan los clientes:
+    /api/v3/matches?date=DD/MM/YYYY&...   (JSON de Football API 7)
+    /tips/YYYY-MM-DD                      (HTML de PrimaTips)
+
+Si la petición está grabada (src/utils/replay.py, HTTP_TRANSPORT_MODE=record)
+se devuelve la grabación; si no, un día sintético determinista por fecha:
+los mismos partidos en ambas fuentes, con los nombres de PrimaTips
+alterados como en benchmarks/bench_matcher.py. Latencia y errores 429 son
+configurables para medir el pipeline completo sin gastar cuota. Las
+respuestas 200 llevan ETag y se responde 304 a If-None-Match (desactivable
+con --no-etag).
+
+Uso:
+    python -m benchmarks.standin_server [--port 8765] [--size 1000]
+        [--latency-ms 80] [--jitter-ms 20] [--rate-429 0.05] [--retry-after 1]
+        [--recordings data/recordings] [--no-etag]
+
+y apuntar los clientes con:
+    FOOTBALL_API_URL=http://127.0.0.1:8765/api/v3
+    PRIMATIPS_URL=http://127.0.0.1:8765/tips/
+"""
+import argparse
+import hashlib
+import html
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from requests.structures import CaseInsensitiveDict
+
+from benchmarks.bench_matcher import club_name, perturb
+from benchmarks.bench_parse import synthetic_payload
+from src.utils.replay import ResponseStore
+
+
+@lru_cache(maxsize=16)
+def synthetic_day(date_iso: str, size: int) -> Tuple[bytes, bytes]:
+    """
+    (JSON de /matches, HTML de PrimaTips) de un día sintético
+
+    Determinista por fecha: dos peticiones del mismo día ven los mismos
+    partidos. Todos los partidos de la API tienen su tip en PrimaTips.
+    """
+    seed = int(date_iso.replace('-', ''))
+    rng = random.Random(seed)
+    payload = synthetic_payload(size, seed)
+
+    games_html = []
+    for competition in payload:
+        for game in competition['games']:
+            home, away = game['homeCompetitor'], game['awayCompetitor']
+            home['name'], away['name'] = club_name(rng), club_name(rng)
+            game['startTime'] = date_iso + game['startTime'][10:]
+            games_html.append(_game_html(game, rng))
+
+    page = "<html><body><div class=\"games\">" + "".join(games_html) + "</div></body></html>"
+    return json.dumps(payload).encode('utf-8'), page.encode('utf-8')
+
+
+def _game_html(game: Dict, rng: random.Random) -> str:
+    """Elemento a.game de PrimaTips para un partido de la API"""
+    status = game['statusGroup']
+    if status == 3:
+        minute = f"{game['gameTime']}'"
+    elif status == 4:
+        minute = "FT"
+    else:
+        minute = game['startTime'][11:16]
+
+    home_score = max(game['homeCompetitor']['score'], 0) if status != 2 else ""
+    away_score = max(game['awayCompetitor']['score'], 0) if status != 2 else ""
+    odds = [round(rng.uniform(1.2, 6.0), 2) for _ in range(3)]
+    tip = f"<span class=\"tip\">{rng.choice(['1X', 'X2', '12'])}</span>" if rng.random() < 0.3 else ""
+    teams = html.escape(f"{perturb(game['homeCompetitor']['name'], rng)} - "
+                        f"{perturb(game['awayCompetitor']['name'], rng)}")
+
+    return (
+        f"<a class=\"game\" id=\"g_{game['id']}\" href=\"#g_{game['id']}\">"
+        f"<span class=\"lvs\">{minute}</span>"
+        f"<span class=\"nms\">{teams}</span>"
+        f"<span class=\"res lv\"><span class=\"l\">{home_score}</span>"
+        f"<span class=\"l la\">{away_score}</span></span>"
+        + "".join(f"<span class=\"o\">{odd:.2f}</span>" for odd in odds)
+        + tip + "</a>"
+    )
+
+
+class StandInServer:
+    """
+    Servidor local en un hilo (para benchmarks) o en primer plano (CLI)
+
+    Ejemplo:
+        with StandInServer(size=2000, latency_ms=50) as server:
+            api = FootballAPI7Consumer("", base_url=server.api_url)
+    """
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 size: int = 1000,
+                 latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0,
+                 rate_429: float = 0.0,
+                 retry_after: float = 1.0,
+                 recordings: Optional[str] = None,
+                 seed: int = 0,
+                 etag: bool = True):
+        """
+        Args:
+            host: Interfaz de escucha
+            port: Puerto (0 = uno libre)
+            size: Partidos por día sintético
+            latency_ms: Latencia añadida por respuesta
+            jitter_ms: Variación uniforme (±) de la latencia
+            rate_429: Probabilidad de responder 429 a /matches
+            retry_after: Valor de la cabecera Retry-After de los 429
+            recordings: Directorio de grabaciones a servir antes que lo sintético
+            seed: Semilla de latencias y 429
+            etag: Enviar ETag y responder 304 a If-None-Match
+        """
+        self.size = size
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.store = ResponseStore(recordings) if recordings else None
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.etag = etag
+        self.served: Dict[int, int] = {}
+        self.pages: Dict[str, bytes] = {}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, content_type, body, headers = server.respond(
+                    self.path, self.headers.get("If-None-Match"))
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}/api/v3"
+
+    @property
+    def primatips_url(self) -> str:
+        return f"{self.url}/tips/"
+
+    def set_page(self, path: str, body: bytes):
+        """Servir `body` en `path` (p. ej. "/tips/2026-10-17") en lugar de lo grabado o sintético"""
+        self.pages[path] = body
+
+    def respond(self, path: str, if_none_match: Optional[str] = None) -> Tuple[int, str, bytes, Dict[str, str]]:
+        """(estado, content-type, cuerpo, cabeceras extra) para una ruta"""
+        with self.rng_lock:
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms))
+            throttled = self.rng.random() < self.rate_429
+        time.sleep(delay / 1000)
+
+        status, content_type, body, headers = self._route(path, throttled)
+        if status == 200 and self.etag:
+            etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+            headers = {**headers, 'ETag': etag}
+            if if_none_match == etag:
+                status, body = 304, b""
+        with self.rng_lock:
+            self.served[status] = self.served.get(status, 0) + 1
+        return status, content_type, body, headers
+
+    def _route(self, path: str, throttled: bool) -> Tuple[int, str, bytes, Dict[str, str]]:
+        parts = urlsplit(path)
+
+        if parts.path.endswith("/matches") and throttled:
+            return 429, "application/json", b'{"message": "Too many requests"}', {
+                'Retry-After': f"{self.retry_after:g}"
+            }
+
+        if path in self.pages:
+            content_type = "application/json" if parts.path.endswith("/matches") else "text/html; charset=utf-8"
+            return 200, content_type, self.pages[path], {}
+
+        if self.store is not None:
+            recorded = self.store.load("GET", path)
+            if recorded is not None:
+                meta, body = recorded
+                headers = CaseInsensitiveDict(meta['headers'])
+                return meta['status'], headers.get('Content-Type', 'application/octet-stream'), body, {}
+
+        try:
+            if parts.path.endswith("/matches"):
+                date = parse_qs(parts.query)['date'][0]
+                date_iso = datetime.strptime(date, '%d/%m/%Y').strftime('%Y-%m-%d')
+                return 200, "application/json", synthetic_day(date_iso, self.size)[0], {}
+
+            if "/tips/" in parts.path:
+                date_iso = parts.path.rstrip('/').rsplit('/', 1)[-1]
+                datetime.strptime(date_iso, '%Y-%m-%d')
+                return 200, "text/html; charset=utf-8", synthetic_day(date_iso, self.size)[1], {}
+        except (KeyError, ValueError):
+            return 400, "text/plain", b"bad date", {}
+
+        return 404, "text/plain", b"not found", {}
+
+    def start(self) -> 'StandInServer':
+        """Servir en un hilo en segundo plano"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--size", type=int, default=1000, help="partidos por día sintético")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0, help="probabilidad de 429 en /matches")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--recordings", default=None, help="directorio de grabaciones")
+    parser.add_argument("--no-etag", action="store_true", help="sin ETag ni respuestas 304")
+    args = parser.parse_args(argv)
+
+    server = StandInServer(args.host, args.port, args.size, args.latency_ms, args.jitter_ms,
+                           args.rate_429, args.retry_after, args.recordings, etag=not args.no_etag)
+    print(f"Football API 7: {server.api_url}")
+    print(f"PrimaTips:      {server.primatips_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
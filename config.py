@@ -11,7 +11,26 @@ class Config:
     # API Settings (Football API 7)
     # ========================================
     FOOTBALL_API_KEY = os.getenv("FOOTBALL_API_KEY", "")
-    FOOTBALL_API_URL = "https://football-api-7.p.rapidapi.com/api/v3"
+    FOOTBALL_API_URL = os.getenv("FOOTBALL_API_URL", "https://football-api-7.p.rapidapi.com/api/v3")
+    PRIMATIPS_URL = os.getenv("PRIMATIPS_URL", "https://primatips.com/tips/")
+    PRIMATIPS_PARSER = os.getenv("PRIMATIPS_PARSER", "lxml")  # lxml | html.parser
+    PRIMATIPS_CACHE_DIR = os.getenv("PRIMATIPS_CACHE_DIR", "data/primatips_pages")  # Días terminados
+    API_RATE_LIMIT_PER_MIN = float(os.getenv("API_RATE_LIMIT_PER_MIN", 30))  # Según el plan de RapidAPI
+    API_RATE_LIMIT_BURST = int(os.getenv("API_RATE_LIMIT_BURST", 5))
+    API_MAX_429_RETRIES = int(os.getenv("API_MAX_429_RETRIES", 3))
+    MATCHES_SNAPSHOT_TTL = float(os.getenv("MATCHES_SNAPSHOT_TTL", 60))  # Segundos por día descargado
+    API_STREAM_PARSE = os.getenv("API_STREAM_PARSE", "true").lower() == "true"  # Parseo incremental de /matches
+    
+    # ========================================
+    # HTTP Settings (pool de conexiones compartido)
+    # ========================================
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 10))            # Conexiones por host
+    HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+    HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5))
+    FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", 4))      # Fechas descargadas en paralelo
+    HTTP_TRANSPORT_MODE = os.getenv("HTTP_TRANSPORT_MODE", "live")  # live | record | replay
+    HTTP_RECORDINGS_DIR = os.getenv("HTTP_RECORDINGS_DIR", "data/recordings")
     
     # ========================================
     # Dashboard Settings
@@ -25,6 +44,17 @@ class Config:
     # ========================================
     MIN_CONFIDENCE = float(os.getenv("MIN_CONFIDENCE", 0.60))
     
+    # ========================================
+    # Matching Settings (tolerancias de candidatos)
+    # ========================================
+    MATCH_DATE_TOLERANCE_DAYS = int(os.getenv("MATCH_DATE_TOLERANCE_DAYS", 0))
+    # Vacío = sin poda por hora de inicio: la zona horaria de la hora de
+    # PrimaTips no está verificada
+    MATCH_KICKOFF_TOLERANCE_MIN = (int(os.getenv("MATCH_KICKOFF_TOLERANCE_MIN"))
+                                   if os.getenv("MATCH_KICKOFF_TOLERANCE_MIN") else None)
+    MATCH_SCORE_TOLERANCE = int(os.getenv("MATCH_SCORE_TOLERANCE", 1))
+    MATCH_MINUTE_TOLERANCE = int(os.getenv("MATCH_MINUTE_TOLERANCE", 15))
+    
     # ========================================
     # Database Settings (SQLite)
     # ========================================
@@ -35,5 +65,10 @@ class Config:
     # ========================================
     DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE", "america/santiago")
     DEFAULT_LANG = os.getenv("DEFAULT_LANG", "en")
+    
+    # ========================================
+    # Logging Settings
+    # ========================================
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # DEBUG muestra cada petición HTTP
 
 config = Config()
@@ -1,52 +1,294 @@
 """Consumo de Football API 7 para datos de fútbol"""
-import requests
-from typing import List, Dict, Optional
-from datetime import datetime
+import itertools
+import logging
+import threading
+import time
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+from datetime import datetime, timedelta
 import pytz
 
+from src.utils.http import (
+    PooledSession, SingleFlight, TokenBucket, map_concurrently, retries_used, retry_after_seconds
+)
+from src.utils.json_stream import iter_json_array, projecting_hook
+from src.utils.logger import RequestMetrics, request_metrics
+
+logger = logging.getLogger(__name__)
+
+# Campos (sección, clave) comparados entre dos snapshots
+TRACKED_FIELDS = (
+    ('home_team', 'score'),
+    ('away_team', 'score'),
+    ('home_team', 'red_cards'),
+    ('away_team', 'red_cards'),
+    ('status', 'status_group'),
+    ('status', 'status_text'),
+    ('status', 'short_status'),
+    ('status', 'game_time'),
+    ('status', 'game_time_display'),
+    ('status', 'just_ended'),
+    (None, 'start_time'),
+)
+
+
+def _field(match: Dict, section: Optional[str], key: str):
+    return match.get(key) if section is None else match.get(section, {}).get(key)
+
+
+def _copy_match(match: Dict) -> Dict:
+    """Copia de un partido del snapshot, incluidos sus dicts anidados"""
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in match.items()}
+
+
+def diff_matches(previous: Dict[str, Dict], current: Dict[str, Dict]) -> Dict:
+    """
+    Cambios entre dos encuestas del mismo día
+    
+    Args:
+        previous: match_id → partido de la encuesta anterior
+        current: match_id → partido de la encuesta actual
+    
+    Returns:
+        Dict con:
+        {
+            'added': match_ids nuevos,
+            'removed': match_ids que ya no aparecen,
+            'changed': {match_id: {'sección.clave': (antes, ahora)}},
+            'events': [{'match_id', 'type': 'goal' | 'goal_cancelled' | 'red_card',
+                        'team': 'home' | 'away', 'minute', 'score': (local, visitante)}]
+        }
+    """
+    added = [match_id for match_id in current if match_id not in previous]
+    removed = [match_id for match_id in previous if match_id not in current]
+    changed = {}
+    events = []
+    
+    for match_id, match in current.items():
+        before = previous.get(match_id)
+        if before is None:
+            continue
+        
+        fields = {}
+        for section, key in TRACKED_FIELDS:
+            old, new = _field(before, section, key), _field(match, section, key)
+            if old != new:
+                fields[key if section is None else f"{section}.{key}"] = (old, new)
+        if not fields:
+            continue
+        changed[match_id] = fields
+        
+        minute = match['status']['game_time']
+        score = (match['home_team']['score'], match['away_team']['score'])
+        for team in ('home', 'away'):
+            goals = fields.get(f"{team}_team.score")
+            if goals:
+                delta = (goals[1] or 0) - (goals[0] or 0)
+                event = 'goal' if delta > 0 else 'goal_cancelled'
+                events.extend({'match_id': match_id, 'type': event, 'team': team,
+                               'minute': minute, 'score': score} for _ in range(abs(delta)))
+            
+            cards = fields.get(f"{team}_team.red_cards")
+            if cards and (cards[1] or 0) > (cards[0] or 0):
+                events.extend({'match_id': match_id, 'type': 'red_card', 'team': team,
+                               'minute': minute, 'score': score}
+                              for _ in range((cards[1] or 0) - (cards[0] or 0)))
+    
+    return {'added': added, 'removed': removed, 'changed': changed, 'events': events}
+
+
+class MatchSnapshot:
+    """
+    Partidos parseados de un día con índices secundarios
+    
+    Los índices apuntan a los mismos dicts que `matches`; los métodos de
+    consulta del consumidor devuelven copias (también de 'home_team',
+    'status'...) para que quien las modifique (p. ej. al añadir
+    'prediction' o actualizar un marcador) no altere el snapshot.
+    
+    `changes` guarda el diff frente al snapshot anterior del mismo día
+    (`diff_matches`); `version` crece en cada descarga (y no se repite
+    aunque el snapshot de un día se descarte y vuelva a descargarse) para
+    que quien consuma los cambios sepa si ya los procesó.
+    """
+    
+    _versions = itertools.count(1)
+    
+    def __init__(self, matches: List[Dict], previous: Optional['MatchSnapshot'] = None):
+        self.matches = matches
+        self.fetched_at = time.monotonic()
+        self.version = next(self._versions)
+        self.previous_version = previous.version if previous is not None else None
+        self.by_id: Dict[str, Dict] = {}
+        self.by_status_group: Dict[int, List[Dict]] = {}
+        self.by_competition: Dict[str, List[Dict]] = {}
+        self.competition_names: Dict[str, str] = {}
+        
+        for match in matches:
+            self.by_id[match['match_id']] = match
+            self.by_status_group.setdefault(match['status']['status_group'], []).append(match)
+            competition = match['competition']
+            self.by_competition.setdefault(competition['id'], []).append(match)
+            self.competition_names[competition['id']] = competition['name']
+        
+        self.changes = diff_matches(previous.by_id if previous is not None else {}, self.by_id)
+    
+    def age(self) -> float:
+        """Segundos desde la descarga"""
+        return time.monotonic() - self.fetched_at
+
+
 class FootballAPI7Consumer:
     """Consumidor de Football API 7 (RapidAPI)"""
     
     BASE_URL = "https://football-api-7.p.rapidapi.com/api/v3"
     
-    def __init__(self, api_key: str):
+    def __init__(self,
+                 api_key: str,
+                 session: Optional[PooledSession] = None,
+                 max_workers: int = 4,
+                 rate_limit_per_minute: float = 30,
+                 rate_limit_burst: int = 5,
+                 max_rate_limit_retries: int = 3,
+                 max_backoff: float = 60.0,
+                 snapshot_ttl: float = 60.0,
+                 stream_parse: bool = True,
+                 metrics: Optional[RequestMetrics] = None,
+                 base_url: Optional[str] = None):
+        """
+        Args:
+            api_key: RapidAPI key
+            session: Sesión HTTP compartida (default: una propia con los
+                parámetros por defecto de PooledSession)
+            max_workers: Máximo de peticiones simultáneas en `get_matches_range`
+            rate_limit_per_minute: Peticiones por minuto permitidas por el plan
+            rate_limit_burst: Ráfaga máxima del limitador
+            max_rate_limit_retries: Reintentos tras un 429
+            max_backoff: Espera máxima entre reintentos (segundos)
+            snapshot_ttl: Vigencia (segundos) del snapshot parseado de cada día
+            stream_parse: Parsear /matches de forma incremental (sin cargar
+                el JSON completo en memoria)
+            metrics: Registro de métricas (default: el compartido `request_metrics`)
+            base_url: URL base de la API (default: BASE_URL; p. ej. un
+                servidor local de benchmarks/standin_server.py)
+        """
         self.api_key = api_key
         self.headers = {
             'x-rapidapi-key': api_key,
             'x-rapidapi-host': 'football-api-7.p.rapidapi.com'
         }
+        self.session = session or PooledSession()
+        self.max_workers = max_workers
+        
+        # Cuota: limitador compartido por todas las sesiones del dashboard y
+        # coalescencia de peticiones idénticas en curso
+        self.rate_limiter = TokenBucket(rate_limit_per_minute / 60.0, rate_limit_burst)
+        self.single_flight = SingleFlight()
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.max_backoff = max_backoff
+        self.rate_limited = 0
+        
+        # Snapshot parseado por (fecha, zona horaria, idioma); se descartan
+        # los vencidos de días fuera de ayer/hoy/mañana (ver _evict_snapshots)
+        self.snapshot_ttl = snapshot_ttl
+        self.stream_parse = stream_parse
+        self.metrics = metrics or request_metrics
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+        self._snapshots: Dict[Tuple[str, str, str], MatchSnapshot] = {}
+        self._snapshots_lock = threading.Lock()
     
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
-        """Hacer petición a la API con manejo de errores"""
-        try:
-            url = f"{self.BASE_URL}/{endpoint}"
-            
-            print(f"🔍 Llamando: {url}")
-            print(f"📊 Params: {params}")
+        """
+        Hacer petición a la API con manejo de errores
+        
+        Las peticiones idénticas simultáneas comparten una sola llamada.
+        """
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        return self.single_flight.do(key, lambda: self._request_with_backoff(endpoint, params))
+    
+    def _request_with_backoff(self, endpoint: str, params: Optional[Dict] = None,
+                              stream: bool = False):
+        """
+        Petición limitada por el token bucket; ante 429 reintenta con backoff
+        
+        Con stream=True devuelve la respuesta 200 sin leer el cuerpo en lugar
+        del JSON decodificado. El resto de respuestas se cierran aquí: en
+        streaming su conexión no vuelve al pool hasta cerrarlas.
+        """
+        for attempt in range(self.max_rate_limit_retries + 1):
+            self.rate_limiter.acquire()
+            response = self._send(endpoint, params, stream)
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            if stream and response is not None and response.status_code == 200:
+                return response
+            if response is None or response.status_code != 429:
+                try:
+                    return self._handle_response(response)
+                finally:
+                    if response is not None:
+                        response.close()
             
-            print(f"📡 Status: {response.status_code}")
+            response.close()
+            self.rate_limited += 1
+            self.metrics.record_retry(endpoint, '429')
+            if attempt == self.max_rate_limit_retries:
+                break
             
+            # Retry-After si la API lo envía; si no, backoff exponencial
+            wait = retry_after_seconds(response.headers.get('Retry-After'))
+            if wait is None:
+                wait = 2.0 ** attempt
+            wait = min(wait, self.max_backoff)
+            logger.warning("Rate limit alcanzado en /%s, reintentando en %.1fs", endpoint, wait)
+            time.sleep(wait)
+        
+        logger.error("Rate limit alcanzado en /%s tras %d reintentos", endpoint, self.max_rate_limit_retries)
+        return None
+    
+    def _send(self, endpoint: str, params: Optional[Dict] = None, stream: bool = False):
+        """GET a la API; None si falla la conexión"""
+        url = f"{self.base_url}/{endpoint}"
+        logger.debug("GET %s %s", url, params)
+        
+        try:
+            response = self.session.get(url, headers=self.headers, params=params, timeout=15,
+                                        stream=stream)
+        except Exception as e:
+            self.metrics.record_error(endpoint)
+            logger.error("Error en petición a /%s: %s", endpoint, e)
+            return None
+        
+        # En streaming el cuerpo aún no se leyó: sus bytes se cuentan al parsear
+        nbytes = 0 if stream else len(response.content)
+        latency = response.elapsed.total_seconds()
+        self.metrics.record_request(endpoint, latency, response.status_code, nbytes)
+        self.metrics.record_retry(endpoint, 'http', retries_used(response))
+        logger.debug("/%s → %d en %.0f ms (%s)", endpoint, response.status_code,
+                     1000 * latency, "streaming" if stream else f"{nbytes} bytes")
+        return response
+    
+    def _handle_response(self, response) -> Optional[Dict]:
+        """JSON de una respuesta 200; None (con aviso) en cualquier otro caso"""
+        if response is None:
+            return None
+        
+        try:
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 403:
-                print(f"❌ Error 403: {response.text}")
-                print("⚠️ Verifica tu suscripción a Football API 7 en RapidAPI")
-                return None
-            elif response.status_code == 429:
-                print(f"⚠️ Rate limit alcanzado")
+                logger.error("Error 403: %s. Verifica tu suscripción a Football API 7 en RapidAPI",
+                             response.text)
                 return None
             else:
-                print(f"❌ Error {response.status_code}: {response.text}")
+                logger.error("Error %d: %s", response.status_code, response.text)
                 return None
         except Exception as e:
-            print(f"❌ Error en petición: {str(e)}")
+            logger.error("Respuesta inválida: %s", e)
             return None
     
-    def get_matches_by_date(self, date: str = None, timezone: str = "america/santiago", lang: str = "en") -> List[Dict]:
+    def get_snapshot(self, date: str = None, timezone: str = "america/santiago",
+                     lang: str = "en") -> Optional[MatchSnapshot]:
         """
-        Obtener todos los partidos de un día específico
+        Snapshot parseado de un día (una descarga por día y TTL)
         
         Args:
             date: Fecha en formato DD/MM/YYYY (default: hoy)
@@ -54,7 +296,7 @@ class FootballAPI7Consumer:
             lang: Idioma (default: en)
         
         Returns:
-            Lista de partidos parseados
+            MatchSnapshot o None si la petición falló
         """
         # Si no se proporciona fecha, usar hoy
         if date is None:
@@ -62,33 +304,248 @@ class FootballAPI7Consumer:
             today = datetime.now(tz)
             date = today.strftime('%d/%m/%Y')
         
+        key = (date, timezone, lang)
+        with self._snapshots_lock:
+            snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot.age() < self.snapshot_ttl:
+            return snapshot
+        
+        # Vistas simultáneas del mismo día comparten la descarga (single-flight)
+        return self.single_flight.do(('snapshot',) + key, lambda: self._refresh_snapshot(key))
+    
+    def get_changes(self, date: str = None, since_version: int = None,
+                    timezone: str = "america/santiago", lang: str = "en") -> Dict:
+        """
+        Cambios de la última encuesta frente a la anterior
+        
+        Refresca el snapshot si venció el TTL y devuelve su diff, para que
+        emparejado, predicción, base de datos y UI procesen solo los partidos
+        que cambiaron.
+        
+        Args:
+            date: Fecha en formato DD/MM/YYYY (default: hoy)
+            since_version: Versión ya procesada por quien llama (None en la
+                primera llamada). Si coincide con la actual no hay cambios
+                nuevos; si es None o no es la del snapshot anterior, todos
+                los partidos se marcan como añadidos y 'resync' es True
+                (descartar los que no aparezcan)
+            timezone: Zona horaria (default: america/santiago)
+            lang: Idioma (default: en)
+        
+        Returns:
+            Dict de `diff_matches` más 'version', 'resync' y 'matches'
+            (copias de los partidos añadidos o cambiados, por match_id)
+        """
+        snapshot = self.get_snapshot(date, timezone, lang)
+        if snapshot is None:
+            return {'version': since_version, 'resync': False, 'added': [], 'removed': [],
+                    'changed': {}, 'events': [], 'matches': {}}
+        
+        resync = False
+        if since_version == snapshot.version:
+            changes = {'added': [], 'removed': [], 'changed': {}, 'events': []}
+        elif since_version is None or since_version != snapshot.previous_version:
+            # Primera llamada o se saltó alguna encuesta: el diff guardado no basta
+            changes = {'added': list(snapshot.by_id), 'removed': [], 'changed': {}, 'events': []}
+            resync = True
+        else:
+            changes = snapshot.changes
+        
+        touched = list(changes['added']) + list(changes['changed'])
+        return {
+            'version': snapshot.version,
+            'resync': resync,
+            **changes,
+            'matches': {match_id: _copy_match(snapshot.by_id[match_id]) for match_id in touched}
+        }
+    
+    def _refresh_snapshot(self, key: Tuple[str, str, str]) -> Optional[MatchSnapshot]:
+        """Descargar y parsear un día; los fallos no se cachean"""
+        with self._snapshots_lock:
+            snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot.age() < self.snapshot_ttl:
+            return snapshot
+        
+        date, timezone, lang = key
+        matches = self._fetch_matches(date, timezone, lang)
+        if matches is None:
+            return None
+        
+        with self._snapshots_lock:
+            snapshot = MatchSnapshot(matches, previous=self._snapshots.get(key))
+            self._snapshots[key] = snapshot
+            self._evict_snapshots()
+        return snapshot
+    
+    def _evict_snapshots(self):
+        """
+        Descartar los snapshots vencidos de días fuera de ayer/hoy/mañana
+        
+        El consumidor vive tanto como el proceso (`st.cache_resource`): sin
+        esto guardaría la lista completa de partidos de cada día consultado.
+        Se llama con `_snapshots_lock` tomado.
+        """
+        today = datetime.now(pytz.timezone('America/Santiago')).date()
+        for key, snapshot in list(self._snapshots.items()):
+            if snapshot.age() < self.snapshot_ttl:
+                continue
+            try:
+                day = datetime.strptime(key[0], '%d/%m/%Y').date()
+            except ValueError:
+                day = None
+            if day is None or abs((day - today).days) > 1:
+                del self._snapshots[key]
+    
+    def _fetch_matches(self, date: str, timezone: str, lang: str) -> Optional[List[Dict]]:
+        """
+        Descargar y parsear los partidos de un día
+        
+        Returns:
+            Lista de partidos parseados o None si la petición falló
+        """
         params = {
             'date': date,
             'time': timezone,
             'lang': lang
         }
         
-        data = self._make_request('matches', params)
+        if not self.stream_parse:
+            data = self._make_request('matches', params)
+            if data is None:
+                return None
+            start = time.perf_counter()
+            matches = list(self.parse_matches(data))
+            self.metrics.record_parse('matches', time.perf_counter() - start, len(matches))
+            return matches
         
-        if not data:
-            return []
+        response = self._request_with_backoff('matches', params, stream=True)
+        if response is None:
+            return None
         
-        # Parsear y aplanar la estructura
-        all_matches = []
+        try:
+            return list(self._parse_response_stream(response))
+        except Exception as e:
+            # Cuerpo cortado o JSON inválido: no se cachea un día a medias
+            logger.error("Error leyendo partidos: %s", e)
+            return None
+    
+    def iter_matches_by_date(self, date: str, timezone: str = "america/santiago",
+                             lang: str = "en") -> Iterator[Dict]:
+        """
+        Partidos de un día a medida que se descargan (sin snapshot)
+        
+        Args:
+            date: Fecha en formato DD/MM/YYYY
+            timezone: Zona horaria (default: america/santiago)
+            lang: Idioma (default: en)
+        
+        Yields:
+            Partidos parseados, en el orden de la respuesta
+        """
+        params = {
+            'date': date,
+            'time': timezone,
+            'lang': lang
+        }
+        
+        response = self._request_with_backoff('matches', params, stream=True)
+        if response is None:
+            return
+        
+        yield from self._parse_response_stream(response)
+    
+    def _parse_response_stream(self, response) -> Iterator[Dict]:
+        """
+        Parsear una respuesta en streaming registrando bytes, tiempo e items
+        
+        El tiempo de parseo incluye la lectura del cuerpo, que se solapa con él.
+        """
+        received = 0
+        items = 0
+        start = time.perf_counter()
         
+        def chunks():
+            nonlocal received
+            for chunk in response.iter_content(self.STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                yield chunk
+        
+        try:
+            for match in self.parse_matches_stream(chunks()):
+                items += 1
+                yield match
+        finally:
+            response.close()
+        
+        self.metrics.record_parse('matches', time.perf_counter() - start, items, received)
+    
+    def parse_matches(self, data: List[Dict]) -> Iterator[Dict]:
+        """
+        Aplanar la respuesta de /matches ya decodificada
+        
+        Args:
+            data: Lista de competiciones con sus partidos
+        
+        Yields:
+            Partidos parseados
+        """
         for competition_data in data:
             try:
                 competition = competition_data.get('competition', {})
                 games = competition_data.get('games', [])
-                
-                for game in games:
-                    match = self._parse_match(game, competition)
-                    all_matches.append(match)
+                parsed = [self._parse_match(game, competition) for game in games]
             except Exception as e:
-                print(f"⚠️ Error parseando competición: {str(e)}")
+                logger.warning("Error parseando competición: %s", e)
                 continue
+            
+            yield from parsed
+    
+    def parse_matches_stream(self, chunks: Iterable[bytes]) -> Iterator[Dict]:
+        """
+        Parseo incremental del cuerpo de /matches
+        
+        Se decodifica una competición cada vez y solo con los campos que usa
+        `_parse_match`, así que el pico de memoria no depende del tamaño de la
+        respuesta y los primeros partidos están disponibles antes de
+        terminar de leerla.
+        
+        Args:
+            chunks: Trozos del cuerpo (p. ej. `response.iter_content()`)
+        
+        Yields:
+            Partidos parseados
+        """
+        competitions = iter_json_array(chunks, projecting_hook(self.PARSED_FIELDS))
+        for competition_data in competitions:
+            yield from self.parse_matches([competition_data])
+    
+    def get_matches_by_date(self, date: str = None, timezone: str = "america/santiago", lang: str = "en") -> List[Dict]:
+        """
+        Obtener todos los partidos de un día específico
+        
+        Args:
+            date: Fecha en formato DD/MM/YYYY (default: hoy)
+            timezone: Zona horaria (default: america/santiago)
+            lang: Idioma (default: en)
+        
+        Returns:
+            Lista de partidos parseados
+        """
+        snapshot = self.get_snapshot(date, timezone, lang)
+        if snapshot is None:
+            return []
         
-        return all_matches
+        return [_copy_match(match) for match in snapshot.matches]
+    
+    # Claves (de cualquier nivel) que lee _parse_match
+    PARSED_FIELDS = frozenset([
+        'competition', 'games',
+        'id', 'name', 'logo', 'countryId',
+        'homeCompetitor', 'awayCompetitor', 'score', 'redCards',
+        'statusGroup', 'statusText', 'shortStatusText', 'gameTime', 'gameTimeDisplay', 'justEnded',
+        'startTime', 'roundName', 'stageName', 'hasLineups', 'hasVideo'
+    ])
+    STREAM_CHUNK_SIZE = 64 * 1024
     
     def _parse_match(self, game: Dict, competition: Dict) -> Dict:
         """
@@ -142,6 +599,7 @@ class FootballAPI7Consumer:
             },
             'status': {
                 'is_live': is_live,
+                'status_group': status_group,
                 'status_text': game.get('statusText', ''),
                 'short_status': game.get('shortStatusText', ''),
                 'game_time': game_time,
@@ -155,6 +613,40 @@ class FootballAPI7Consumer:
             'has_video': game.get('hasVideo', False)
         }
     
+    def get_matches_range(self, start: str, end: str, timezone: str = "america/santiago",
+                          lang: str = "en") -> List[Dict]:
+        """
+        Obtener los partidos de un rango de días en paralelo
+        
+        Args:
+            start: Primer día en formato DD/MM/YYYY
+            end: Último día (incluido) en formato DD/MM/YYYY
+            timezone: Zona horaria (default: america/santiago)
+            lang: Idioma (default: en)
+        
+        Returns:
+            Lista de partidos sin duplicados por match_id (un partido cerca
+            de medianoche puede aparecer en dos días), en orden de fecha
+        """
+        first = datetime.strptime(start, '%d/%m/%Y')
+        last = datetime.strptime(end, '%d/%m/%Y')
+        dates = [(first + timedelta(days=i)).strftime('%d/%m/%Y')
+                 for i in range((last - first).days + 1)]
+        
+        results = map_concurrently(
+            lambda date: self.get_matches_by_date(date, timezone, lang), dates, self.max_workers
+        )
+        
+        matches = []
+        seen = set()
+        for day_matches in results:
+            for match in day_matches:
+                if match['match_id'] not in seen:
+                    seen.add(match['match_id'])
+                    matches.append(match)
+        
+        return matches
+    
     def get_live_matches(self, date: str = None) -> List[Dict]:
         """
         Obtener solo los partidos que están en vivo
@@ -165,17 +657,46 @@ class FootballAPI7Consumer:
         Returns:
             Lista de partidos en vivo
         """
-        all_matches = self.get_matches_by_date(date)
+        return self.get_matches_by_status(3, date)
+    
+    def get_matches_by_status(self, status_group: int, date: str = None) -> List[Dict]:
+        """
+        Partidos de un grupo de estado (índice del snapshot)
         
-        # Filtrar solo los que están en vivo
-        live_matches = [
-            match for match in all_matches 
-            if match['status']['is_live']
-        ]
+        Args:
+            status_group: 2 = Programado, 3 = En vivo, 4 = Finalizado
+            date: Fecha en formato DD/MM/YYYY (default: hoy)
+        
+        Returns:
+            Lista de partidos de ese estado
+        """
+        snapshot = self.get_snapshot(date)
+        if snapshot is None:
+            return []
+        
+        matches = [_copy_match(match) for match in snapshot.by_status_group.get(status_group, [])]
+        
+        if status_group == 3:
+            logger.info("%d partidos en vivo de %d totales", len(matches), len(snapshot.matches))
+        
+        return matches
+    
+    def get_matches_by_competition_id(self, competition_id: str, date: str = None) -> List[Dict]:
+        """
+        Partidos de una competición por id (índice del snapshot)
         
-        print(f"✅ {len(live_matches)} partidos en vivo de {len(all_matches)} totales")
+        Args:
+            competition_id: Id de la competición en Football API 7
+            date: Fecha en formato DD/MM/YYYY
         
-        return live_matches
+        Returns:
+            Lista de partidos de esa competición
+        """
+        snapshot = self.get_snapshot(date)
+        if snapshot is None:
+            return []
+        
+        return [_copy_match(match) for match in snapshot.by_competition.get(str(competition_id), [])]
     
     def get_matches_by_competition(self, competition_name: str, date: str = None) -> List[Dict]:
         """
@@ -188,11 +709,15 @@ class FootballAPI7Consumer:
         Returns:
             Lista de partidos de esa competición
         """
-        all_matches = self.get_matches_by_date(date)
+        snapshot = self.get_snapshot(date)
+        if snapshot is None:
+            return []
         
-        filtered = [
-            match for match in all_matches
-            if competition_name.lower() in match['competition']['name'].lower()
+        # Se recorren las competiciones del día, no todos los partidos
+        name = competition_name.lower()
+        return [
+            _copy_match(match)
+            for competition_id, competition in snapshot.competition_names.items()
+            if name in competition.lower()
+            for match in snapshot.by_competition[competition_id]
         ]
-        
-        return filtered
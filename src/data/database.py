@@ -77,6 +77,25 @@ class Database:
             )
         ''')
         
+        # Enlaces partido (Football API 7) → predicción (PrimaTips)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS match_links (
+                match_id TEXT PRIMARY KEY,
+                prediction_id TEXT NOT NULL,
+                date TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Alias de equipos aprendidos (nombre PrimaTips → nombre API, normalizados)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS team_aliases (
+                alias TEXT PRIMARY KEY,
+                canonical TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
         conn.commit()
         conn.close()
     
@@ -166,6 +185,113 @@ class Database:
         conn.commit()
         conn.close()
     
+    # ==========================================
+    # Métodos de Matching (enlaces y alias)
+    # ==========================================
+    
+    def save_match_links(self, links: Dict[str, str], date: str = None):
+        """
+        Guardar enlaces partido → predicción
+        
+        Args:
+            links: Dict match_id (Football API 7) → id de PrimaTips
+            date: Fecha de los partidos (YYYY-MM-DD)
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            INSERT OR REPLACE INTO match_links 
+            (match_id, prediction_id, date, created_at)
+            VALUES (?, ?, ?, ?)
+        ''', [
+            (match_id, prediction_id, date, datetime.now().isoformat())
+            for match_id, prediction_id in links.items()
+        ])
+        
+        conn.commit()
+        conn.close()
+    
+    def get_match_links(self) -> Dict[str, str]:
+        """Obtener todos los enlaces como dict match_id → id de PrimaTips"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT match_id, prediction_id FROM match_links')
+        links = dict(cursor.fetchall())
+        
+        conn.close()
+        return links
+    
+    def save_team_aliases(self, aliases: Dict[str, str]):
+        """
+        Guardar alias de equipos
+        
+        Args:
+            aliases: Dict nombre PrimaTips → nombre Football API 7 (normalizados)
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            INSERT OR REPLACE INTO team_aliases 
+            (alias, canonical, created_at)
+            VALUES (?, ?, ?)
+        ''', [
+            (alias, canonical, datetime.now().isoformat())
+            for alias, canonical in aliases.items()
+        ])
+        
+        conn.commit()
+        conn.close()
+    
+    def get_team_aliases(self) -> Dict[str, str]:
+        """Obtener todos los alias como dict nombre PrimaTips → nombre API"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT alias, canonical FROM team_aliases')
+        aliases = dict(cursor.fetchall())
+        
+        conn.close()
+        return aliases
+    
+    def delete_team_aliases(self, aliases: List[str]):
+        """Borrar alias (p. ej. uno aprendido por error)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany('DELETE FROM team_aliases WHERE alias = ?', [(alias,) for alias in aliases])
+        
+        conn.commit()
+        conn.close()
+    
+    def cleanup_old_aliases(self, days: int = 30):
+        """Limpiar alias antiguos (se vuelven a aprender si siguen siendo válidos)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            DELETE FROM team_aliases 
+            WHERE datetime(created_at) < datetime('now', '-' || ? || ' days')
+        ''', (days,))
+        
+        conn.commit()
+        conn.close()
+    
+    def cleanup_old_links(self, days: int = 2):
+        """Limpiar enlaces antiguos (los ids de PrimaTips solo son estables en el día)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            DELETE FROM match_links 
+            WHERE datetime(created_at) < datetime('now', '-' || ? || ' days')
+        ''', (days,))
+        
+        conn.commit()
+        conn.close()
+    
     # ==========================================
     # Métodos de Partidos (Existentes)
     # ==========================================
@@ -303,4 +429,22 @@ class Database:
         conn.commit()
         conn.close()
 
-db = Database()
+
+# Instancia global (se crea en el primer acceso: evita crear el archivo
+# SQLite y ejecutar DDL al importar el módulo)
+_db: Optional[Database] = None
+
+
+def get_db() -> Database:
+    """Instancia compartida de Database"""
+    global _db
+    if _db is None:
+        _db = Database()
+    return _db
+
+
+def __getattr__(name):
+    # Compatibilidad con `from src.data.database import db`
+    if name == 'db':
+        return get_db()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,67 @@
 """Scraper de predicciones desde PrimaTips"""
-import requests
-from bs4 import BeautifulSoup
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from pathlib import Path
 import pytz
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+
+from src.utils.http import PooledSession, map_concurrently, retries_used
+from src.utils.logger import RequestMetrics, request_metrics
+
+logger = logging.getLogger(__name__)
 
 class PrimaTipsScraper:
     """Scraper de predicciones de primatips.com"""
     
     BASE_URL = "https://primatips.com/tips/"
     CHILE_TZ = pytz.timezone("America/Santiago")
+    ENDPOINT = "primatips/tips"
+    
+    PARSERS = ("lxml", "html.parser")
+    
+    # Una página se considera definitiva este tiempo después de terminar su día
+    FINAL_AFTER = timedelta(hours=6)
+    # Páginas en memoria (las menos usadas se descartan; las de días
+    # terminados siguen en cache_dir)
+    MAX_PAGES = 8
     
-    def __init__(self):
+    def __init__(self, session: Optional[PooledSession] = None, max_workers: int = 4,
+                 metrics: Optional[RequestMetrics] = None, base_url: Optional[str] = None,
+                 parser: str = "lxml", cache_dir: Optional[str] = None):
+        """
+        Args:
+            session: Sesión HTTP compartida (default: una propia con los
+                parámetros por defecto de PooledSession)
+            max_workers: Máximo de fechas descargadas en paralelo
+            metrics: Registro de métricas (default: el compartido `request_metrics`)
+            base_url: URL de las páginas por fecha (default: BASE_URL)
+            parser: "lxml" (extractor directo sobre el árbol de lxml) o
+                "html.parser" (BeautifulSoup). Ambos devuelven lo mismo; sin
+                lxml instalado se usa "html.parser"
+            cache_dir: Directorio donde guardar las páginas de días ya
+                terminados, que no cambian (default: solo cache en memoria)
+        """
+        if parser not in self.PARSERS:
+            raise ValueError(f"Parser desconocido: {parser} (usar {', '.join(self.PARSERS)})")
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
+        self.session = session or PooledSession()
+        self.max_workers = max_workers
+        self.metrics = metrics or request_metrics
+        self.base_url = (base_url or self.BASE_URL).rstrip('/') + '/'
+        self.parser = parser if parser == "html.parser" or _lxml_available() else "html.parser"
+        
+        # Cache de páginas por fecha: validadores HTTP, hash del contenido,
+        # predicciones y hash de cada a.game para re-parsear solo los que cambian
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._pages: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._pages_lock = threading.Lock()
     
     def get_predictions_by_date(self, date_str: str) -> List[Dict]:
         """
@@ -26,52 +73,314 @@ class PrimaTipsScraper:
         Returns:
             Lista de predicciones
         """
-        url = f"{self.BASE_URL}{date_str}"
+        url = f"{self.base_url}{date_str}"
+        
+        with self._pages_lock:
+            page = self._pages.get(date_str)
+            if page is not None:
+                self._pages.move_to_end(date_str)
+        if page is None:
+            page = self._load_page(date_str)
+            if page is not None:
+                self._remember_page(date_str, page)
+        
+        # Días terminados: la página ya no cambia
+        if page is not None and page['final']:
+            logger.debug("PrimaTips %s desde cache (día terminado)", date_str)
+            return _copy_predictions(page['predictions'])
+        
+        headers = dict(self.headers)
+        if page is not None and page.get('etag'):
+            headers['If-None-Match'] = page['etag']
+        if page is not None and page.get('last_modified'):
+            headers['If-Modified-Since'] = page['last_modified']
         
         try:
-            print(f"🎯 Scraping PrimaTips: {url}")
-            response = requests.get(url, headers=self.headers, timeout=10)
+            logger.debug("Scraping PrimaTips: %s", url)
+            try:
+                response = self.session.get(url, headers=headers, timeout=10)
+            except Exception:
+                self.metrics.record_error(self.ENDPOINT)
+                raise
+            self.metrics.record_request(self.ENDPOINT, response.elapsed.total_seconds(),
+                                        response.status_code, len(response.content))
+            self.metrics.record_retry(self.ENDPOINT, 'http', retries_used(response))
+            
+            if response.status_code == 304 and page is not None:
+                logger.debug("PrimaTips %s sin cambios (304)", date_str)
+                return _copy_predictions(page['predictions'])
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, "html.parser")
-            games = soup.find_all("a", class_="game")
+            content_hash = hashlib.sha1(response.content).hexdigest()
+            if page is not None and page['hash'] == content_hash:
+                logger.debug("PrimaTips %s sin cambios (mismo contenido)", date_str)
+                predictions = page['predictions']
+                games = page['games']
+            else:
+                start = time.perf_counter()
+                previous = page['games'] if page is not None else {}
+                predictions, games, reused = self._parse_page_incremental(
+                    response.text, date_str, url, previous
+                )
+                self.metrics.record_parse(self.ENDPOINT, time.perf_counter() - start, len(predictions))
+                logger.info("%d predicciones obtenidas de PrimaTips (%s), %d sin cambios",
+                            len(predictions), date_str, reused)
+            
+            page = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'hash': content_hash,
+                'predictions': predictions,
+                'games': games,
+                'final': self._is_final(date_str)
+            }
+            self._remember_page(date_str, page)
+            if page['final']:
+                self._save_page(date_str, page)
             
-            predictions = []
+            return _copy_predictions(predictions)
             
-            for g in games:
+        except Exception as e:
+            logger.error("Error scraping PrimaTips: %s", e)
+            return []
+    
+    def _remember_page(self, date_str: str, page: Dict):
+        """Guardar una página en memoria, descartando las menos usadas por encima de MAX_PAGES"""
+        with self._pages_lock:
+            self._pages[date_str] = page
+            self._pages.move_to_end(date_str)
+            while len(self._pages) > self.MAX_PAGES:
+                self._pages.popitem(last=False)
+    
+    def _is_final(self, date_str: str) -> bool:
+        """Si el día de la página terminó hace más de FINAL_AFTER (hora de Chile)"""
+        day = self.CHILE_TZ.localize(datetime.strptime(date_str, "%Y-%m-%d"))
+        return datetime.now(self.CHILE_TZ) >= day + timedelta(days=1) + self.FINAL_AFTER
+    
+    def _page_path(self, date_str: str) -> Optional[Path]:
+        return self.cache_dir / f"{date_str}.json" if self.cache_dir else None
+    
+    def _load_page(self, date_str: str) -> Optional[Dict]:
+        """Página de un día terminado guardada en disco"""
+        path = self._page_path(date_str)
+        if path is None or not path.exists():
+            return None
+        try:
+            stored = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Cache de PrimaTips ilegible (%s): %s", path, e)
+            return None
+        return {**stored, 'games': {}, 'final': True}
+    
+    def _save_page(self, date_str: str, page: Dict):
+        path = self._page_path(date_str)
+        if path is None:
+            return
+        stored = {key: page[key] for key in ('etag', 'last_modified', 'hash', 'predictions')}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(stored, ensure_ascii=False), encoding="utf-8")
+        except OSError as e:
+            logger.warning("No se pudo guardar la cache de PrimaTips (%s): %s", path, e)
+    
+    def parse_page(self, html: str, date_str: str, url: str) -> List[Dict]:
+        """
+        Predicciones de una página de PrimaTips
+        
+        Args:
+            html: HTML de la página
+            date_str: Fecha de la página (YYYY-MM-DD)
+            url: URL de la página (base de los links)
+        
+        Returns:
+            Lista de predicciones, en el orden de la página
+        """
+        return self._parse_page_incremental(html, date_str, url, {}, hashed=False)[0]
+    
+    def _parse_page_incremental(self, html: str, date_str: str, url: str,
+                                previous: Dict[str, Tuple[str, Optional[Dict]]],
+                                hashed: bool = True
+                                ) -> Tuple[List[Dict], Dict[str, Tuple[str, Optional[Dict]]], int]:
+        """
+        Parsear solo los a.game que cambiaron desde la página anterior
+        
+        Cada a.game se identifica por su id `g_` (y su aparición, por si se
+        repite) y se compara por el hash de su HTML; si coincide se reutiliza
+        la predicción anterior sin volver a extraerla. Los hashes se calculan
+        también en el parseo en frío, para que la siguiente versión de la
+        página ya se parsee de forma incremental.
+        
+        Args:
+            html: HTML de la página
+            date_str: Fecha de la página (YYYY-MM-DD)
+            url: URL de la página
+            previous: Partidos de la página anterior (clave → (hash o None, predicción))
+            hashed: Calcular el hash de cada a.game (False en `parse_page`,
+                cuyo resultado no se cachea)
+        
+        Returns:
+            (predicciones, partidos de esta página, partidos reutilizados)
+        """
+        games = {}
+        predictions = []
+        reused = 0
+        
+        for key, digest, extract in self._iter_game_elements(html, hashed=hashed):
+            cached = previous.get(key)
+            if cached is not None and digest is not None and cached[0] == digest:
+                prediction = cached[1]
+                reused += 1
+            else:
                 try:
-                    prediction = self._parse_game(g, date_str, url)
-                    if prediction:
-                        predictions.append(prediction)
+                    prediction = self._build_prediction(extract(), date_str, url)
                 except Exception as e:
-                    print(f"⚠️ Error parseando partido: {str(e)}")
-                    continue
+                    logger.warning("Error parseando partido: %s", e)
+                    prediction = None
             
-            print(f"✅ {len(predictions)} predicciones obtenidas de PrimaTips")
-            return predictions
+            games[key] = (digest, prediction)
+            if prediction:
+                predictions.append(prediction)
+        
+        return predictions, games, reused
+    
+    def _iter_game_elements(self, html: str, hashed: bool = True
+                            ) -> Iterator[Tuple[str, Optional[str], Callable[[], Optional[Dict]]]]:
+        """
+        (clave, hash del HTML o None si not hashed, extractor de campos) de cada a.game
+        
+        La extracción se difiere para no hacerla en los partidos sin cambios.
+        """
+        if self.parser == "lxml":
+            from lxml import etree
+            elements = self._iter_games_lxml(html)
+            serialize = lambda game: etree.tostring(game, with_tail=False)
+            extract = self._parse_game_lxml
+        else:
+            elements = self._iter_games_soup(html)
+            serialize = lambda game: str(game).encode("utf-8")
+            extract = self._parse_game
+        
+        seen: Dict[str, int] = {}
+        for game in elements:
+            game_id = game.get("id", "")
+            seen[game_id] = seen.get(game_id, 0) + 1
+            key = f"{game_id}#{seen[game_id]}"
+            digest = hashlib.sha1(serialize(game)).hexdigest() if hashed else None
+            yield key, digest, (lambda game=game: extract(game))
+    
+    def _iter_games_soup(self, html: str):
+        """Elementos a.game con BeautifulSoup"""
+        # Import diferido: bs4 solo se carga cuando se hace scraping
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(html, "html.parser")
+        yield from soup.find_all("a", class_="game")
+    
+    def _iter_games_lxml(self, html: str):
+        """Elementos a.game sobre el árbol de lxml"""
+        import lxml.html
+        
+        if not html.strip():
+            return
+        
+        root = lxml.html.fromstring(html)
+        for game in root.iter("a"):
+            if "game" in _classes(game):
+                yield game
+    
+    def _parse_game(self, game_element) -> Optional[Dict]:
+        """
+        Extraer los campos en bruto de un elemento a.game (BeautifulSoup)
+        
+        Returns:
+            Dict de campos para `_build_prediction` o None si no es válido
+        """
+        live_section = game_element.find("span", class_="lvs")
+        teams_elem = game_element.find("span", class_="nms")
+        if not live_section or not teams_elem:
+            return None
+        
+        local_span = game_element.select_one(".res.lv .l")
+        visit_span = game_element.select_one(".res.lv .l.la")
+        double_tip = game_element.find("span", class_="tip")
+        
+        return {
+            "id": game_element.get("id", ""),
+            "minute": live_section.get_text(strip=True),
+            "teams": teams_elem.get_text(" ", strip=True),
+            "local": local_span.get_text(strip=True) if local_span else None,
+            "visit": visit_span.get_text(strip=True) if visit_span else None,
+            "odds": [o.get_text(strip=True) for o in game_element.find_all("span", class_="o")],
+            "tip": double_tip.get_text(strip=True) if double_tip else None,
+            "href": game_element.get("href", "")
+        }
+    
+    def _parse_game_lxml(self, game_element) -> Optional[Dict]:
+        """
+        Equivalente de `_parse_game` sobre un elemento de lxml
+        
+        Replica la semántica de BeautifulSoup: `find` y `select_one` buscan
+        solo en descendientes (en orden de documento), el ancestro `.res.lv`
+        del selector puede estar en cualquier nivel y `get_text(strip=True)`
+        une los textos no vacíos ya recortados.
+        """
+        live_section = teams_elem = local_span = visit_span = double_tip = None
+        odds = []
+        
+        for element in game_element.iterdescendants():
+            if not isinstance(element.tag, str):
+                continue  # comentarios
+            classes = _classes(element)
+            if not classes:
+                continue
             
-        except Exception as e:
-            print(f"❌ Error scraping PrimaTips: {str(e)}")
-            return []
+            if element.tag == "span":
+                if live_section is None and "lvs" in classes:
+                    live_section = element
+                if teams_elem is None and "nms" in classes:
+                    teams_elem = element
+                if double_tip is None and "tip" in classes:
+                    double_tip = element
+                if "o" in classes:
+                    odds.append(_text(element))
+            
+            if "l" in classes and (local_span is None or visit_span is None) and _in_live_result(element):
+                if local_span is None:
+                    local_span = element
+                if visit_span is None and "la" in classes:
+                    visit_span = element
+        
+        if live_section is None or teams_elem is None:
+            return None
+        
+        return {
+            "id": game_element.get("id", ""),
+            "minute": _text(live_section),
+            "teams": _text(teams_elem, " "),
+            "local": _text(local_span) if local_span is not None else None,
+            "visit": _text(visit_span) if visit_span is not None else None,
+            "odds": odds,
+            "tip": _text(double_tip) if double_tip is not None else None,
+            "href": game_element.get("href", "")
+        }
     
-    def _parse_game(self, game_element, date_str: str, base_url: str) -> Optional[Dict]:
+    def _build_prediction(self, fields: Optional[Dict], date_str: str, base_url: str) -> Optional[Dict]:
         """
-        Parsear un elemento de partido
+        Construir la predicción a partir de los campos de un partido
         
         Returns:
             Dict con la predicción o None si no es válido
         """
+        if not fields:
+            return None
+        
         # ID del partido
-        game_id = game_element.get("id", "")
+        game_id = fields["id"]
         if game_id.startswith("g_"):
             game_id = game_id[2:]
         
         # Estado / minuto
-        live_section = game_element.find("span", class_="lvs")
-        if not live_section:
-            return None
-        
-        minute_raw = live_section.get_text(strip=True)
+        minute_raw = fields["minute"]
         
         # Filtrar solo partidos en vivo o próximos
         # Incluir: minutos (45'), HT, intervalos (+2), o próximos sin minuto
@@ -81,11 +390,7 @@ class PrimaTipsScraper:
                    minute_raw == "HT")
         
         # Equipos
-        teams_elem = game_element.find("span", class_="nms")
-        if not teams_elem:
-            return None
-        
-        teams = teams_elem.get_text(" ", strip=True)
+        teams = fields["teams"]
         
         # Parsear equipos (formato: "Team1 - Team2")
         teams_split = teams.split(" - ")
@@ -93,11 +398,8 @@ class PrimaTipsScraper:
         away_team = teams_split[1].strip() if len(teams_split) > 1 else ""
         
         # Marcador
-        local_span = game_element.select_one(".res.lv .l")
-        visit_span = game_element.select_one(".res.lv .l.la")
-        
-        local = local_span.get_text(strip=True) if local_span and local_span.get_text(strip=True) else "0"
-        visit = visit_span.get_text(strip=True) if visit_span and visit_span.get_text(strip=True) else "0"
+        local = fields["local"] or "0"
+        visit = fields["visit"] or "0"
         
         try:
             home_score = int(local)
@@ -107,11 +409,10 @@ class PrimaTipsScraper:
             away_score = 0
         
         # Odds
-        odds_raw = game_element.find_all("span", class_="o")
         odds = []
-        for o in odds_raw:
+        for o in fields["odds"]:
             try:
-                odds.append(float(o.get_text(strip=True)))
+                odds.append(float(o))
             except:
                 odds.append(None)
         
@@ -125,9 +426,8 @@ class PrimaTipsScraper:
             predicted_name = ["Local", "Empate", "Visitante"][idx]
         
         # Doble apuesta (tip destacado)
-        double_tip = game_element.find("span", class_="tip")
-        if double_tip:
-            predicted = double_tip.get_text(strip=True)
+        if fields["tip"] is not None:
+            predicted = fields["tip"]
             # Mapear a nombre legible
             tip_map = {
                 "1": "Local",
@@ -143,7 +443,7 @@ class PrimaTipsScraper:
         probabilities = self._calculate_probabilities(odds)
         
         # Link al partido
-        href = game_element.get("href", "")
+        href = fields["href"]
         link = base_url + href if href else base_url
         
         return {
@@ -204,6 +504,19 @@ class PrimaTipsScraper:
             "away": round(prob_away, 3)
         }
     
+    def get_predictions_by_dates(self, dates: List[str]) -> List[Dict]:
+        """
+        Obtener predicciones de varios días en paralelo
+        
+        Args:
+            dates: Fechas en formato YYYY-MM-DD
+        
+        Returns:
+            Lista de predicciones, en el orden de `dates`
+        """
+        results = map_concurrently(self.get_predictions_by_date, dates, self.max_workers)
+        return [prediction for predictions in results for prediction in predictions]
+    
     def get_live_predictions(self) -> List[Dict]:
         """
         Obtener predicciones de partidos en vivo (ayer, hoy, mañana)
@@ -214,20 +527,11 @@ class PrimaTipsScraper:
         now = datetime.now(self.CHILE_TZ)
         dates = [(now + timedelta(days=i)).strftime("%Y-%m-%d") for i in (-1, 0, 1)]
         
-        all_predictions = []
-        
-        for date_str in dates:
-            predictions = self.get_predictions_by_date(date_str)
-            
-            # Filtrar solo los que están en vivo
-            live_predictions = [
-                p for p in predictions 
-                if p.get("is_live", False)
-            ]
-            
-            all_predictions.extend(live_predictions)
-        
-        return all_predictions
+        # Filtrar solo los que están en vivo
+        return [
+            p for p in self.get_predictions_by_dates(dates)
+            if p.get("is_live", False)
+        ]
     
     def get_predictions_today(self) -> List[Dict]:
         """
@@ -240,3 +544,36 @@ class PrimaTipsScraper:
         today_str = now.strftime("%Y-%m-%d")
         
         return self.get_predictions_by_date(today_str)
+
+
+def _copy_predictions(predictions: List[Dict]) -> List[Dict]:
+    """Copias de las predicciones cacheadas (quien las recibe puede modificarlas)"""
+    return [{**p, 'odds': dict(p['odds']), 'probabilities': dict(p['probabilities'])}
+            for p in predictions]
+
+
+def _lxml_available() -> bool:
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _classes(element) -> List[str]:
+    """Clases CSS de un elemento de lxml"""
+    return element.get("class", "").split()
+
+
+def _text(element, separator: str = "") -> str:
+    """Equivalente a BeautifulSoup get_text(separator, strip=True)"""
+    return separator.join(text.strip() for text in element.itertext() if text.strip())
+
+
+def _in_live_result(element) -> bool:
+    """Si algún ancestro tiene las clases res y lv (selector `.res.lv .l`)"""
+    for ancestor in element.iterancestors():
+        classes = _classes(ancestor)
+        if "res" in classes and "lv" in classes:
+            return True
+    return False
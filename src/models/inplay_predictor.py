@@ -1,9 +1,15 @@
 """Predictor in-play que combina datos pre-match con estado actual"""
 import numpy as np
-from scipy.stats import poisson
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from src.models.lambda_solver import LambdaSolver
+from src.models.outcome_table import OutcomeTable
+from src.models.score_matrix import (
+    DEFAULT_GOAL_LINES, grid_size_for_tolerance, market_probabilities,
+    match_odds, match_odds_convolved, outcome_probabilities, score_matrix
+)
+
 class InPlayPredictor:
     """
     Predictor que actualiza probabilidades durante el partido
@@ -13,8 +19,44 @@ class InPlayPredictor:
     - Modelo Poisson ajustado
     """
     
-    def __init__(self):
-        self.max_goals = 10
+    MODES = ('exact', 'table')
+    RED_CARD_OWN_FACTOR = 0.75           # Intensidad propia por cada roja
+    RED_CARD_OPPONENT_FACTOR = 1.2       # Intensidad del rival por cada roja
+    
+    def __init__(self,
+                 max_goals: int = 10,
+                 tail_tolerance: Optional[float] = 1e-6,
+                 mode: str = 'exact',
+                 outcome_table: Optional[OutcomeTable] = None,
+                 lambda_solver: Optional[LambdaSolver] = None):
+        """
+        Args:
+            max_goals: Tamaño máximo de la matriz de goles adicionales
+            tail_tolerance: Masa de probabilidad que se permite truncar por
+                equipo; el tamaño de la matriz se elige por partido según
+                su lambda. None = usar siempre max_goals
+            mode: 'exact' (matriz de Poisson por partido) o 'table'
+                (interpolación en tabla precalculada)
+            outcome_table: Tabla a usar en modo 'table' (default: se carga
+                desde data/models/ o se construye en el primer uso)
+            lambda_solver: Solver 1X2 → lambdas (default: uno nuevo con
+                memoización propia)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Modo inválido: {mode} (usar uno de {self.MODES})")
+        
+        self.max_goals = max_goals
+        self.tail_tolerance = tail_tolerance
+        self.mode = mode
+        self._outcome_table = outcome_table
+        self.lambda_solver = lambda_solver or LambdaSolver()
+    
+    @property
+    def outcome_table(self) -> OutcomeTable:
+        """Tabla 1X2 precalculada (se carga o construye al primer acceso)"""
+        if self._outcome_table is None:
+            self._outcome_table = OutcomeTable.load_or_build()
+        return self._outcome_table
     
     def predict(self, 
                 prematch_pred: Dict, 
@@ -53,25 +95,118 @@ class InPlayPredictor:
             prob_home_base, prob_draw_base, prob_away_base
         )
         
-        # 3. Ajustar lambda según marcador actual y minuto
-        lambda_home_adj, lambda_away_adj = self._adjust_lambdas_inplay(
+        return self.predict_from_lambdas(
             lambda_home, lambda_away,
+            current_minute, home_score, away_score,
+            prematch_pred.get('confidence', 0.5)
+        )
+    
+    def predict_from_lambdas(self,
+                             lambda_home: float,
+                             lambda_away: float,
+                             current_minute: int,
+                             home_score: int = 0,
+                             away_score: int = 0,
+                             base_confidence: float = 0.5,
+                             red_cards: Tuple[int, int] = (0, 0)) -> Dict:
+        """
+        Predicción in-play a partir de lambdas pre-match ya estimados
+        
+        Permite reutilizar los lambdas entre llamadas cuando la predicción
+        pre-match no cambia (ver `InPlayMatchState`).
+        
+        Args:
+            red_cards: Rojas (local, visitante); cada una multiplica la
+                intensidad propia por RED_CARD_OWN_FACTOR y la del rival
+                por RED_CARD_OPPONENT_FACTOR
+        
+        Returns:
+            Mismo formato que `predict`
+        """
+        # 3. Ajustar lambda según expulsiones, marcador actual y minuto
+        lambda_home_red, lambda_away_red = self._apply_red_cards(lambda_home, lambda_away, red_cards)
+        lambda_home_adj, lambda_away_adj = self._adjust_lambdas_inplay(
+            lambda_home_red, lambda_away_red,
             home_score, away_score,
             current_minute
         )
         
         # 4. Calcular nuevas probabilidades con Poisson
-        prob_home, prob_draw, prob_away = self._calculate_match_odds_poisson(
+        prob_home, prob_draw, prob_away, prob_matrix = self._calculate_match_odds_poisson(
             lambda_home_adj, lambda_away_adj,
             home_score, away_score,
             current_minute
         )
         
+        grid = None
+        if prob_matrix is not None:
+            grid = (prob_matrix.shape[-1], float(1.0 - prob_matrix.sum()))
+        
+        return self._inplay_result(
+            lambda_home, lambda_away, lambda_home_adj, lambda_away_adj,
+            prob_home, prob_draw, prob_away,
+            current_minute, home_score, away_score, base_confidence, red_cards, grid
+        )
+    
+    def predict_minute(self,
+                       lambda_home: float,
+                       lambda_away: float,
+                       current_minute: int,
+                       home_score: int,
+                       away_score: int,
+                       base_confidence: float,
+                       red_cards: Tuple[int, int],
+                       grid_size: int) -> Dict:
+        """
+        Predicción tras un poll en el que solo avanzó el minuto
+        
+        Reutiliza el tamaño de matriz de la última reconstrucción en lugar
+        de recalcularlo: los lambdas restantes solo bajan al avanzar el
+        minuto, así que la cola truncada sigue por debajo de la tolerancia.
+        El 1X2 sale de la distribución de la diferencia de goles
+        (`match_odds_convolved`) sin construir la matriz. En modo 'table'
+        equivale a `predict_from_lambdas`.
+        
+        Args:
+            grid_size: Tamaño de matriz de la última reconstrucción
+                (adjustments['grid_size']), calculado en un minuto anterior
+        
+        Returns:
+            Mismo formato que `predict`
+        """
+        if self.mode == 'table':
+            return self.predict_from_lambdas(lambda_home, lambda_away, current_minute,
+                                             home_score, away_score, base_confidence, red_cards)
+        
+        lambda_home_red, lambda_away_red = self._apply_red_cards(lambda_home, lambda_away, red_cards)
+        lambda_home_adj, lambda_away_adj = self._adjust_lambdas_inplay(
+            lambda_home_red, lambda_away_red, home_score, away_score, current_minute
+        )
+        
+        time_remaining = max(0, 90 - current_minute)
+        prob_home, prob_draw, prob_away, kept_mass = match_odds_convolved(
+            lambda_home_adj * (time_remaining / 90.0),
+            lambda_away_adj * (time_remaining / 90.0),
+            home_score - away_score, grid_size
+        )
+        
+        return self._inplay_result(
+            lambda_home, lambda_away, lambda_home_adj, lambda_away_adj,
+            prob_home, prob_draw, prob_away,
+            current_minute, home_score, away_score, base_confidence, red_cards,
+            (grid_size, 1.0 - kept_mass)
+        )
+    
+    def _inplay_result(self, lambda_home, lambda_away, lambda_home_adj, lambda_away_adj,
+                       prob_home, prob_draw, prob_away,
+                       current_minute, home_score, away_score, base_confidence, red_cards,
+                       grid: Optional[Tuple[int, float]]) -> Dict:
+        """Dict de predicción (formato de `predict`); grid = (tamaño, masa truncada) o None"""
         # 5. Calcular confianza
         confidence = self._calculate_confidence(
             current_minute, 
             home_score + away_score,
-            prematch_pred.get('confidence', 0.5)
+            base_confidence
         )
         
         # 6. Determinar color de señal (semáforo)
@@ -84,9 +219,16 @@ class InPlayPredictor:
             'lambda_home_adj': round(lambda_home_adj, 3),
             'lambda_away_adj': round(lambda_away_adj, 3),
             'score_diff': home_score - away_score,
-            'time_weight': self._get_time_weight(current_minute)
+            'time_weight': self._get_time_weight(current_minute),
+            'mode': self.mode
         }
         
+        if any(red_cards):
+            adjustments['red_cards'] = tuple(red_cards)
+        
+        if grid is not None:
+            adjustments['grid_size'], adjustments['truncated_mass'] = grid
+        
         return {
             'prob_home': round(prob_home, 3),
             'prob_draw': round(prob_draw, 3),
@@ -99,31 +241,297 @@ class InPlayPredictor:
             'timestamp': datetime.now().isoformat()
         }
     
+    def predict_batch(self,
+                      prematch_probs,
+                      current_minutes=None,
+                      home_scores=None,
+                      away_scores=None,
+                      base_confidences=None) -> Dict[str, np.ndarray]:
+        """
+        Genera predicciones in-play para muchos partidos a la vez
+
+        Equivalente a llamar `predict` por cada partido, pero cada etapa
+        (lambdas, ajustes, matriz de Poisson, confianza) se calcula con
+        broadcasting de NumPy sobre todos los partidos.
+
+        Args:
+            prematch_probs: Array (n, 3) con prob_home, prob_draw, prob_away,
+                o DataFrame con columnas prob_home, prob_draw, prob_away y
+                opcionalmente current_minute, home_score, away_score, confidence
+            current_minutes: Minuto actual de cada partido (array o escalar)
+            home_scores: Goles del local (array o escalar, default: 0)
+            away_scores: Goles del visitante (array o escalar, default: 0)
+            base_confidences: Confianza pre-match (array o escalar, default: 0.5)
+
+        Returns:
+            Dict columnar con un array de longitud n por campo:
+            {
+                'prob_home': array([...]),
+                'prob_draw': array([...]),
+                'prob_away': array([...]),
+                'confidence': array([...]),
+                'signal_color': array(['green', ...]),
+                ...
+            }
+        """
+        # 1. Normalizar entradas (arrays o DataFrame)
+        probs, minutes, home, away, base_conf = self._batch_inputs(
+            prematch_probs, current_minutes, home_scores, away_scores, base_confidences
+        )
+
+        # 2. Lambdas base desde probabilidades pre-match
+        lambda_home, lambda_away = self._estimate_lambdas_batch(
+            probs[:, 0], probs[:, 1], probs[:, 2]
+        )
+
+        return self._predict_batch_from_lambdas(
+            lambda_home, lambda_away, minutes, home, away, base_conf
+        )
+
+    def _batch_inputs(self, prematch_probs, current_minutes, home_scores,
+                      away_scores, base_confidences):
+        """
+        Convertir las entradas de `predict_batch` (arrays, escalares o
+        DataFrame) en arrays de longitud n
+        """
+        if hasattr(prematch_probs, 'columns'):
+            frame = prematch_probs
+            probs = frame[['prob_home', 'prob_draw', 'prob_away']].to_numpy(dtype=float)
+
+            def column(value, name, default):
+                if value is not None:
+                    return value
+                return frame[name].to_numpy() if name in frame.columns else default
+
+            current_minutes = column(current_minutes, 'current_minute', 0)
+            home_scores = column(home_scores, 'home_score', 0)
+            away_scores = column(away_scores, 'away_score', 0)
+            base_confidences = column(base_confidences, 'confidence', 0.5)
+        else:
+            probs = np.asarray(prematch_probs, dtype=float).reshape(-1, 3)
+
+        n = probs.shape[0]
+        minutes = np.broadcast_to(np.asarray(
+            0 if current_minutes is None else current_minutes, dtype=float), n)
+        home = np.broadcast_to(np.asarray(
+            0 if home_scores is None else home_scores, dtype=int), n)
+        away = np.broadcast_to(np.asarray(
+            0 if away_scores is None else away_scores, dtype=int), n)
+        base_conf = np.broadcast_to(np.asarray(
+            0.5 if base_confidences is None else base_confidences, dtype=float), n)
+
+        return probs, minutes, home, away, base_conf
+
+    def _predict_batch_from_lambdas(self, lambda_home, lambda_away,
+                                    minutes, home, away, base_conf):
+        """Etapas 3-5 de `predict_batch` a partir de lambdas pre-match"""
+        # 3. Ajuste por marcador y minuto
+        lambda_home_adj, lambda_away_adj = self._adjust_lambdas_batch(
+            lambda_home, lambda_away, home, away, minutes
+        )
+
+        # 4. Probabilidades 1X2 con Poisson
+        prob_home, prob_draw, prob_away, grid_info = self._calculate_match_odds_batch(
+            lambda_home_adj, lambda_away_adj, home, away, minutes
+        )
+
+        # 5. Confianza y semáforo
+        confidence = self._calculate_confidence_batch(minutes, home + away, base_conf)
+        signal_color = self._get_signal_color_batch(confidence, prob_home, prob_draw, prob_away)
+
+        result = {
+            'prob_home': np.round(prob_home, 3),
+            'prob_draw': np.round(prob_draw, 3),
+            'prob_away': np.round(prob_away, 3),
+            'confidence': np.round(confidence, 3),
+            'signal_color': signal_color,
+            'current_minute': minutes,
+            'home_score': home,
+            'away_score': away,
+            'lambda_home_base': np.round(lambda_home, 3),
+            'lambda_away_base': np.round(lambda_away, 3),
+            'lambda_home_adj': np.round(lambda_home_adj, 3),
+            'lambda_away_adj': np.round(lambda_away_adj, 3),
+            'score_diff': home - away,
+            'time_weight': self._get_time_weight_batch(minutes)
+        }
+        result.update(grid_info)
+
+        return result
+
+    def trajectory(self,
+                   prematch_pred: Dict,
+                   score_timeline: Optional[List[Tuple[int, int, int]]] = None,
+                   stoppage_time: int = 0) -> Dict[str, np.ndarray]:
+        """
+        Curva de probabilidades 1X2 minuto a minuto de un partido
+
+        Calcula todos los minutos (0 a 90 + descuento) en una sola pasada
+        vectorizada; los lambdas pre-match se estiman una única vez.
+
+        Args:
+            prematch_pred: Predicción pre-match con prob_home, prob_draw, prob_away
+            score_timeline: Cambios de marcador como tuplas
+                (minuto, goles_local, goles_visitante), p. ej.
+                [(23, 1, 0), (67, 1, 1)]; desde ese minuto rige el marcador
+            stoppage_time: Minutos de descuento a añadir tras el 90
+
+        Returns:
+            Dict con arrays 'minute', 'prob_home', 'prob_draw', 'prob_away',
+            'home_score', 'away_score' (uno por minuto) y el resto de
+            columnas de `predict_batch`
+        """
+        minutes = np.arange(0, 91 + stoppage_time)
+
+        # Marcador vigente en cada minuto
+        timeline = sorted(score_timeline or [])
+        change_minutes = np.array([0] + [event[0] for event in timeline])
+        home_by_change = np.array([0] + [event[1] for event in timeline])
+        away_by_change = np.array([0] + [event[2] for event in timeline])
+        current = np.searchsorted(change_minutes, minutes, side='right') - 1
+
+        lambda_home, lambda_away = self._estimate_lambdas_from_probs(
+            prematch_pred.get('prob_home', 0.33),
+            prematch_pred.get('prob_draw', 0.33),
+            prematch_pred.get('prob_away', 0.33)
+        )
+
+        result = self._predict_batch_from_lambdas(
+            np.full(len(minutes), lambda_home), np.full(len(minutes), lambda_away),
+            minutes.astype(float), home_by_change[current], away_by_change[current],
+            np.full(len(minutes), prematch_pred.get('confidence', 0.5))
+        )
+        result['minute'] = minutes
+
+        return result
+
+    def predict_markets(self,
+                        prematch_pred: Dict,
+                        current_minute: int,
+                        home_score: int = 0,
+                        away_score: int = 0,
+                        lines=DEFAULT_GOAL_LINES,
+                        top_n: int = 5) -> Dict:
+        """
+        Probabilidades de todos los mercados desde una única matriz
+
+        Args:
+            prematch_pred: Predicción pre-match con prob_home, prob_draw, prob_away
+            current_minute: Minuto actual del partido
+            home_score: Goles del equipo local
+            away_score: Goles del equipo visitante
+            lines: Líneas de goles (x.5) para over/under
+            top_n: Número de marcadores exactos a devolver
+
+        Returns:
+            Dict con probabilidades por mercado:
+            {
+                'prob_home': 0.52, 'prob_draw': 0.27, 'prob_away': 0.21,
+                'prob_over_2_5': 0.48, 'prob_under_2_5': 0.52, ...
+                'prob_btts': 0.45,
+                'prob_next_goal_home': 0.55, 'prob_next_goal_away': 0.38,
+                'prob_no_more_goals': 0.07,
+                'correct_score': [{'score': '1-1', 'prob': 0.12}, ...]
+            }
+        """
+        markets = self.predict_markets_batch(
+            [[prematch_pred.get('prob_home', 0.33),
+              prematch_pred.get('prob_draw', 0.33),
+              prematch_pred.get('prob_away', 0.33)]],
+            current_minute, home_score, away_score,
+            lines=lines, top_n=top_n
+        )
+
+        result = {
+            key: round(float(value[0]), 3)
+            for key, value in markets.items()
+            if key.startswith('prob_')
+        }
+        result['correct_score'] = [
+            {'score': f"{home}-{away}", 'prob': round(float(prob), 3)}
+            for home, away, prob in zip(markets['correct_score_home'][0],
+                                        markets['correct_score_away'][0],
+                                        markets['correct_score_prob'][0])
+        ]
+        result['current_minute'] = current_minute
+        result['current_score'] = f"{home_score}-{away_score}"
+
+        return result
+
+    def predict_markets_batch(self,
+                              prematch_probs,
+                              current_minutes=None,
+                              home_scores=None,
+                              away_scores=None,
+                              lines=DEFAULT_GOAL_LINES,
+                              top_n: int = 5) -> Dict[str, np.ndarray]:
+        """
+        Versión por lotes de `predict_markets`
+
+        Las matrices se agrupan por tamaño como en `predict_batch`; cada
+        grupo calcula todos los mercados con una sola matriz. Siempre usa
+        el motor exacto (la tabla precalculada solo cubre 1X2).
+
+        Returns:
+            Dict columnar (ver `score_matrix.market_probabilities`)
+        """
+        probs, minutes, home, away, _ = self._batch_inputs(
+            prematch_probs, current_minutes, home_scores, away_scores, None
+        )
+
+        lambda_home, lambda_away = self._estimate_lambdas_batch(
+            probs[:, 0], probs[:, 1], probs[:, 2]
+        )
+        lambda_home_adj, lambda_away_adj = self._adjust_lambdas_batch(
+            lambda_home, lambda_away, home, away, minutes
+        )
+
+        time_fraction = np.maximum(0, 90 - minutes) / 90.0
+        lambda_home_remaining = lambda_home_adj * time_fraction
+        lambda_away_remaining = lambda_away_adj * time_fraction
+
+        # Matriz mínima para poder listar top_n marcadores exactos
+        grid_size = np.maximum(
+            self._grid_sizes(lambda_home_remaining, lambda_away_remaining),
+            int(np.ceil(np.sqrt(top_n)))
+        )
+
+        markets = {}
+        for _, idx, prob_matrix in self._grouped_score_matrices(
+                lambda_home_remaining, lambda_away_remaining, grid_size):
+            group = market_probabilities(
+                prob_matrix, home[idx], away[idx],
+                lambda_home_remaining[idx], lambda_away_remaining[idx],
+                lines=lines, top_n=top_n
+            )
+            for key, value in group.items():
+                if key not in markets:
+                    markets[key] = np.empty((len(minutes),) + value.shape[1:], dtype=value.dtype)
+                markets[key][idx] = value
+
+        return markets
+
     def _estimate_lambdas_from_probs(self, prob_home, prob_draw, prob_away):
         """
         Estimar lambda (goles esperados) desde probabilidades 1X2
-        Usa aproximación inversa simple
-        """
-        # Aproximación:
-        # - Si prob_home alta → lambda_home alto, lambda_away bajo
-        # - Si prob_away alta → lambda_away alto, lambda_home bajo
-        # - Si prob_draw alta → lambdas similares
-        
-        # Media de goles por equipo en fútbol: ~1.3-1.5
-        base_lambda = 1.4
-        
-        # Factor de ajuste basado en probabilidades
-        home_factor = (prob_home - prob_away) + 1.0  # 0.5 a 1.5
-        away_factor = (prob_away - prob_home) + 1.0
         
-        lambda_home = base_lambda * home_factor
-        lambda_away = base_lambda * away_factor
-        
-        # Limitar rango razonable
-        lambda_home = max(0.5, min(3.5, lambda_home))
-        lambda_away = max(0.5, min(3.5, lambda_away))
+        Resuelve los lambdas cuyo modelo de Poisson reproduce el 1X2
+        pre-match (incluido el empate), ver `LambdaSolver`
+        """
+        return self.lambda_solver.solve(prob_home, prob_draw, prob_away)
+    
+    def _apply_red_cards(self, lambda_home, lambda_away, red_cards):
+        """
+        Ajustar lambdas por expulsiones (mismo modelo que `InPlaySimulator`)
+        """
+        reds_home, reds_away = red_cards
+        if not reds_home and not reds_away:
+            return lambda_home, lambda_away
         
-        return lambda_home, lambda_away
+        return (
+            lambda_home * self.RED_CARD_OWN_FACTOR ** reds_home * self.RED_CARD_OPPONENT_FACTOR ** reds_away,
+            lambda_away * self.RED_CARD_OWN_FACTOR ** reds_away * self.RED_CARD_OPPONENT_FACTOR ** reds_home
+        )
     
     def _adjust_lambdas_inplay(self, lambda_home, lambda_away, 
                                 home_score, away_score, minute):
@@ -168,41 +576,36 @@ class InPlayPredictor:
         lambda_home_remaining = lambda_home * (time_remaining / 90.0)
         lambda_away_remaining = lambda_away * (time_remaining / 90.0)
         
-        # Calcular matriz de probabilidades para goles adicionales
-        prob_matrix = np.zeros((self.max_goals, self.max_goals))
-        
-        for i in range(self.max_goals):
-            for j in range(self.max_goals):
-                prob_matrix[i, j] = (
-                    poisson.pmf(i, lambda_home_remaining) *
-                    poisson.pmf(j, lambda_away_remaining)
-                )
-        
-        # Sumar marcador actual a los goles adicionales
-        prob_home_win = 0
-        prob_draw = 0
-        prob_away_win = 0
-        
-        for i in range(self.max_goals):
-            for j in range(self.max_goals):
-                final_home = home_score + i
-                final_away = away_score + j
-                
-                if final_home > final_away:
-                    prob_home_win += prob_matrix[i, j]
-                elif final_home == final_away:
-                    prob_draw += prob_matrix[i, j]
-                else:
-                    prob_away_win += prob_matrix[i, j]
+        if self.mode == 'table':
+            prob_home_win, prob_draw, prob_away_win = self.outcome_table.lookup(
+                lambda_home_remaining, lambda_away_remaining, home_score - away_score
+            )
+            return float(prob_home_win), float(prob_draw), float(prob_away_win), None
         
-        # Normalizar
-        total = prob_home_win + prob_draw + prob_away_win
-        if total > 0:
-            prob_home_win /= total
-            prob_draw /= total
-            prob_away_win /= total
+        # Matriz de goles adicionales y reducción 1X2 por diagonales
+        grid_size = int(self._grid_sizes(lambda_home_remaining, lambda_away_remaining))
+        prob_home_win, prob_draw, prob_away_win, prob_matrix = match_odds(
+            lambda_home_remaining, lambda_away_remaining,
+            home_score - away_score, grid_size
+        )
         
-        return prob_home_win, prob_draw, prob_away_win
+        return float(prob_home_win), float(prob_draw), float(prob_away_win), prob_matrix
+    
+    def _grid_sizes(self, lambda_home_remaining, lambda_away_remaining):
+        """
+        Tamaño de matriz por partido según la tolerancia de cola
+
+        La masa truncada de la matriz conjunta es como máximo la suma de
+        las colas de ambos equipos, así que cada uno recibe la mitad.
+        """
+        if self.tail_tolerance is None:
+            return np.full(np.shape(lambda_home_remaining), self.max_goals)
+        
+        tolerance = self.tail_tolerance / 2.0
+        return np.maximum(
+            grid_size_for_tolerance(lambda_home_remaining, tolerance, self.max_goals),
+            grid_size_for_tolerance(lambda_away_remaining, tolerance, self.max_goals)
+        )
     
     def _get_time_weight(self, minute):
         """
@@ -256,6 +659,113 @@ class InPlayPredictor:
         else:
             return 'red'
 
+    # ==========================================
+    # Versiones vectorizadas (predict_batch)
+    # ==========================================
+
+    def _estimate_lambdas_batch(self, prob_home, prob_draw, prob_away):
+        """Versión vectorizada de `_estimate_lambdas_from_probs`"""
+        return self.lambda_solver.solve_batch(prob_home, prob_draw, prob_away)
+
+    def _adjust_lambdas_batch(self, lambda_home, lambda_away,
+                              home_score, away_score, minute):
+        """Versión vectorizada de `_adjust_lambdas_inplay`"""
+        time_fraction = np.maximum(0, 90 - minute) / 90.0
+        score_diff = home_score - away_score
+
+        defend = 0.95 + 0.05 * time_fraction
+        attack = 1.05 + 0.15 * (1 - time_fraction)
+
+        home_factor = np.where(score_diff > 0, defend, np.where(score_diff < 0, attack, 1.0))
+        away_factor = np.where(score_diff > 0, attack, np.where(score_diff < 0, defend, 1.0))
+
+        return lambda_home * home_factor, lambda_away * away_factor
+
+    def _calculate_match_odds_batch(self, lambda_home, lambda_away,
+                                    home_score, away_score, minute):
+        """Versión vectorizada de `_calculate_match_odds_poisson`"""
+        time_fraction = np.maximum(0, 90 - minute) / 90.0
+        lambda_home_remaining = lambda_home * time_fraction
+        lambda_away_remaining = lambda_away * time_fraction
+
+        if self.mode == 'table':
+            prob_home_win, prob_draw, prob_away_win = self.outcome_table.lookup(
+                lambda_home_remaining, lambda_away_remaining, home_score - away_score
+            )
+            return prob_home_win, prob_draw, prob_away_win, {}
+
+        n = len(lambda_home_remaining)
+        prob_home_win, prob_draw, prob_away_win, truncated_mass = (np.empty(n) for _ in range(4))
+        grid_size = self._grid_sizes(lambda_home_remaining, lambda_away_remaining)
+
+        # Un cálculo vectorizado por cada tamaño de matriz distinto
+        for _, idx, prob_matrix in self._grouped_score_matrices(
+                lambda_home_remaining, lambda_away_remaining, grid_size):
+            prob_home_win[idx], prob_draw[idx], prob_away_win[idx] = outcome_probabilities(
+                prob_matrix, (home_score - away_score)[idx]
+            )
+            truncated_mass[idx] = 1.0 - prob_matrix.sum(axis=(1, 2))
+
+        # Normalizar
+        total = prob_home_win + prob_draw + prob_away_win
+        total = np.where(total > 0, total, 1.0)
+
+        grid_info = {'grid_size': grid_size, 'truncated_mass': truncated_mass}
+
+        return prob_home_win / total, prob_draw / total, prob_away_win / total, grid_info
+
+    def _grouped_score_matrices(self, lambda_home_remaining, lambda_away_remaining, grid_size):
+        """
+        Agrupar partidos por tamaño de matriz
+
+        Yields:
+            Tuplas (tamaño, índices, matrices con forma (k, tamaño, tamaño))
+        """
+        for size in np.unique(grid_size):
+            idx = np.flatnonzero(grid_size == size)
+            yield int(size), idx, score_matrix(
+                lambda_home_remaining[idx], lambda_away_remaining[idx], int(size)
+            )
+
+    def _get_time_weight_batch(self, minute):
+        """Versión vectorizada de `_get_time_weight`"""
+        return np.clip(minute / 90.0, 0.0, 1.0) ** 1.5
+
+    def _calculate_confidence_batch(self, minute, total_goals, base_confidence):
+        """Versión vectorizada de `_calculate_confidence`"""
+        time_factor = (minute / 90.0) * 0.4
+        goals_factor = np.minimum(total_goals / 5.0, 1.0) * 0.3
+        base_factor = (base_confidence - 0.3) / 0.65 * 0.3
+
+        return np.clip(time_factor + goals_factor + base_factor, 0.3, 0.95)
+
+    def _get_signal_color_batch(self, confidence, prob_home, prob_draw, prob_away):
+        """Versión vectorizada de `_get_signal_color`"""
+        max_prob = np.maximum(np.maximum(prob_home, prob_draw), prob_away)
+        result_clarity = max_prob - (1.0 / 3.0)
+
+        return np.select(
+            [(confidence >= 0.75) & (result_clarity >= 0.3),
+             (confidence >= 0.55) & (result_clarity >= 0.15)],
+            ['green', 'yellow'],
+            default='red'
+        )
+
+
+# Instancia global (se crea en el primer acceso, no al importar el módulo)
+_predictor: Optional[InPlayPredictor] = None
+
+
+def get_predictor() -> InPlayPredictor:
+    """Instancia compartida de InPlayPredictor"""
+    global _predictor
+    if _predictor is None:
+        _predictor = InPlayPredictor()
+    return _predictor
+
 
-# Instancia global
-predictor = InPlayPredictor()
+def __getattr__(name):
+    # Compatibilidad con `from src.models.inplay_predictor import predictor`
+    if name == 'predictor':
+        return get_predictor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,171 @@
+"""Estado in-play incremental por partido (recalcula solo lo que cambió)"""
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.models.inplay_predictor import InPlayPredictor
+
+
+class InPlayMatchState:
+    """
+    Estado cacheado de un partido entre dos polls
+
+    Guarda los lambdas derivados de la predicción pre-match, el tamaño de
+    matriz de la última reconstrucción y la última predicción. En cada
+    `update`:
+
+    - Nada cambió → devuelve la predicción cacheada
+    - Solo avanzó el minuto → reutiliza lambdas, marcador, rojas y tamaño
+      de matriz y solo reescala el tiempo restante
+      (`InPlayPredictor.predict_minute`)
+    - Gol o tarjeta roja → reconstrucción completa del estado in-play
+      (ajuste por expulsiones y marcador, tamaño de matriz)
+    - Cambió la predicción pre-match → se vuelven a estimar los lambdas
+    """
+
+    def __init__(self, match_id: str, predictor: InPlayPredictor):
+        self.match_id = match_id
+        self.predictor = predictor
+
+        self.prematch_key: Optional[Tuple] = None
+        self.lambda_home: Optional[float] = None
+        self.lambda_away: Optional[float] = None
+        self.base_confidence = 0.5
+
+        self.minute: Optional[int] = None
+        self.score: Optional[Tuple[int, int]] = None
+        self.red_cards: Tuple[int, int] = (0, 0)
+
+        # Tamaño de matriz y minuto de la última reconstrucción
+        self.grid_size: Optional[int] = None
+        self.grid_minute: Optional[int] = None
+        self.prediction: Optional[Dict] = None
+        self.last_update: Optional[str] = None
+
+    def update(self,
+               prematch_pred: Dict,
+               current_minute: int,
+               home_score: int = 0,
+               away_score: int = 0,
+               red_cards: Tuple[int, int] = (0, 0)) -> Dict:
+        """
+        Actualizar el estado con el último poll
+
+        Args:
+            prematch_pred: Predicción pre-match con prob_home, prob_draw, prob_away
+            current_minute: Minuto actual del partido
+            home_score: Goles del local
+            away_score: Goles del visitante
+            red_cards: Tarjetas rojas (local, visitante)
+
+        Returns:
+            Predicción in-play (mismo formato que `InPlayPredictor.predict`)
+        """
+        prematch_key = (
+            prematch_pred.get('prob_home', 0.33),
+            prematch_pred.get('prob_draw', 0.33),
+            prematch_pred.get('prob_away', 0.33),
+            prematch_pred.get('confidence', 0.5)
+        )
+        score = (home_score, away_score)
+        red_cards = tuple(red_cards)
+
+        if prematch_key != self.prematch_key:
+            self.last_update = 'prematch'
+            self.prematch_key = prematch_key
+            self.lambda_home, self.lambda_away = self.predictor._estimate_lambdas_from_probs(
+                *prematch_key[:3]
+            )
+            self.base_confidence = prematch_key[3]
+        elif score != self.score or red_cards != self.red_cards:
+            self.last_update = 'event'
+        elif current_minute != self.minute:
+            self.last_update = 'minute'
+        else:
+            self.last_update = 'cached'
+            return self.prediction
+
+        self.minute = current_minute
+        self.score = score
+        self.red_cards = red_cards
+
+        # El tamaño de matriz guardado solo vale para minutos posteriores
+        # (el tiempo restante solo baja); si el minuto retrocede se reconstruye
+        if (self.last_update == 'minute' and self.grid_size is not None
+                and current_minute >= self.grid_minute):
+            self.prediction = self.predictor.predict_minute(
+                self.lambda_home, self.lambda_away,
+                current_minute, home_score, away_score,
+                self.base_confidence, red_cards, self.grid_size
+            )
+            return self.prediction
+
+        self.prediction = self.predictor.predict_from_lambdas(
+            self.lambda_home, self.lambda_away,
+            current_minute, home_score, away_score,
+            self.base_confidence, red_cards
+        )
+        self.grid_size = self.prediction['adjustments'].get('grid_size')
+        self.grid_minute = current_minute
+
+        return self.prediction
+
+
+class InPlayStateStore:
+    """Colección de `InPlayMatchState` indexada por match_id"""
+
+    def __init__(self, predictor: Optional[InPlayPredictor] = None):
+        self.predictor = predictor or InPlayPredictor()
+        self.states: Dict[str, InPlayMatchState] = {}
+
+    def update(self, match_id: str, prematch_pred: Dict, current_minute: int,
+               home_score: int = 0, away_score: int = 0,
+               red_cards: Tuple[int, int] = (0, 0)) -> Dict:
+        """Actualizar (o crear) el estado de un partido y devolver su predicción"""
+        state = self.states.get(match_id)
+        if state is None:
+            state = self.states[match_id] = InPlayMatchState(match_id, self.predictor)
+
+        return state.update(prematch_pred, current_minute, home_score, away_score, red_cards)
+
+    def update_matches(self, matches: Iterable[Dict]) -> Dict[str, Dict]:
+        """
+        Actualizar todos los partidos de un refresh
+
+        Args:
+            matches: Partidos de Football API 7 con 'prediction' (ver
+                `enrich_matches_with_predictions`); los que no tienen
+                predicción se ignoran
+
+        Returns:
+            Dict match_id → predicción in-play
+        """
+        predictions = {}
+
+        for match in matches:
+            prediction = match.get('prediction')
+            if not prediction or not prediction.get('probabilities'):
+                continue
+
+            probs = prediction['probabilities']
+            predictions[match['match_id']] = self.update(
+                match['match_id'],
+                {'prob_home': probs['home'], 'prob_draw': probs['draw'], 'prob_away': probs['away']},
+                match['status']['game_time'],
+                match['home_team']['score'],
+                match['away_team']['score'],
+                (match['home_team']['red_cards'], match['away_team']['red_cards'])
+            )
+
+        return predictions
+
+    def prune(self, active_ids: Iterable[str]):
+        """Eliminar estados de partidos que ya no están activos"""
+        active = set(active_ids)
+        for match_id in [m for m in self.states if m not in active]:
+            del self.states[match_id]
+
+    def update_counts(self) -> Dict[str, int]:
+        """Cuántos estados se actualizaron por cada motivo en el último poll"""
+        counts: Dict[str, int] = {}
+        for state in self.states.values():
+            counts[state.last_update] = counts.get(state.last_update, 0) + 1
+        return counts
@@ -0,0 +1,161 @@
+"""Inversión de probabilidades 1X2 a lambdas (goles esperados) bajo Poisson"""
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+
+from src.models.score_matrix import match_odds
+
+LAMBDA_MIN = 0.1
+LAMBDA_MAX = 5.0
+FORWARD_GOALS = 25
+
+
+def forward_probs(lambda_home, lambda_away) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Probabilidades (home, away) de partido completo para unos lambdas
+
+    Args:
+        lambda_home: Lambda del local (escalar o array)
+        lambda_away: Lambda del visitante (escalar o array)
+
+    Returns:
+        Tupla (prob_home, prob_away); prob_draw = 1 - ambas
+    """
+    prob_home, _, prob_away, _ = match_odds(lambda_home, lambda_away, 0, FORWARD_GOALS)
+    return prob_home, prob_away
+
+
+@lru_cache(maxsize=None)
+def _inverse_grid(prob_step: float, lambda_step: float) -> np.ndarray:
+    """
+    Malla inversa: para cada celda (prob_home, prob_away) de paso prob_step,
+    los lambdas cuyo 1X2 (en una malla de paso lambda_step) queda más cerca
+
+    Returns:
+        Array (n, n, 2) con (lambda_home, lambda_away) por celda
+    """
+    lambdas = np.arange(LAMBDA_MIN, LAMBDA_MAX + lambda_step / 2, lambda_step)
+    grid_home, grid_away = np.meshgrid(lambdas, lambdas, indexing='ij')
+    prob_home, prob_away = forward_probs(grid_home.ravel(), grid_away.ravel())
+    forward = np.stack([prob_home, prob_away], axis=-1)
+
+    cells = np.arange(0.0, 1.0 + prob_step / 2, prob_step)
+    targets = np.stack(np.meshgrid(cells, cells, indexing='ij'), axis=-1).reshape(-1, 2)
+
+    # Vecino más cercano por bloques para acotar memoria
+    nearest = np.empty(len(targets), dtype=int)
+    for start in range(0, len(targets), 512):
+        block = targets[start:start + 512]
+        distances = ((block[:, None, :] - forward[None, :, :]) ** 2).sum(axis=-1)
+        nearest[start:start + 512] = distances.argmin(axis=1)
+
+    solution = np.stack([grid_home.ravel(), grid_away.ravel()], axis=-1)[nearest]
+    return solution.reshape(len(cells), len(cells), 2)
+
+
+class LambdaSolver:
+    """
+    Encuentra (lambda_home, lambda_away) que reproducen un 1X2 dado
+
+    Punto de partida desde una malla inversa precalculada y unas pocas
+    iteraciones de Newton vectorizadas. Los resultados se memorizan por
+    probabilidades redondeadas, ya que las cuotas de PrimaTips se repiten
+    entre refrescos.
+    """
+
+    def __init__(self,
+                 prob_step: float = 0.02,
+                 lambda_step: float = 0.1,
+                 newton_iterations: int = 4,
+                 memo_decimals: int = 3):
+        """
+        Args:
+            prob_step: Paso de la malla inversa en probabilidades
+            lambda_step: Paso de la malla de lambdas usada para construirla
+            newton_iterations: Iteraciones de refinamiento
+            memo_decimals: Decimales de redondeo para la memoización
+        """
+        self.prob_step = prob_step
+        self.lambda_step = lambda_step
+        self.newton_iterations = newton_iterations
+        self.memo_decimals = memo_decimals
+        self._memo: Dict[Tuple[float, float, float], Tuple[float, float]] = {}
+
+    def solve(self, prob_home: float, prob_draw: float, prob_away: float) -> Tuple[float, float]:
+        """Lambdas para un único partido (memorizado)"""
+        key = self._key(prob_home, prob_draw, prob_away)
+        if key not in self._memo:
+            lambda_home, lambda_away = self._solve_arrays(np.array([key]))
+            self._memo[key] = (float(lambda_home[0]), float(lambda_away[0]))
+        return self._memo[key]
+
+    def solve_batch(self, prob_home, prob_draw, prob_away) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Lambdas para muchos partidos
+
+        Solo se resuelven las combinaciones (redondeadas) únicas que no
+        estén ya memorizadas.
+        """
+        probs = np.round(np.stack(np.broadcast_arrays(
+            np.asarray(prob_home, dtype=float),
+            np.asarray(prob_draw, dtype=float),
+            np.asarray(prob_away, dtype=float)
+        ), axis=-1).reshape(-1, 3), self.memo_decimals)
+
+        unique, inverse = np.unique(probs, axis=0, return_inverse=True)
+        keys = [tuple(row) for row in unique.tolist()]
+
+        missing = [i for i, key in enumerate(keys) if key not in self._memo]
+        if missing:
+            lambda_home, lambda_away = self._solve_arrays(unique[missing])
+            for i, lh, la in zip(missing, lambda_home.tolist(), lambda_away.tolist()):
+                self._memo[keys[i]] = (lh, la)
+
+        solved = np.array([self._memo[key] for key in keys]).reshape(-1, 2)
+        result = solved[inverse.ravel()]
+        shape = np.shape(prob_home) if np.ndim(prob_home) else ()
+        return result[:, 0].reshape(shape), result[:, 1].reshape(shape)
+
+    def _key(self, prob_home, prob_draw, prob_away) -> Tuple[float, float, float]:
+        return (round(float(prob_home), self.memo_decimals),
+                round(float(prob_draw), self.memo_decimals),
+                round(float(prob_away), self.memo_decimals))
+
+    def _solve_arrays(self, probs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Malla inversa + Newton sobre un array (n, 3) de probabilidades"""
+        total = probs.sum(axis=1)
+        total = np.where(total > 0, total, 1.0)
+        target_home = probs[:, 0] / total
+        target_away = probs[:, 2] / total
+
+        # 1. Punto de partida desde la malla inversa
+        grid = _inverse_grid(self.prob_step, self.lambda_step)
+        last = grid.shape[0] - 1
+        i = np.clip(np.rint(target_home / self.prob_step).astype(int), 0, last)
+        j = np.clip(np.rint(target_away / self.prob_step).astype(int), 0, last)
+        lambda_home = grid[i, j, 0].copy()
+        lambda_away = grid[i, j, 1].copy()
+
+        # 2. Newton con jacobiano por diferencias finitas
+        eps = 1e-5
+        for _ in range(self.newton_iterations):
+            prob_home, prob_away = forward_probs(lambda_home, lambda_away)
+            home_dh, away_dh = forward_probs(lambda_home + eps, lambda_away)
+            home_da, away_da = forward_probs(lambda_home, lambda_away + eps)
+
+            j11 = (home_dh - prob_home) / eps
+            j12 = (home_da - prob_home) / eps
+            j21 = (away_dh - prob_away) / eps
+            j22 = (away_da - prob_away) / eps
+            det = j11 * j22 - j12 * j21
+            det = np.where(np.abs(det) > 1e-12, det, 1e-12)
+
+            residual_home = prob_home - target_home
+            residual_away = prob_away - target_away
+            lambda_home = np.clip(lambda_home - (j22 * residual_home - j12 * residual_away) / det,
+                                  LAMBDA_MIN, LAMBDA_MAX)
+            lambda_away = np.clip(lambda_away - (j11 * residual_away - j21 * residual_home) / det,
+                                  LAMBDA_MIN, LAMBDA_MAX)
+
+        return lambda_home, lambda_away
@@ -0,0 +1,168 @@
+"""Tabla precalculada de probabilidades 1X2 indexada por lambdas restantes"""
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.models.score_matrix import match_odds, outcome_probabilities, score_matrix
+
+DEFAULT_TABLE_PATH = "data/models/outcome_table.npy"
+
+
+class OutcomeTable:
+    """
+    Probabilidades 1X2 precalculadas sobre una malla de lambdas
+
+    La tabla tiene forma (2·max_diff+1, n, n, 3): diferencia de goles
+    actual (acotada a ±max_diff), lambda restante del local, lambda
+    restante del visitante y (home, draw, away). Las consultas interpolan
+    bilinealmente entre los cuatro nodos vecinos de la malla.
+    """
+
+    def __init__(self,
+                 lambda_max: float = 6.0,
+                 lambda_step: float = 0.025,
+                 max_diff: int = 6,
+                 max_goals: int = 30):
+        """
+        Args:
+            lambda_max: Lambda restante máximo cubierto (se acota por encima)
+            lambda_step: Paso de la malla de lambdas
+            max_diff: Diferencia de goles máxima (se acota a ±max_diff)
+            max_goals: Tamaño de la matriz usada al construir la tabla
+        """
+        self.lambda_max = lambda_max
+        self.lambda_step = lambda_step
+        self.max_diff = max_diff
+        self.max_goals = max_goals
+        self.n_lambdas = int(round(lambda_max / lambda_step)) + 1
+        self.table: Optional[np.ndarray] = None
+
+    @property
+    def shape(self) -> Tuple[int, int, int, int]:
+        return (2 * self.max_diff + 1, self.n_lambdas, self.n_lambdas, 3)
+
+    def build(self) -> "OutcomeTable":
+        """Calcular la tabla completa con el motor exacto"""
+        lambdas = np.arange(self.n_lambdas) * self.lambda_step
+        diffs = np.arange(-self.max_diff, self.max_diff + 1)
+        table = np.empty(self.shape, dtype=np.float32)
+
+        # Una fila de lambda local por vez para acotar memoria
+        for i, lambda_home in enumerate(lambdas):
+            matrices = score_matrix(lambda_home, lambdas, self.max_goals)
+            total = matrices.sum(axis=(1, 2))
+            for d, diff in enumerate(diffs):
+                probs = outcome_probabilities(matrices, diff)
+                table[d, i] = np.stack(probs, axis=-1) / total[:, None]
+
+        self.table = table
+        return self
+
+    def save(self, path: str = DEFAULT_TABLE_PATH):
+        """Guardar tabla en formato .npy"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, self.table)
+
+    def load(self, path: str = DEFAULT_TABLE_PATH) -> bool:
+        """
+        Cargar tabla desde .npy
+
+        Returns:
+            True si se cargó una tabla compatible con los parámetros actuales
+        """
+        if not Path(path).exists():
+            return False
+
+        table = np.load(path)
+        if table.shape != self.shape:
+            return False
+
+        self.table = table
+        return True
+
+    @classmethod
+    def load_or_build(cls, path: Optional[str] = DEFAULT_TABLE_PATH, **kwargs) -> "OutcomeTable":
+        """
+        Cargar la tabla desde disco o construirla (y guardarla) si no existe
+
+        Args:
+            path: Ruta del .npy (None = no usar disco)
+            **kwargs: Parámetros de la malla (ver __init__)
+        """
+        outcome_table = cls(**kwargs)
+
+        if path is not None and outcome_table.load(path):
+            return outcome_table
+
+        outcome_table.build()
+        if path is not None:
+            outcome_table.save(path)
+
+        return outcome_table
+
+    def lookup(self, lambda_home, lambda_away, score_diff):
+        """
+        Probabilidades 1X2 interpoladas
+
+        Args:
+            lambda_home: Lambda restante del local (escalar o array)
+            lambda_away: Lambda restante del visitante (escalar o array)
+            score_diff: Diferencia actual local - visitante (escalar o array)
+
+        Returns:
+            Tupla (prob_home, prob_draw, prob_away)
+        """
+        if self.table is None:
+            self.build()
+
+        diff_index = np.clip(np.asarray(score_diff), -self.max_diff, self.max_diff) + self.max_diff
+
+        # Posición continua en la malla y pesos de interpolación
+        x = np.clip(np.asarray(lambda_home, dtype=float), 0.0, self.lambda_max) / self.lambda_step
+        y = np.clip(np.asarray(lambda_away, dtype=float), 0.0, self.lambda_max) / self.lambda_step
+        x0 = np.minimum(np.floor(x).astype(int), self.n_lambdas - 2)
+        y0 = np.minimum(np.floor(y).astype(int), self.n_lambdas - 2)
+        wx = (x - x0)[..., None]
+        wy = (y - y0)[..., None]
+
+        table = self.table
+        probs = ((1 - wx) * (1 - wy) * table[diff_index, x0, y0] +
+                 wx * (1 - wy) * table[diff_index, x0 + 1, y0] +
+                 (1 - wx) * wy * table[diff_index, x0, y0 + 1] +
+                 wx * wy * table[diff_index, x0 + 1, y0 + 1])
+
+        return probs[..., 0], probs[..., 1], probs[..., 2]
+
+    def accuracy_report(self, n_samples: int = 20000,
+                        lambda_max: Optional[float] = None,
+                        seed: int = 0) -> Dict:
+        """
+        Comparar la tabla contra el motor exacto en puntos aleatorios
+
+        Args:
+            n_samples: Número de combinaciones (lambda_home, lambda_away, diff)
+            lambda_max: Lambda máximo muestreado (default: el de la tabla)
+            seed: Semilla del generador
+
+        Returns:
+            Dict con errores absolutos (máximo, medio, p99) sobre 1X2
+        """
+        rng = np.random.default_rng(seed)
+        lambda_max = self.lambda_max if lambda_max is None else lambda_max
+
+        lambda_home = rng.uniform(0.0, lambda_max, n_samples)
+        lambda_away = rng.uniform(0.0, lambda_max, n_samples)
+        score_diff = rng.integers(-self.max_diff, self.max_diff + 1, n_samples)
+
+        exact = np.stack(match_odds(lambda_home, lambda_away, score_diff, self.max_goals)[:3], axis=-1)
+        approx = np.stack(self.lookup(lambda_home, lambda_away, score_diff), axis=-1)
+        error = np.abs(approx - exact).max(axis=-1)
+
+        return {
+            'n_samples': n_samples,
+            'max_abs_error': float(error.max()),
+            'mean_abs_error': float(error.mean()),
+            'p99_abs_error': float(np.percentile(error, 99)),
+            'table_mb': round(self.table.nbytes / 1e6, 1)
+        }
@@ -0,0 +1,291 @@
+"""Motor vectorizado de distribución de marcadores (Poisson independiente)"""
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+def poisson_pmf(lam, max_goals: int) -> np.ndarray:
+    """
+    PMF de Poisson para 0..max_goals-1 goles
+
+    Usa la recurrencia p(k) = p(k-1) * lambda / k, sin factoriales ni
+    llamadas a scipy. Acepta escalares o arrays de lambdas.
+
+    Args:
+        lam: Lambda (escalar o array con forma (...))
+        max_goals: Número de celdas del vector (goles 0..max_goals-1)
+
+    Returns:
+        Array con forma (..., max_goals)
+    """
+    lam = np.asarray(lam, dtype=float)
+    steps = lam[..., None] / np.arange(1, max_goals)
+    pmf = np.empty(lam.shape + (max_goals,))
+    pmf[..., 0] = np.exp(-lam)
+    pmf[..., 1:] = pmf[..., :1] * np.cumprod(steps, axis=-1)
+    return pmf
+
+
+def score_matrix(lambda_home, lambda_away, max_goals: int) -> np.ndarray:
+    """
+    Matriz conjunta de goles adicionales (local x visitante)
+
+    Args:
+        lambda_home: Lambda restante del local (escalar o array)
+        lambda_away: Lambda restante del visitante (escalar o array)
+        max_goals: Tamaño de la matriz
+
+    Returns:
+        Array con forma (..., max_goals, max_goals); celda [i, j] =
+        P(local marca i más, visitante marca j más)
+    """
+    return (poisson_pmf(lambda_home, max_goals)[..., :, None] *
+            poisson_pmf(lambda_away, max_goals)[..., None, :])
+
+
+def grid_size_for_tolerance(lam, tolerance: float, max_goals: int) -> np.ndarray:
+    """
+    Tamaño mínimo de matriz para que la cola truncada sea <= tolerance
+
+    Devuelve el menor G (1..max_goals) tal que P(X >= G) <= tolerance
+    para X ~ Poisson(lam). Con lambdas pequeños (final del partido) G se
+    reduce a unas pocas celdas.
+
+    Args:
+        lam: Lambda (escalar o array)
+        tolerance: Probabilidad de cola admisible
+        max_goals: Tamaño máximo permitido
+
+    Returns:
+        Array de enteros con la forma de lam
+    """
+    tail = 1.0 - np.cumsum(poisson_pmf(lam, max_goals), axis=-1)  # tail[k] = P(X > k)
+    within = tail <= tolerance
+    return np.where(within.any(axis=-1), within.argmax(axis=-1) + 1, max_goals)
+
+
+@lru_cache(maxsize=None)
+def _diagonal_index(max_goals: int) -> np.ndarray:
+    """
+    Matriz indicadora (max_goals², 2·max_goals-1) que asigna cada celda
+    [i, j] a su diagonal i - j (desplazada a 0..2·max_goals-2)
+    """
+    extra = np.arange(max_goals)
+    diagonal = (extra[:, None] - extra[None, :]).ravel() + (max_goals - 1)
+    index = np.zeros((max_goals * max_goals, 2 * max_goals - 1))
+    index[np.arange(max_goals * max_goals), diagonal] = 1.0
+    return index
+
+
+def diagonal_sums(matrix: np.ndarray) -> np.ndarray:
+    """
+    Probabilidad por diferencia de goles adicionales (i - j)
+
+    Args:
+        matrix: Matriz(es) de marcador con forma (..., G, G)
+
+    Returns:
+        Array (..., 2G-1); la posición k corresponde a i - j = k - (G-1)
+    """
+    max_goals = matrix.shape[-1]
+    flat = matrix.reshape(matrix.shape[:-2] + (max_goals * max_goals,))
+    return flat @ _diagonal_index(max_goals)
+
+
+@lru_cache(maxsize=None)
+def _antidiagonal_index(max_goals: int) -> np.ndarray:
+    """
+    Matriz indicadora (max_goals², 2·max_goals-1) que asigna cada celda
+    [i, j] a su total de goles adicionales i + j
+    """
+    extra = np.arange(max_goals)
+    total = (extra[:, None] + extra[None, :]).ravel()
+    index = np.zeros((max_goals * max_goals, 2 * max_goals - 1))
+    index[np.arange(max_goals * max_goals), total] = 1.0
+    return index
+
+
+def outcome_probabilities(matrix: np.ndarray, score_diff) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reducir matriz(es) de marcador a probabilidades 1X2 (sin normalizar)
+
+    El resultado final depende solo de la diferencia actual más i - j, así
+    que basta con sumar las diagonales y partirlas en el punto -score_diff.
+
+    Args:
+        matrix: Matriz(es) de goles adicionales con forma (..., G, G)
+        score_diff: Diferencia actual local - visitante (escalar o array (...))
+
+    Returns:
+        Tupla (prob_home, prob_draw, prob_away) con forma (...)
+    """
+    max_goals = matrix.shape[-1]
+    diagonals = diagonal_sums(matrix)
+
+    # Acumulado: cumulative[..., k] = suma de diagonales < k
+    cumulative = np.concatenate(
+        [np.zeros(diagonals.shape[:-1] + (1,)), np.cumsum(diagonals, axis=-1)], axis=-1
+    )
+
+    # Diagonal del empate final: i - j = -score_diff
+    draw_index = np.broadcast_to(-np.asarray(score_diff) + (max_goals - 1), diagonals.shape[:-1])
+    split = np.clip(draw_index, 0, 2 * max_goals - 1)[..., None]
+    in_range = (draw_index >= 0) & (draw_index < 2 * max_goals - 1)
+
+    prob_away = np.take_along_axis(cumulative, split, axis=-1)[..., 0]
+    prob_draw = np.where(
+        in_range,
+        np.take_along_axis(diagonals, np.clip(split, 0, 2 * max_goals - 2), axis=-1)[..., 0],
+        0.0
+    )
+    prob_home = cumulative[..., -1] - prob_away - prob_draw
+
+    return prob_home, prob_draw, prob_away
+
+
+def match_odds(lambda_home, lambda_away, score_diff, max_goals: int = 10):
+    """
+    Probabilidades 1X2 normalizadas y matriz de marcador
+
+    Args:
+        lambda_home: Lambda restante del local (escalar o array)
+        lambda_away: Lambda restante del visitante (escalar o array)
+        score_diff: Diferencia actual local - visitante (escalar o array)
+        max_goals: Tamaño de la matriz
+
+    Returns:
+        Tupla (prob_home, prob_draw, prob_away, matrix); la matriz se
+        devuelve para que otros mercados la reutilicen
+    """
+    matrix = score_matrix(lambda_home, lambda_away, max_goals)
+    prob_home, prob_draw, prob_away = outcome_probabilities(matrix, score_diff)
+
+    # Normalizar (la masa fuera de la matriz se reparte proporcionalmente)
+    total = prob_home + prob_draw + prob_away
+    total = np.where(total > 0, total, 1.0)
+
+    return prob_home / total, prob_draw / total, prob_away / total, matrix
+
+
+def match_odds_convolved(lambda_home: float, lambda_away: float, score_diff: int,
+                         max_goals: int) -> Tuple[float, float, float, float]:
+    """
+    Probabilidades 1X2 normalizadas de un partido sin construir la matriz
+
+    La distribución de i - j es la correlación de las dos PMF, así que las
+    diagonales de `outcome_probabilities` salen de dos vectores de tamaño
+    max_goals. Mismo resultado que `match_odds` para un solo partido.
+
+    Args:
+        lambda_home: Lambda restante del local
+        lambda_away: Lambda restante del visitante
+        score_diff: Diferencia actual local - visitante
+        max_goals: Tamaño de la matriz equivalente
+
+    Returns:
+        Tupla (prob_home, prob_draw, prob_away, masa dentro de la matriz)
+    """
+    diagonals = np.convolve(poisson_pmf(lambda_home, max_goals),
+                            poisson_pmf(lambda_away, max_goals)[::-1])
+
+    # Diagonal del empate final: i - j = -score_diff
+    draw_index = max_goals - 1 - score_diff
+    kept = float(diagonals.sum())
+    prob_away = float(diagonals[:min(max(draw_index, 0), 2 * max_goals - 1)].sum())
+    prob_draw = float(diagonals[draw_index]) if 0 <= draw_index < 2 * max_goals - 1 else 0.0
+    prob_home = kept - prob_away - prob_draw
+
+    total = kept if kept > 0 else 1.0
+    return prob_home / total, prob_draw / total, prob_away / total, kept
+
+
+DEFAULT_GOAL_LINES = (0.5, 1.5, 2.5, 3.5, 4.5)
+
+
+def market_probabilities(matrix: np.ndarray,
+                         home_score,
+                         away_score,
+                         lambda_home,
+                         lambda_away,
+                         lines=DEFAULT_GOAL_LINES,
+                         top_n: int = 5) -> Dict:
+    """
+    Todos los mercados derivados de una misma matriz de marcador
+
+    Calcula en una pasada 1X2, over/under por línea, ambos marcan (BTTS),
+    marcadores exactos más probables y próximo gol. Vectorizado sobre los
+    ejes iniciales de la matriz (un partido o un lote).
+
+    Args:
+        matrix: Matriz(es) de goles adicionales con forma (..., G, G)
+        home_score: Goles actuales del local (escalar o array (...))
+        away_score: Goles actuales del visitante (escalar o array (...))
+        lambda_home: Lambda restante del local (para próximo gol)
+        lambda_away: Lambda restante del visitante (para próximo gol)
+        lines: Líneas de goles totales (x.5) para over/under
+        top_n: Número de marcadores exactos a devolver
+
+    Returns:
+        Dict con arrays de forma (...):
+        {
+            'prob_home', 'prob_draw', 'prob_away',
+            'prob_over_2_5', 'prob_under_2_5', ... (una pareja por línea),
+            'prob_btts',
+            'prob_next_goal_home', 'prob_next_goal_away', 'prob_no_more_goals',
+            'correct_score_home', 'correct_score_away', 'correct_score_prob'
+                (forma (..., top_n), marcador final y probabilidad)
+        }
+    """
+    max_goals = matrix.shape[-1]
+    batch_shape = matrix.shape[:-2]
+    home_score = np.broadcast_to(np.asarray(home_score), batch_shape)
+    away_score = np.broadcast_to(np.asarray(away_score), batch_shape)
+
+    # La masa truncada se reparte proporcionalmente, como en match_odds
+    total = matrix.sum(axis=(-2, -1))
+    total = np.where(total > 0, total, 1.0)
+    matrix = matrix / total[..., None, None]
+    flat = matrix.reshape(batch_shape + (max_goals * max_goals,))
+
+    # 1X2
+    prob_home, prob_draw, prob_away = outcome_probabilities(matrix, home_score - away_score)
+    markets = {'prob_home': prob_home, 'prob_draw': prob_draw, 'prob_away': prob_away}
+
+    # Over/under: P(total final <= línea) acumulando las antidiagonales
+    totals = np.cumsum(flat @ _antidiagonal_index(max_goals), axis=-1)
+    current_total = home_score + away_score
+    for line in lines:
+        remaining = np.floor(line - current_total).astype(int)
+        under = np.where(
+            remaining >= 0,
+            np.take_along_axis(totals, np.clip(remaining, 0, 2 * max_goals - 2)[..., None], axis=-1)[..., 0],
+            0.0
+        )
+        key = f"{line:g}".replace('.', '_')
+        markets[f'prob_over_{key}'] = 1.0 - under
+        markets[f'prob_under_{key}'] = under
+
+    # Ambos marcan: el que aún no marcó necesita al menos un gol más
+    extra = np.arange(max_goals)
+    home_needs = extra >= (home_score == 0)[..., None]
+    away_needs = extra >= (away_score == 0)[..., None]
+    markets['prob_btts'] = (matrix * home_needs[..., :, None] * away_needs[..., None, :]).sum(axis=(-2, -1))
+
+    # Próximo gol: procesos de Poisson en competencia
+    lambda_home = np.broadcast_to(np.asarray(lambda_home, dtype=float), batch_shape)
+    lambda_away = np.broadcast_to(np.asarray(lambda_away, dtype=float), batch_shape)
+    rate = lambda_home + lambda_away
+    no_more_goals = np.exp(-rate)
+    share_home = np.divide(lambda_home, rate, out=np.full(batch_shape, 0.5), where=rate > 0)
+    markets['prob_next_goal_home'] = share_home * (1.0 - no_more_goals)
+    markets['prob_next_goal_away'] = (1.0 - share_home) * (1.0 - no_more_goals)
+    markets['prob_no_more_goals'] = no_more_goals
+
+    # Marcadores exactos más probables
+    top = np.argsort(-flat, axis=-1, kind='stable')[..., :top_n]
+    markets['correct_score_home'] = home_score[..., None] + top // max_goals
+    markets['correct_score_away'] = away_score[..., None] + top % max_goals
+    markets['correct_score_prob'] = np.take_along_axis(flat, top, axis=-1)
+
+    return markets
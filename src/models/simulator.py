@@ -0,0 +1,216 @@
+"""Simulador Monte Carlo in-play vectorizado (muchos partidos x muchos caminos)"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.models.inplay_predictor import InPlayPredictor
+
+
+class InPlaySimulator:
+    """
+    Simula el resto de los partidos evento a evento con NumPy
+
+    Se sortean los instantes de gol y de tarjeta roja de todos los partidos
+    y caminos a la vez (arrays planos de partidos x caminos): cada iteración
+    avanza cada camino hasta su próximo evento, así que el único bucle de
+    Python es sobre el número máximo de eventos por camino (~10-20).
+
+    A diferencia del modelo analítico, la intensidad de cada camino se
+    recalcula con su propio marcador y expulsiones:
+    - Ajuste por marcador de `InPlayPredictor._adjust_lambdas_batch`
+    - Cada roja multiplica la intensidad propia por RED_CARD_OWN_FACTOR y la
+      del rival por RED_CARD_OPPONENT_FACTOR
+    - Opcionalmente, tiros y posesión (`match_stats`) modulan la intensidad
+    """
+
+    RED_CARD_RATE = 0.12 / 90.0          # Rojas por equipo y minuto
+    ADJUSTMENT_BOUND = 1.2               # Factor máximo de _adjust_lambdas_inplay
+    RED_CARD_OWN_FACTOR = InPlayPredictor.RED_CARD_OWN_FACTOR
+    RED_CARD_OPPONENT_FACTOR = InPlayPredictor.RED_CARD_OPPONENT_FACTOR
+    STATS_FACTOR_RANGE = (0.7, 1.3)
+
+    def __init__(self, predictor: Optional[InPlayPredictor] = None, seed: Optional[int] = None):
+        self.predictor = predictor or InPlayPredictor()
+        self.rng = np.random.default_rng(seed)
+
+    def simulate(self,
+                 prematch_probs,
+                 current_minutes,
+                 home_scores=0,
+                 away_scores=0,
+                 red_cards_home=0,
+                 red_cards_away=0,
+                 match_stats: Optional[List[Optional[Dict]]] = None,
+                 n_paths: int = 10000,
+                 dynamic_adjustments: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Simular el resto de varios partidos
+
+        Args:
+            prematch_probs: Array (n, 3) con prob_home, prob_draw, prob_away
+            current_minutes: Minuto actual de cada partido
+            home_scores: Goles del local
+            away_scores: Goles del visitante
+            red_cards_home: Rojas actuales del local
+            red_cards_away: Rojas actuales del visitante
+            match_stats: Lista (una por partido) de dicts opcionales con
+                shots_home, shots_away, possession_home (0-100)
+            n_paths: Caminos simulados por partido
+            dynamic_adjustments: Si False, la intensidad queda fija en la del
+                estado actual (equivalente al modelo analítico sin rojas)
+
+        Returns:
+            Dict columnar:
+            {
+                'prob_home', 'prob_draw', 'prob_away': frecuencias simuladas,
+                'expected_home_goals', 'expected_away_goals': goles finales medios,
+                'std_error': error estándar máximo de las tres probabilidades,
+                'n_paths': caminos usados
+            }
+        """
+        probs = np.asarray(prematch_probs, dtype=float).reshape(-1, 3)
+        n = probs.shape[0]
+        minutes = np.broadcast_to(np.asarray(current_minutes, dtype=float), n)
+
+        lambda_home, lambda_away = self.predictor._estimate_lambdas_batch(
+            probs[:, 0], probs[:, 1], probs[:, 2]
+        )
+        stats_home, stats_away = self._stats_factors(match_stats, n)
+        base_home = lambda_home * stats_home
+        base_away = lambda_away * stats_away
+
+        # Estado plano de todos los caminos: posición k → partido k // n_paths
+        def per_path(value, dtype):
+            return np.repeat(np.broadcast_to(np.asarray(value, dtype=dtype), n), n_paths)
+
+        match_index = np.repeat(np.arange(n), n_paths)
+        clock = per_path(minutes, float)
+        home = per_path(home_scores, np.int16)
+        away = per_path(away_scores, np.int16)
+        reds_home = per_path(red_cards_home, np.int16)
+        reds_away = per_path(red_cards_away, np.int16)
+
+        if dynamic_adjustments:
+            red_card_rate = self.RED_CARD_RATE
+        else:
+            red_card_rate = 0.0
+            fixed_home, fixed_away = self.predictor._adjust_lambdas_batch(
+                base_home, base_away,
+                np.broadcast_to(home_scores, n), np.broadcast_to(away_scores, n), minutes
+            )
+
+        # Simulación por eventos: cada iteración sortea el próximo evento de
+        # todos los caminos vivos (un camino termina al pasar del minuto 90)
+        alive = np.flatnonzero(clock < 90)
+        while alive.size:
+            match = match_index[alive]
+            home_goals, away_goals = home[alive], away[alive]
+
+            if dynamic_adjustments:
+                red_factor_home = (self.RED_CARD_OWN_FACTOR ** reds_home[alive] *
+                                   self.RED_CARD_OPPONENT_FACTOR ** reds_away[alive])
+                red_factor_away = (self.RED_CARD_OWN_FACTOR ** reds_away[alive] *
+                                   self.RED_CARD_OPPONENT_FACTOR ** reds_home[alive])
+                # Cota superior de la intensidad (thinning)
+                bound_home = base_home[match] * self.ADJUSTMENT_BOUND * red_factor_home / 90.0
+                bound_away = base_away[match] * self.ADJUSTMENT_BOUND * red_factor_away / 90.0
+            else:
+                bound_home = fixed_home[match] / 90.0
+                bound_away = fixed_away[match] / 90.0
+
+            total_rate = bound_home + bound_away + 2 * red_card_rate
+            event_time = clock[alive] + self.rng.standard_exponential(alive.size) / total_rate
+
+            # Caminos que terminan antes del próximo evento
+            keep = event_time < 90
+            clock[alive] = np.minimum(event_time, 90)
+            alive, match, event_time = alive[keep], match[keep], event_time[keep]
+            home_goals, away_goals = home_goals[keep], away_goals[keep]
+            bound_home, bound_away = bound_home[keep], bound_away[keep]
+
+            if dynamic_adjustments:
+                rate_home, rate_away = self.predictor._adjust_lambdas_batch(
+                    base_home[match], base_away[match], home_goals, away_goals, event_time
+                )
+                rate_home = rate_home * red_factor_home[keep] / 90.0
+                rate_away = rate_away * red_factor_away[keep] / 90.0
+            else:
+                rate_home, rate_away = bound_home, bound_away
+
+            # Tipo de evento: [gol local | gol visitante | roja local | roja visitante],
+            # los goles se aceptan con probabilidad intensidad real / cota
+            u = self.rng.random(alive.size) * (bound_home + bound_away + 2 * red_card_rate)
+            home[alive] += u < rate_home
+            u -= bound_home
+            away[alive] += (u >= 0) & (u < rate_away)
+            u -= bound_away
+            reds_home[alive] += (u >= 0) & (u < red_card_rate)
+            reds_away[alive] += u >= red_card_rate
+
+        home = home.reshape(n, n_paths)
+        away = away.reshape(n, n_paths)
+
+        prob_home = (home > away).mean(axis=1)
+        prob_draw = (home == away).mean(axis=1)
+        prob_away = (home < away).mean(axis=1)
+
+        return {
+            'prob_home': prob_home,
+            'prob_draw': prob_draw,
+            'prob_away': prob_away,
+            'expected_home_goals': home.mean(axis=1),
+            'expected_away_goals': away.mean(axis=1),
+            'std_error': self.standard_error(np.stack([prob_home, prob_draw, prob_away]), n_paths),
+            'n_paths': n_paths
+        }
+
+    @staticmethod
+    def standard_error(probs, n_paths: int) -> np.ndarray:
+        """
+        Error estándar Monte Carlo (máximo entre resultados)
+
+        Args:
+            probs: Probabilidades con forma (resultados, partidos)
+            n_paths: Caminos simulados
+        """
+        probs = np.asarray(probs)
+        return np.sqrt(probs * (1 - probs) / n_paths).max(axis=0)
+
+    @staticmethod
+    def paths_for_error(target_error: float) -> int:
+        """Caminos necesarios para un error estándar <= target_error en el peor caso (p = 0.5)"""
+        return int(np.ceil(0.25 / target_error ** 2))
+
+    def _stats_factors(self, match_stats: Optional[List[Optional[Dict]]], n: int):
+        """
+        Multiplicadores de intensidad por partido desde tiros y posesión
+
+        La cuota de tiros (suavizada) y de posesión frente a un reparto
+        50/50 escalan la intensidad de cada equipo, acotada a
+        STATS_FACTOR_RANGE.
+        """
+        factor_home = np.ones(n)
+        factor_away = np.ones(n)
+
+        if not match_stats:
+            return factor_home, factor_away
+
+        low, high = self.STATS_FACTOR_RANGE
+        for i, stats in enumerate(match_stats):
+            if not stats:
+                continue
+
+            shots_home = stats.get('shots_home')
+            shots_away = stats.get('shots_away')
+            possession_home = stats.get('possession_home')
+
+            share = 0.5
+            if shots_home is not None and shots_away is not None:
+                share = (shots_home + 1.0) / (shots_home + shots_away + 2.0)
+            if possession_home is not None:
+                share = 0.75 * share + 0.25 * (possession_home / 100.0)
+
+            factor_home[i] = np.clip(2.0 * share, low, high)
+            factor_away[i] = np.clip(2.0 * (1.0 - share), low, high)
+
+        return factor_home, factor_away
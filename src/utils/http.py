@@ -0,0 +1,254 @@
+"""Sesiones HTTP con pool de conexiones, reintentos y compresión"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def accept_encoding() -> str:
+    """Codificaciones aceptadas: br solo si urllib3 puede decodificarla"""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return "gzip, deflate"
+    return "gzip, deflate, br"
+
+
+class PooledSession(requests.Session):
+    """
+    requests.Session con keep-alive y pool de conexiones por host
+
+    Pensada para vivir tanto como el cliente que la usa (en el dashboard,
+    los clientes de `st.cache_resource`), de modo que las conexiones TCP+TLS
+    se reutilizan entre refreshes. Lleva contadores de peticiones y
+    conexiones abiertas por host para confirmar la reutilización; las
+    latencias y el resto de métricas por endpoint están en
+    `src.utils.logger.request_metrics`.
+    """
+
+    def __init__(self,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 status_forcelist: Iterable[int] = (500, 502, 503, 504),
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            pool_connections: Número de hosts con pool propio
+            pool_maxsize: Conexiones guardadas por host
+            pool_block: Si True, pool_maxsize es además el límite de
+                conexiones simultáneas por host (las peticiones esperan)
+            max_retries: Reintentos ante errores de conexión y status_forcelist
+            backoff_factor: Espera base del backoff exponencial (segundos)
+            status_forcelist: Códigos HTTP que se reintentan
+            headers: Cabeceras por defecto de la sesión
+        """
+        super().__init__()
+
+        # Los 429 no se reintentan aquí: los gestiona el cliente (cuota y Retry-After)
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=tuple(status_forcelist),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize,
+                                   pool_block=pool_block,
+                                   max_retries=retry)
+        self.mount("https://", self.adapter)
+        self.mount("http://", self.adapter)
+
+        self.headers["Accept-Encoding"] = accept_encoding()
+        self.headers["Connection"] = "keep-alive"
+        if headers:
+            self.headers.update(headers)
+
+        self._lock = threading.Lock()
+        self._requests: Dict[str, int] = {}
+        self.hooks["response"].append(self._record)
+
+    def _record(self, response: requests.Response, *args, **kwargs):
+        """Hook de respuesta: contar la petición por host"""
+        host = urlsplit(response.url).netloc
+
+        with self._lock:
+            self._requests[host] = self._requests.get(host, 0) + 1
+
+    def _connections_opened(self) -> Dict[str, int]:
+        """Conexiones abiertas por host desde urllib3 (incluye pools ya descartados)"""
+        opened: Dict[str, int] = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened[pool.host] = opened.get(pool.host, 0) + pool.num_connections
+        return opened
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Reutilización de conexiones por host
+
+        Returns:
+            Dict host → {
+                'requests': peticiones respondidas,
+                'connections': conexiones TCP abiertas,
+                'reused': peticiones servidas por una conexión existente
+            }
+        """
+        opened = self._connections_opened()
+
+        with self._lock:
+            stats = {}
+            for host, count in self._requests.items():
+                connections = opened.get(host.split(":")[0], 0)
+                stats[host] = {
+                    'requests': count,
+                    'connections': connections,
+                    'reused': max(count - connections, 0)
+                }
+            return stats
+
+
+def map_concurrently(func: Callable, items: Iterable, max_workers: int = 4) -> List:
+    """
+    Aplicar `func` a cada elemento en un pool de hilos
+
+    Pensado para peticiones HTTP independientes (varias fechas): el tiempo
+    total se acerca al de la petición más lenta en lugar de a la suma.
+
+    Args:
+        func: Función de un argumento
+        items: Argumentos
+        max_workers: Máximo de llamadas simultáneas
+
+    Returns:
+        Resultados en el mismo orden que `items`
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+class TokenBucket:
+    """
+    Limitador de tasa (token bucket) seguro entre hilos
+
+    Se reponen `rate` tokens por segundo hasta `capacity`; cada petición
+    consume uno y, si no hay, espera al siguiente.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            rate: Tokens por segundo (p. ej. plan de 60 req/min → 1.0)
+            capacity: Ráfaga máxima
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Consumir un token, esperando si hace falta
+
+        Returns:
+            Segundos esperados
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            # El token se reserva ya; si el saldo queda negativo se espera a reponerlo
+            self.tokens -= 1
+            wait = max(0.0, -self.tokens / self.rate)
+            self.waited += wait
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class SingleFlight:
+    """
+    Coalescencia de llamadas idénticas concurrentes
+
+    Mientras una llamada con la misma clave está en curso, las demás
+    esperan y reciben su mismo resultado (o excepción) en lugar de repetirla.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Dict] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Ejecutar `func` una sola vez por clave entre llamadas simultáneas"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = func()
+            return call['result']
+        except BaseException as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Segundos indicados por una cabecera Retry-After (segundos o fecha HTTP)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+def retries_used(response: requests.Response) -> int:
+    """Reintentos que hizo urllib3 (errores de conexión / status_forcelist) antes de esta respuesta"""
+    retries = getattr(response.raw, 'retries', None)
+    return len(getattr(retries, 'history', ()) or ())
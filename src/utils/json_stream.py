@@ -0,0 +1,115 @@
+"""Parseo incremental de arrays JSON grandes"""
+import codecs
+import json
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+Hook = Callable[[list], Any]
+
+# Lo que puede seguir a un elemento completo de un array
+SEPARATORS = frozenset(' \t\r\n,]')
+
+
+def projecting_hook(fields: Iterable[str]) -> Hook:
+    """
+    object_pairs_hook que conserva solo las claves de `fields`
+
+    Se aplica a todos los niveles del documento, así que `fields` debe ser
+    la unión de las claves usadas en cualquier nivel. Los subárboles de las
+    claves descartadas se liberan en cuanto termina su objeto padre.
+    """
+    keep = frozenset(fields)
+
+    def hook(pairs: list) -> dict:
+        return {key: value for key, value in pairs if key in keep}
+
+    return hook
+
+
+def iter_json_array(chunks: Iterable[Union[bytes, str]],
+                    object_pairs_hook: Optional[Hook] = None) -> Iterator[Any]:
+    """
+    Elementos de un array JSON de primer nivel, a medida que llegan
+
+    Solo se mantiene en memoria el elemento en curso (más lo que quede del
+    último trozo), no el documento completo: el pico de memoria depende del
+    elemento más grande, no del tamaño de la respuesta.
+
+    Args:
+        chunks: Trozos del cuerpo (p. ej. `response.iter_content()`)
+        object_pairs_hook: Hook de `json` aplicado a cada objeto
+
+    Yields:
+        Cada elemento del array ya decodificado
+
+    Raises:
+        ValueError: Si el documento no es un array JSON válido
+    """
+    decoder = json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ''
+    position = 0
+    finished = False
+    started = False
+
+    def more() -> bool:
+        """Añadir el siguiente trozo al buffer; False al final del cuerpo"""
+        nonlocal buffer, position, finished
+        if finished:
+            return False
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            finished = True
+            buffer = buffer[position:] + utf8.decode(b'', final=True)
+            position = 0
+            return False
+        if isinstance(chunk, bytes):
+            chunk = utf8.decode(chunk)
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def next_char() -> Optional[str]:
+        """Siguiente carácter no blanco (sin consumirlo)"""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n':
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not more():
+                return None
+
+    if next_char() != '[':
+        raise ValueError("Se esperaba un array JSON")
+    position += 1
+
+    while True:
+        char = next_char()
+        if char == ']':
+            return
+        if started:
+            if char != ',':
+                raise ValueError(f"Se esperaba ',' en la posición {position}")
+            position += 1
+            next_char()
+        started = True
+
+        # Decodificar el elemento; si está incompleto, leer otro trozo.
+        # Un número puede decodificarse aunque esté cortado ("0" de "0.1"),
+        # así que solo se acepta si le sigue un separador o no hay más datos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                if finished or (end < len(buffer) and buffer[end] in SEPARATORS):
+                    break
+            except json.JSONDecodeError:
+                if finished:
+                    raise
+            if not more():
+                value, end = decoder.raw_decode(buffer, position)
+                break
+
+        position = end
+        yield value
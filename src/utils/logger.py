@@ -0,0 +1,162 @@
+"""Logging e instrumentación de peticiones HTTP (consultable en proceso)"""
+import bisect
+import logging
+import threading
+from typing import Dict, Optional, Union
+
+# Límites superiores (ms) de los buckets del histograma de latencia
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def setup_logging(level: Union[str, int] = "INFO"):
+    """
+    Configurar el logger del paquete `src` (una sola vez por proceso)
+
+    Streamlit re-ejecuta app.py en cada interacción; el handler solo se
+    añade la primera vez.
+
+    Args:
+        level: Nivel de logging ("DEBUG" muestra cada petición)
+    """
+    logger = logging.getLogger("src")
+    logger.setLevel(level)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(handler)
+        logger.propagate = False
+
+
+class RequestMetrics:
+    """
+    Métricas por endpoint de los clientes HTTP, seguras entre hilos
+
+    Por endpoint acumula peticiones, histograma de latencia, bytes
+    recibidos, respuestas por código de estado, errores de conexión,
+    reintentos por motivo, tiempo de parseo y elementos parseados.
+    `summary()` devuelve una copia para mostrar o exportar.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict] = {}
+
+    def _endpoint(self, endpoint: str) -> Dict:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = {
+                'requests': 0,
+                'latency_total': 0.0,
+                'latency_max': 0.0,
+                'latency_buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                'bytes': 0,
+                'status': {},
+                'errors': 0,
+                'retries': {},
+                'parses': 0,
+                'parse_total': 0.0,
+                'items': 0,
+            }
+        return stats
+
+    def record_request(self, endpoint: str, seconds: float, status: int, nbytes: int = 0):
+        """Petición respondida: latencia (hasta cabeceras), estado y bytes del cuerpo"""
+        milliseconds = 1000 * seconds
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats['requests'] += 1
+            stats['latency_total'] += milliseconds
+            stats['latency_max'] = max(stats['latency_max'], milliseconds)
+            stats['latency_buckets'][bisect.bisect_left(LATENCY_BUCKETS_MS, milliseconds)] += 1
+            stats['bytes'] += nbytes
+            stats['status'][status] = stats['status'].get(status, 0) + 1
+
+    def record_error(self, endpoint: str):
+        """Petición sin respuesta (conexión, timeout...)"""
+        with self._lock:
+            self._endpoint(endpoint)['errors'] += 1
+
+    def record_retry(self, endpoint: str, reason: str, count: int = 1):
+        """Reintentos por motivo ('429', '5xx', ...)"""
+        if count <= 0:
+            return
+        with self._lock:
+            retries = self._endpoint(endpoint)['retries']
+            retries[reason] = retries.get(reason, 0) + count
+
+    def record_parse(self, endpoint: str, seconds: float, items: int, nbytes: int = 0):
+        """
+        Parseo de una respuesta
+
+        Args:
+            endpoint: Endpoint
+            seconds: Tiempo de parseo
+            items: Elementos obtenidos
+            nbytes: Bytes leídos durante el parseo (respuestas en streaming,
+                cuyo cuerpo no se conoce al registrar la petición)
+        """
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats['parses'] += 1
+            stats['parse_total'] += seconds
+            stats['items'] += items
+            stats['bytes'] += nbytes
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Métricas por endpoint
+
+        Returns:
+            Dict endpoint → {
+                'requests', 'errors', 'bytes', 'status' (código → n),
+                'retries' (motivo → n), 'avg_latency_ms', 'max_latency_ms',
+                'p50_latency_ms', 'p95_latency_ms' (límite superior del bucket),
+                'latency_histogram' (límite en ms → n; None = por encima del último),
+                'parses', 'avg_parse_ms', 'items'
+            }
+        """
+        with self._lock:
+            summary = {}
+            for endpoint, stats in self._endpoints.items():
+                requests = stats['requests']
+                buckets = list(stats['latency_buckets'])
+                summary[endpoint] = {
+                    'requests': requests,
+                    'errors': stats['errors'],
+                    'bytes': stats['bytes'],
+                    'status': dict(stats['status']),
+                    'retries': dict(stats['retries']),
+                    'avg_latency_ms': round(stats['latency_total'] / requests, 1) if requests else None,
+                    'max_latency_ms': round(stats['latency_max'], 1) if requests else None,
+                    'p50_latency_ms': self._percentile(buckets, 0.5),
+                    'p95_latency_ms': self._percentile(buckets, 0.95),
+                    'latency_histogram': dict(zip(LATENCY_BUCKETS_MS + (None,), buckets)),
+                    'parses': stats['parses'],
+                    'avg_parse_ms': round(1000 * stats['parse_total'] / stats['parses'], 1)
+                    if stats['parses'] else None,
+                    'items': stats['items'],
+                }
+            return summary
+
+    @staticmethod
+    def _percentile(buckets: list, quantile: float) -> Optional[float]:
+        """Límite superior del bucket que contiene el cuantil (None sin datos o si excede)"""
+        total = sum(buckets)
+        if not total:
+            return None
+        seen = 0
+        for limit, count in zip(LATENCY_BUCKETS_MS + (None,), buckets):
+            seen += count
+            if seen >= quantile * total:
+                return limit
+        return None
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+# Registro compartido por defecto entre FootballAPI7Consumer y PrimaTipsScraper
+request_metrics = RequestMetrics()
@@ -1,7 +1,24 @@
 """Utilidades para emparejar partidos entre diferentes fuentes"""
-from typing import List, Dict, Optional
+import re
+import threading
+from datetime import datetime
+from typing import Iterator, List, Dict, Optional, Tuple
 from difflib import SequenceMatcher
 
+import numpy as np
+
+# Similitud coseno mínima (trigramas) para que una pareja sea candidata
+NGRAM_PREFILTER = 0.5
+MATCHING_STRATEGIES = ('assignment', 'greedy')
+# Similitud mínima de un equipo para aprender su alias de un solo emparejamiento
+ALIAS_MIN_SIMILARITY = 0.85
+# Partidos distintos que deben confirmar un alias poco parecido antes de guardarlo
+ALIAS_MIN_CONFIRMATIONS = 3
+# Días que se conservan los enlaces partido → predicción (ids estables en el día)
+LINK_RETENTION_DAYS = 2
+# Días que se conserva un alias antes de tener que volver a aprenderlo
+ALIAS_RETENTION_DAYS = 30
+
 def normalize_team_name(name: str) -> str:
     """
     Normalizar nombre de equipo para comparación
@@ -29,7 +46,270 @@ def calculate_similarity(str1: str, str2: str) -> float:
                           normalize_team_name(str1), 
                           normalize_team_name(str2)).ratio()
 
-def find_matching_prediction(match: Dict, predictions: List[Dict], threshold: float = 0.7) -> Optional[Dict]:
+class CandidateFilter:
+    """
+    Poda de parejas incompatibles por fecha, hora de inicio y marcador
+    
+    Cada partido y predicción se reduce a un vector de rasgos (día local,
+    hora de inicio, marcador y minuto; NaN si la fuente no lo da) y la
+    compatibilidad de todas las parejas se calcula de una vez por
+    broadcasting. Un rasgo desconocido en cualquiera de los lados nunca
+    descarta la pareja.
+    """
+    
+    # Columnas de la matriz de rasgos
+    DAY, KICKOFF, HOME_SCORE, AWAY_SCORE, MINUTE = range(5)
+    
+    def __init__(self,
+                 date_tolerance_days: int = 0,
+                 kickoff_tolerance_minutes: Optional[float] = None,
+                 score_tolerance: int = 1,
+                 minute_tolerance: float = 15,
+                 timezone: str = "America/Santiago"):
+        """
+        Args:
+            date_tolerance_days: Diferencia máxima de día local
+            kickoff_tolerance_minutes: Diferencia máxima de hora de inicio;
+                None no poda por hora. La hora "HH:MM" de PrimaTips se
+                interpreta en `timezone`, lo que no está verificado contra
+                una página real, así que esta poda es opcional
+            score_tolerance: Diferencia máxima de goles por equipo (los
+                marcadores de ambas fuentes se refrescan en momentos distintos)
+            minute_tolerance: Diferencia máxima de minuto de juego
+            timezone: Zona horaria de las fechas de PrimaTips
+        """
+        import pytz
+        
+        self.date_tolerance_days = date_tolerance_days
+        self.kickoff_tolerance_minutes = kickoff_tolerance_minutes
+        self.score_tolerance = score_tolerance
+        self.minute_tolerance = minute_tolerance
+        self.timezone = pytz.timezone(timezone)
+    
+    def match_features(self, matches: List[Dict]) -> np.ndarray:
+        """Rasgos (n, 5) de partidos de Football API 7"""
+        features = np.full((len(matches), 5), np.nan)
+        
+        for i, match in enumerate(matches):
+            try:
+                kickoff = datetime.fromisoformat(match.get('start_time', '').replace('Z', '+00:00'))
+                if kickoff.tzinfo is None:
+                    kickoff = self.timezone.localize(kickoff)
+                features[i, self.DAY] = kickoff.astimezone(self.timezone).toordinal()
+                features[i, self.KICKOFF] = kickoff.timestamp() / 60.0
+            except ValueError:
+                pass
+            
+            status = match.get('status', {})
+            if status.get('is_live') or status.get('game_time', 0) > 0:
+                features[i, self.HOME_SCORE] = match['home_team'].get('score', 0)
+                features[i, self.AWAY_SCORE] = match['away_team'].get('score', 0)
+            if status.get('is_live'):
+                features[i, self.MINUTE] = status.get('game_time', 0)
+        
+        return features
+    
+    def prediction_features(self, predictions: List[Dict]) -> np.ndarray:
+        """
+        Rasgos (n, 5) de predicciones de PrimaTips
+        
+        Las fechas y horas de inicio se repiten mucho en una página, así que
+        cada (fecha, HH:MM) distinto se convierte una sola vez.
+        """
+        features = np.full((len(predictions), 5), np.nan)
+        days: Dict[str, Optional[datetime]] = {}
+        kickoffs: Dict[Tuple[str, str], float] = {}
+        
+        for i, prediction in enumerate(predictions):
+            minute_raw = str(prediction.get('minute', '')).strip()
+            date = prediction.get('date', '')
+            
+            if date not in days:
+                try:
+                    days[date] = datetime.strptime(date, "%Y-%m-%d")
+                except ValueError:
+                    days[date] = None
+            day = days[date]
+            
+            if day is not None:
+                features[i, self.DAY] = day.toordinal()
+                # Partido no iniciado: PrimaTips muestra la hora de inicio (HH:MM)
+                kickoff = re.fullmatch(r"(\d{1,2}):(\d{2})", minute_raw)
+                if kickoff:
+                    key = (date, minute_raw)
+                    if key not in kickoffs:
+                        local = self.timezone.localize(day.replace(hour=int(kickoff.group(1)),
+                                                                   minute=int(kickoff.group(2))))
+                        kickoffs[key] = local.timestamp() / 60.0
+                    features[i, self.KICKOFF] = kickoffs[key]
+            
+            if prediction.get('is_live'):
+                features[i, self.HOME_SCORE] = prediction.get('home_score', 0)
+                features[i, self.AWAY_SCORE] = prediction.get('away_score', 0)
+                
+                if minute_raw == "HT":
+                    features[i, self.MINUTE] = 45
+                else:
+                    minute = re.match(r"(\d+)", minute_raw)
+                    if minute:
+                        features[i, self.MINUTE] = int(minute.group(1))
+        
+        return features
+    
+    def compatible(self, match_features: np.ndarray, prediction_features: np.ndarray) -> np.ndarray:
+        """
+        Matriz booleana (partidos, predicciones) de parejas compatibles
+        
+        Args:
+            match_features: Salida de `match_features`
+            prediction_features: Salida de `prediction_features`
+        """
+        compatible = np.ones((len(match_features), len(prediction_features)), dtype=bool)
+        
+        for column, tolerance in enumerate(self._tolerances()):
+            if tolerance is None:
+                continue
+            # NaN > tolerancia es False: un rasgo desconocido no descarta
+            difference = np.abs(np.subtract.outer(match_features[:, column], prediction_features[:, column]))
+            compatible &= ~(difference > tolerance)
+        
+        return compatible
+    
+    def window(self, match_features: np.ndarray, prediction_features: np.ndarray) -> np.ndarray:
+        """
+        Predicciones que pueden ser compatibles con algún partido de un grupo
+        
+        Cubeta por día y ventana de hora de inicio: solo compara rangos, así
+        que es barato incluso con muchas predicciones. Con los partidos
+        ordenados por hora de inicio, cada bloque se cruza solo con las
+        predicciones de su franja horaria.
+        
+        Returns:
+            Índices de las predicciones candidatas
+        """
+        candidates = np.ones(len(prediction_features), dtype=bool)
+        
+        for column, tolerance in ((self.DAY, self.date_tolerance_days),
+                                  (self.KICKOFF, self.kickoff_tolerance_minutes)):
+            values = match_features[:, column]
+            if tolerance is None or np.isnan(values).any():
+                continue
+            
+            predicted = prediction_features[:, column]
+            candidates &= ~((predicted < values.min() - tolerance) | (predicted > values.max() + tolerance))
+        
+        return np.flatnonzero(candidates)
+    
+    def _tolerances(self) -> Tuple[float, ...]:
+        """Tolerancia por columna de la matriz de rasgos (None = sin poda)"""
+        return (self.date_tolerance_days, self.kickoff_tolerance_minutes,
+                self.score_tolerance, self.score_tolerance, self.minute_tolerance)
+
+class PredictionIndex:
+    """
+    Índice de conteos de caracteres sobre una lista de predicciones
+    
+    Se construye una vez por lista de predicciones. Para cada partido
+    calcula de forma vectorizada una cota superior de la similitud
+    combinada con todas las predicciones: SequenceMatcher.ratio() nunca
+    supera 2·|caracteres en común| / (len1 + len2) (su quick_ratio). Solo
+    las predicciones cuya cota alcanza el umbral se puntúan con
+    SequenceMatcher, así que el resultado es idéntico al barrido completo.
+    """
+    
+    def __init__(self, predictions: List[Dict], candidate_filter: Optional[CandidateFilter] = None):
+        """
+        Args:
+            predictions: Lista de predicciones de PrimaTips
+            candidate_filter: Poda por fecha / hora / marcador; las parejas
+                incompatibles reciben cota 0
+        """
+        self.predictions = predictions
+        self.candidate_filter = candidate_filter
+        if candidate_filter is not None:
+            self.features = candidate_filter.prediction_features(predictions)
+        
+        home_names = [normalize_team_name(p['home_team']) for p in predictions]
+        away_names = [normalize_team_name(p['away_team']) for p in predictions]
+        
+        self.vocabulary: Dict[str, int] = {}
+        for name in home_names + away_names:
+            for char in name:
+                self.vocabulary.setdefault(char, len(self.vocabulary))
+        
+        self.home_counts, self.home_lengths = self._char_counts(home_names)
+        self.away_counts, self.away_lengths = self._char_counts(away_names)
+    
+    def _char_counts(self, names: List[str]):
+        """Matriz (nombres, vocabulario) de conteos y longitud de cada nombre"""
+        counts = np.zeros((len(names), max(1, len(self.vocabulary))), dtype=np.int32)
+        for i, name in enumerate(names):
+            for char in name:
+                counts[i, self.vocabulary[char]] += 1
+        return counts, np.array([len(name) for name in names])
+    
+    def _side_bound(self, counts: np.ndarray, lengths: np.ndarray, name: str) -> np.ndarray:
+        """quick_ratio de `name` contra todos los nombres de un lado"""
+        name = normalize_team_name(name)
+        chars: Dict[int, int] = {}
+        for char in name:
+            if char in self.vocabulary:
+                column = self.vocabulary[char]
+                chars[column] = chars.get(column, 0) + 1
+        
+        if chars:
+            columns = np.fromiter(chars.keys(), dtype=int)
+            wanted = np.fromiter(chars.values(), dtype=np.int32)
+            common = np.minimum(counts[:, columns], wanted).sum(axis=1)
+        else:
+            common = np.zeros(len(lengths))
+        
+        total = lengths + len(name)
+        return np.where(total > 0, 2.0 * common / np.maximum(total, 1), 1.0)
+    
+    def compatibility(self, matches: List[Dict], block_size: int = 256) -> Iterator[Optional[np.ndarray]]:
+        """
+        Fila de compatibilidad (ver `CandidateFilter.compatible`) de cada partido
+        
+        Los rasgos de los partidos se calculan una vez para todo el lote y
+        la compatibilidad por bloques de partidos (memoria acotada). Sin
+        `candidate_filter` cada fila es None.
+        """
+        if self.candidate_filter is None:
+            yield from (None for _ in matches)
+            return
+        
+        features = self.candidate_filter.match_features(matches)
+        for start in range(0, len(matches), block_size):
+            yield from self.candidate_filter.compatible(features[start:start + block_size], self.features)
+    
+    def upper_bounds(self, match: Dict, compatible: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Cota superior de la similitud combinada del partido con cada predicción
+        
+        Args:
+            match: Partido de Football API 7
+            compatible: Fila del partido en `compatibility` (calculada para
+                todo el lote); si no se indica y hay `candidate_filter`, se
+                calcula aquí
+        """
+        if self.candidate_filter is None:
+            rows = slice(None)
+        else:
+            if compatible is None:
+                compatible = next(self.compatibility([match]))
+            # Solo se acotan las predicciones compatibles; el resto queda en 0
+            rows = np.flatnonzero(compatible)
+        
+        bounds = np.zeros(len(self.predictions))
+        home = self._side_bound(self.home_counts[rows], self.home_lengths[rows], match['home_team']['name'])
+        away = self._side_bound(self.away_counts[rows], self.away_lengths[rows], match['away_team']['name'])
+        bounds[rows] = (home + away) / 2.0
+        return bounds
+
+def find_matching_prediction(match: Dict, predictions: List[Dict], threshold: float = 0.7,
+                             index: Optional[PredictionIndex] = None,
+                             compatible: Optional[np.ndarray] = None) -> Optional[Dict]:
     """
     Encontrar la predicción que corresponde a un partido
     
@@ -37,13 +317,19 @@ def find_matching_prediction(match: Dict, predictions: List[Dict], threshold: fl
         match: Partido de Football API 7
         predictions: Lista de predicciones de PrimaTips
         threshold: Umbral mínimo de similitud (0.0 - 1.0)
+        index: Índice sobre `predictions`; si se indica, solo se puntúan
+            los candidatos cuya cota de similitud alcanza el umbral
+        compatible: Fila de compatibilidad del partido para la poda del
+            índice (ver `PredictionIndex.compatibility`)
     
     Returns:
         Predicción encontrada o None
     """
+    if index is not None:
+        return _find_with_index(match, index, threshold, compatible)
+    
     match_home = match['home_team']['name']
     match_away = match['away_team']['name']
-    
     best_match = None
     best_score = 0.0
     
@@ -64,24 +350,469 @@ def find_matching_prediction(match: Dict, predictions: List[Dict], threshold: fl
     
     return best_match
 
-def enrich_matches_with_predictions(matches: List[Dict], predictions: List[Dict]) -> List[Dict]:
+def _find_with_index(match: Dict, index: PredictionIndex, threshold: float,
+                     compatible: Optional[np.ndarray] = None) -> Optional[Dict]:
+    """
+    Igual que el barrido de `find_matching_prediction`, pero solo sobre los
+    candidatos del índice, de mayor a menor cota (ramificación y poda)
+    """
+    match_home = match['home_team']['name']
+    match_away = match['away_team']['name']
+    bounds = index.upper_bounds(match, compatible)
+    candidates = np.flatnonzero(bounds >= threshold)
+    candidates = candidates[np.argsort(-bounds[candidates], kind='stable')]
+    
+    best_index = None
+    best_score = 0.0
+    
+    for i in candidates:
+        # Ningún candidato restante puede superar (ni empatar) al mejor
+        if bounds[i] < best_score:
+            break
+        
+        prediction = index.predictions[i]
+        combined_score = (calculate_similarity(match_home, prediction['home_team']) +
+                          calculate_similarity(match_away, prediction['away_team'])) / 2.0
+        
+        # En empate gana la predicción que aparece antes en la lista; como en
+        # el barrido, una similitud 0.0 nunca se elige (aunque threshold sea 0)
+        if combined_score >= threshold and (
+                combined_score > best_score or
+                (best_index is not None and combined_score == best_score and i < best_index)):
+            best_score = combined_score
+            best_index = i
+    
+    return index.predictions[best_index] if best_index is not None else None
+
+def name_ngrams(name: str, n: int = 3) -> List[str]:
+    """
+    N-gramas de caracteres de un nombre normalizado
+    
+    El nombre se rellena con un espacio a cada lado para que los extremos
+    de cada palabra también generen n-gramas.
+    """
+    padded = f" {normalize_team_name(name)} "
+    return [padded[i:i + n] for i in range(max(1, len(padded) - n + 1))]
+
+def ngram_matrix(names: List[str], vocabulary: Dict[str, int], grow: bool = True):
+    """
+    Vectores de n-gramas normalizados (norma L2) de una lista de nombres
+    
+    Args:
+        names: Nombres de equipo
+        vocabulary: N-grama → columna; se amplía si grow=True
+        grow: Si False, los n-gramas desconocidos se ignoran (pero cuentan
+            en la norma, así que la similitud coseno sigue siendo exacta)
+    
+    Returns:
+        Matriz dispersa CSR (nombres, vocabulario)
+    """
+    from scipy.sparse import csr_matrix
+    
+    rows, columns, values = [], [], []
+    for row, name in enumerate(names):
+        counts: Dict[str, int] = {}
+        for gram in name_ngrams(name):
+            counts[gram] = counts.get(gram, 0) + 1
+        
+        norm = np.sqrt(sum(c * c for c in counts.values()))
+        for gram, count in counts.items():
+            if gram not in vocabulary:
+                if not grow:
+                    continue
+                vocabulary[gram] = len(vocabulary)
+            rows.append(row)
+            columns.append(vocabulary[gram])
+            values.append(count / norm)
+    
+    return csr_matrix((values, (rows, columns)), shape=(len(names), max(1, len(vocabulary))))
+
+def similarity_pairs(matches: List[Dict], predictions: List[Dict],
+                     min_similarity: float = NGRAM_PREFILTER,
+                     candidate_filter: Optional[CandidateFilter] = None,
+                     block_size: int = 1024) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parejas (partido, predicción) con similitud de n-gramas >= min_similarity
+    
+    La similitud de cada equipo es el coseno entre vectores de trigramas y
+    la combinada, el promedio de local y visitante (como en
+    `find_matching_prediction`). La matriz se calcula con productos
+    dispersos por bloques de partidos para acotar memoria. Con
+    `candidate_filter`, los partidos se ordenan por hora de inicio, cada
+    bloque se cruza solo con las predicciones de su ventana
+    (`CandidateFilter.window`) y las parejas incompatibles se descartan
+    antes de umbralizar.
+    
+    Returns:
+        Tupla (índices de partido, índices de predicción, similitudes)
+    """
+    # Un único vocabulario (local + visitante) para que todas las matrices
+    # compartan columnas
+    vocabulary: Dict[str, int] = {}
+    pred_names = ngram_matrix([p['home_team'] for p in predictions] +
+                              [p['away_team'] for p in predictions], vocabulary)
+    pred_home = pred_names[:len(predictions)]
+    pred_away = pred_names[len(predictions):]
+    match_home = ngram_matrix([m['home_team']['name'] for m in matches], vocabulary, grow=False)
+    match_away = ngram_matrix([m['away_team']['name'] for m in matches], vocabulary, grow=False)
+    
+    order = np.arange(len(matches))
+    if candidate_filter is not None:
+        match_features = candidate_filter.match_features(matches)
+        prediction_features = candidate_filter.prediction_features(predictions)
+        # Bloques más pequeños = ventanas horarias más estrechas
+        block_size = min(block_size, 256)
+        order = np.lexsort((match_features[:, candidate_filter.KICKOFF],
+                            match_features[:, candidate_filter.DAY]))
+    
+    rows, columns, scores = [], [], []
+    for start in range(0, len(matches), block_size):
+        block = order[start:start + block_size]
+        
+        if candidate_filter is None:
+            candidates = np.arange(len(predictions))
+        else:
+            candidates = candidate_filter.window(match_features[block], prediction_features)
+        if not len(candidates):
+            continue
+        
+        combined = ((match_home[block] @ pred_home[candidates].T).toarray() +
+                    (match_away[block] @ pred_away[candidates].T).toarray()) / 2.0
+        if candidate_filter is not None:
+            combined[~candidate_filter.compatible(match_features[block],
+                                                  prediction_features[candidates])] = 0.0
+        
+        block_rows, block_columns = np.nonzero(combined >= min_similarity)
+        rows.append(block[block_rows])
+        columns.append(candidates[block_columns])
+        scores.append(combined[block_rows, block_columns])
+    
+    if not rows:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0)
+    
+    return np.concatenate(rows), np.concatenate(columns), np.concatenate(scores)
+
+def assign_predictions(matches: List[Dict], predictions: List[Dict],
+                       threshold: float = 0.7,
+                       prefilter: float = NGRAM_PREFILTER,
+                       candidate_filter: Optional[CandidateFilter] = None,
+                       fallback: bool = True) -> List[Optional[int]]:
+    """
+    Asignación uno a uno partido ↔ predicción óptima en conjunto
+    
+    1. `similarity_pairs` preselecciona parejas con la matriz de n-gramas
+       (y, opcionalmente, la poda de `CandidateFilter`)
+    2. Las candidatas se puntúan con la similitud de `find_matching_prediction`
+       y se descartan las que no alcanzan el umbral
+    3. El grafo bipartito resultante se parte en componentes conexas
+       (normalmente partidos de una misma competición quedan aislados del
+       resto) y cada una se resuelve con el algoritmo húngaro, maximizando
+       la suma de márgenes sobre el umbral: una pareja clara pesa más que
+       dos parejas dudosas
+    4. La preselección por trigramas puede descartar parejas que sí
+       alcanzan el umbral; con `fallback`, los partidos sin asignar se
+       buscan entre las predicciones libres con `PredictionIndex`, cuya
+       cota no descarta ninguna
+    
+    Args:
+        matches: Lista de partidos de Football API 7
+        predictions: Lista de predicciones de PrimaTips
+        threshold: Umbral mínimo de similitud combinada (0.0 - 1.0)
+        prefilter: Similitud mínima de n-gramas para puntuar una pareja
+        candidate_filter: Poda por fecha / hora / marcador
+        fallback: Buscar los partidos sin asignar con el índice (paso 4)
+    
+    Returns:
+        Índice de la predicción asignada a cada partido (o None)
+    """
+    from scipy.optimize import linear_sum_assignment
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    
+    assigned: List[Optional[int]] = [None] * len(matches)
+    if not matches or not predictions:
+        return assigned
+    
+    rows, columns, _ = similarity_pairs(matches, predictions, prefilter, candidate_filter)
+    scores = np.array([
+        (calculate_similarity(matches[r]['home_team']['name'], predictions[c]['home_team']) +
+         calculate_similarity(matches[r]['away_team']['name'], predictions[c]['away_team'])) / 2.0
+        for r, c in zip(rows.tolist(), columns.tolist())
+    ])
+    keep = scores >= threshold
+    rows, columns, scores = rows[keep], columns[keep], scores[keep]
+    
+    # Nodos 0..M-1 son partidos y M..M+N-1 predicciones
+    n_matches = len(matches)
+    size = n_matches + len(predictions)
+    graph = coo_matrix((np.ones(len(rows)), (rows, columns + n_matches)), shape=(size, size))
+    _, labels = connected_components(graph, directed=False)
+    
+    edge_labels = labels[rows]
+    order = np.argsort(edge_labels, kind='stable')
+    boundaries = np.flatnonzero(np.diff(edge_labels[order])) + 1
+    
+    for edges in np.split(order, boundaries):
+        component_rows, local_rows = np.unique(rows[edges], return_inverse=True)
+        component_columns, local_columns = np.unique(columns[edges], return_inverse=True)
+        
+        # Parejas no candidatas pesan 0, equivalente a dejarlas sin asignar
+        weights = np.zeros((len(component_rows), len(component_columns)))
+        weights[local_rows, local_columns] = scores[edges] - threshold + 1e-3
+        
+        match_rows, prediction_columns = linear_sum_assignment(weights, maximize=True)
+        for r, c in zip(match_rows, prediction_columns):
+            if weights[r, c] > 0:
+                assigned[component_rows[r]] = int(component_columns[c])
+    
+    if fallback:
+        _assign_remaining(matches, predictions, assigned, threshold, candidate_filter)
+    
+    return assigned
+
+def _assign_remaining(matches: List[Dict], predictions: List[Dict], assigned: List[Optional[int]],
+                      threshold: float, candidate_filter: Optional[CandidateFilter] = None):
+    """
+    Completar `assigned` con la mejor predicción libre de cada partido sin
+    asignar (como la estrategia 'greedy'); una predicción ya elegida por
+    otro partido del mismo paso no se repite
+    """
+    pending = [i for i, index in enumerate(assigned) if index is None]
+    claimed = set(assigned) - {None}
+    available = [i for i in range(len(predictions)) if i not in claimed]
+    if not pending or not available:
+        return
+    
+    available_predictions = [predictions[i] for i in available]
+    positions = {id(p): i for i, p in zip(available, available_predictions)}
+    index = PredictionIndex(available_predictions, candidate_filter)
+    pending_matches = [matches[i] for i in pending]
+    
+    for position, match, compatible in zip(pending, pending_matches, index.compatibility(pending_matches)):
+        prediction = find_matching_prediction(match, available_predictions, threshold,
+                                              index=index, compatible=compatible)
+        if prediction is not None and positions[id(prediction)] not in claimed:
+            assigned[position] = positions[id(prediction)]
+            claimed.add(assigned[position])
+
+class MatchLinkCache:
+    """
+    Enlaces partido → predicción y alias de equipos persistidos en SQLite
+    
+    Los match_id de Football API 7 y los ids `g_` de PrimaTips son estables
+    durante el día, así que un partido ya emparejado se resuelve con una
+    búsqueda en un dict. Los alias (nombre PrimaTips → nombre API) se
+    aprenden de los emparejamientos difusos claros y permiten emparejar por
+    igualdad de nombres partidos nunca vistos. El matching difuso solo se
+    ejecuta para lo que queda sin resolver.
+    
+    Los enlaces de más de LINK_RETENTION_DAYS días y los alias de más de
+    ALIAS_RETENTION_DAYS se borran al crear el cache y una vez al día en
+    `flush`; `forget_alias` borra un alias aprendido por error.
+    
+    Es seguro compartir una instancia entre sesiones de Streamlit
+    (`st.cache_resource`): `remember` y `flush` se serializan con un lock.
+    """
+    
+    def __init__(self, database=None):
+        """
+        Args:
+            database: Instancia de Database (default: la compartida, `get_db()`)
+        """
+        if database is None:
+            from src.data.database import get_db
+            database = get_db()
+        
+        self.database = database
+        self.lock = threading.RLock()
+        self.new_links: Dict[str, Tuple[str, Optional[str]]] = {}
+        self.new_aliases: Dict[str, str] = {}
+        # Alias pendientes: nombre PrimaTips → nombre API → partidos que lo confirman
+        self.alias_candidates: Dict[str, Dict[str, set]] = {}
+        self._load_recent_links()
+    
+    def _load_recent_links(self):
+        """Borrar los enlaces y alias antiguos y cargar el resto"""
+        with self.lock:
+            self.database.cleanup_old_links(LINK_RETENTION_DAYS)
+            self.database.cleanup_old_aliases(ALIAS_RETENTION_DAYS)
+            self.links: Dict[str, str] = self.database.get_match_links()
+            self.aliases: Dict[str, str] = self.database.get_team_aliases()
+            self.links_cleaned_on = datetime.now().date()
+    
+    def canonical_name(self, name: str) -> str:
+        """Nombre normalizado de PrimaTips traducido a nombre API si hay alias"""
+        name = normalize_team_name(name)
+        return self.aliases.get(name, name)
+    
+    def remember(self, match: Dict, prediction: Dict):
+        """
+        Registrar un emparejamiento difuso (enlace y, si es claro, alias)
+        
+        El alias de un equipo se aprende en el acto si su propia similitud
+        llega a ALIAS_MIN_SIMILARITY. Si no, y el otro equipo ya coincide
+        (igual o por un alias conocido), cuenta como una confirmación: con
+        ALIAS_MIN_CONFIRMATIONS partidos distintos se aprenden alias poco
+        parecidos como "man utd" → "manchester united". Un nombre que ya
+        tiene otro alias, o que se confirma con dos equipos distintos, no
+        se aprende.
+        """
+        home = (normalize_team_name(prediction['home_team']), normalize_team_name(match['home_team']['name']))
+        away = (normalize_team_name(prediction['away_team']), normalize_team_name(match['away_team']['name']))
+        
+        with self.lock:
+            self.new_links[match['match_id']] = (prediction['id'], prediction.get('date'))
+            
+            known = {**self.aliases, **self.new_aliases}
+            resolved = [known.get(alias, alias) == canonical for alias, canonical in (home, away)]
+            
+            for side, (alias, canonical) in enumerate((home, away)):
+                if resolved[side] or alias in known:
+                    continue
+                
+                candidates = self.alias_candidates.get(alias, {})
+                if calculate_similarity(alias, canonical) >= ALIAS_MIN_SIMILARITY:
+                    confirmations = ALIAS_MIN_CONFIRMATIONS
+                elif resolved[1 - side]:
+                    candidates = self.alias_candidates.setdefault(alias, {})
+                    candidates.setdefault(canonical, set()).add(match['match_id'])
+                    confirmations = len(candidates[canonical])
+                else:
+                    continue
+                
+                if confirmations >= ALIAS_MIN_CONFIRMATIONS and set(candidates) <= {canonical}:
+                    self.new_aliases[alias] = canonical
+                    self.alias_candidates.pop(alias, None)
+    
+    def forget_alias(self, name: str):
+        """Borrar el alias de un nombre de PrimaTips (p. ej. uno aprendido por error)"""
+        alias = normalize_team_name(name)
+        with self.lock:
+            self.aliases.pop(alias, None)
+            self.new_aliases.pop(alias, None)
+            self.alias_candidates.pop(alias, None)
+            self.database.delete_team_aliases([alias])
+    
+    def flush(self):
+        """Persistir enlaces (una escritura por fecha de predicción) y alias nuevos"""
+        with self.lock:
+            if self.new_links:
+                by_date: Dict[Optional[str], Dict[str, str]] = {}
+                for match_id, (prediction_id, date) in self.new_links.items():
+                    by_date.setdefault(date, {})[match_id] = prediction_id
+                for date, links in by_date.items():
+                    self.database.save_match_links(links, date)
+                    self.links.update(links)
+                self.new_links = {}
+            
+            if self.new_aliases:
+                self.database.save_team_aliases(self.new_aliases)
+                self.aliases.update(self.new_aliases)
+                self.new_aliases = {}
+            
+            # El cache vive tanto como el proceso: limpiar también al cambiar de día
+            if datetime.now().date() != self.links_cleaned_on:
+                self._load_recent_links()
+
+def _resolve_cached(matches: List[Dict], predictions: List[Dict], cache: MatchLinkCache,
+                    candidate_filter: Optional[CandidateFilter] = None) -> List[Optional[int]]:
+    """
+    Emparejar sin similitud difusa: enlaces conocidos y luego igualdad de
+    nombres (con alias), ambos con búsquedas O(1)
+    
+    Returns:
+        Índice de la predicción de cada partido (None si no se resolvió)
+    """
+    by_id = {p['id']: i for i, p in enumerate(predictions)}
+    by_names: Dict[Tuple[str, str], int] = {}
+    for i, p in enumerate(predictions):
+        by_names.setdefault((cache.canonical_name(p['home_team']), cache.canonical_name(p['away_team'])), i)
+    
+    if candidate_filter is not None:
+        prediction_features = candidate_filter.prediction_features(predictions)
+        match_features = candidate_filter.match_features(matches)
+    
+    found: List[Optional[int]] = [None] * len(matches)
+    claimed = set()
+    
+    for position, match in enumerate(matches):
+        index = by_id.get(cache.links.get(match['match_id']))
+        if index is None:
+            index = by_names.get((normalize_team_name(match['home_team']['name']),
+                                  normalize_team_name(match['away_team']['name'])))
+            # Mismos equipos en otra fecha (p. ej. ida y vuelta)
+            if index is not None and candidate_filter is not None and not candidate_filter.compatible(
+                    match_features[position:position + 1], prediction_features[index:index + 1])[0, 0]:
+                index = None
+        if index is not None and index not in claimed:
+            found[position] = index
+            claimed.add(index)
+    
+    return found
+
+def enrich_matches_with_predictions(matches: List[Dict], predictions: List[Dict],
+                                    strategy: str = 'assignment',
+                                    cache: Optional[MatchLinkCache] = None,
+                                    candidate_filter: Optional[CandidateFilter] = None) -> List[Dict]:
     """
     Añadir predicciones a los partidos que coincidan
     
     Args:
         matches: Lista de partidos de Football API 7
         predictions: Lista de predicciones de PrimaTips
+        strategy: 'assignment' (uno a uno óptimo, ver `assign_predictions`)
+            o 'greedy' (cada partido elige su mejor predicción por separado,
+            ver `find_matching_prediction`)
+        cache: Enlaces y alias persistidos; si se indica, solo los partidos
+            no resueltos por el cache pasan por el matching difuso, y sus
+            emparejamientos se guardan para el siguiente refresh
+        candidate_filter: Poda de parejas incompatibles por fecha, hora de
+            inicio y marcador antes de calcular similitudes
     
     Returns:
         Lista de partidos enriquecidos con predicciones
     """
+    if strategy not in MATCHING_STRATEGIES:
+        raise ValueError(f"strategy debe ser uno de {MATCHING_STRATEGIES}")
+    
+    if cache is not None:
+        found = _resolve_cached(matches, predictions, cache, candidate_filter)
+    else:
+        found = [None] * len(matches)
+    
+    # Matching difuso solo para los partidos y predicciones sin resolver
+    pending = [i for i, index in enumerate(found) if index is None]
+    claimed = set(found) - {None}
+    available = [i for i in range(len(predictions)) if i not in claimed]
+    pending_matches = [matches[i] for i in pending]
+    available_predictions = [predictions[i] for i in available]
+    
+    if strategy == 'assignment':
+        fuzzy = assign_predictions(pending_matches, available_predictions,
+                                   candidate_filter=candidate_filter)
+    else:
+        # Índice y compatibilidades construidos una sola vez para todo el lote
+        index = PredictionIndex(available_predictions, candidate_filter)
+        positions = {id(p): i for i, p in enumerate(available_predictions)}
+        fuzzy = [find_matching_prediction(match, available_predictions, index=index,
+                                          compatible=compatible)
+                 for match, compatible in zip(pending_matches, index.compatibility(pending_matches))]
+        fuzzy = [positions[id(p)] if p else None for p in fuzzy]
+    
+    for position, index in zip(pending, fuzzy):
+        if index is not None:
+            found[position] = available[index]
+            if cache is not None:
+                cache.remember(matches[position], predictions[available[index]])
+    
+    if cache is not None:
+        cache.flush()
+    
     enriched = []
     
-    for match in matches:
+    for match, index in zip(matches, found):
         enriched_match = match.copy()
-        
-        # Buscar predicción correspondiente
-        prediction = find_matching_prediction(match, predictions)
+        prediction = predictions[index] if index is not None else None
         
         if prediction:
             enriched_match['prediction'] = {
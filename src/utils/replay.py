@@ -0,0 +1,150 @@
+"""Grabación y reproducción de respuestas HTTP (pruebas sin gastar cuota)"""
+import hashlib
+import io
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+TRANSPORT_MODES = ('live', 'record', 'replay')
+
+# El cuerpo se guarda ya descomprimido y completo (nombres en minúsculas)
+DROPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length', 'connection')
+
+
+class ResponseStore:
+    """
+    Directorio de respuestas grabadas
+
+    Cada respuesta se guarda como `<clave>.json` (método, URL, estado,
+    cabeceras) y `<clave>.body` (cuerpo en bruto: JSON de la API o HTML de
+    PrimaTips). La clave depende del método, la ruta y la query ordenada,
+    no del host, así que la misma grabación sirve tanto para la URL real
+    como para un servidor local (benchmarks/standin_server.py).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(method: str, url: str) -> str:
+        """Clave de una petición: ruta legible + hash de método, ruta y query ordenada"""
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        digest = hashlib.sha1(f"{method.upper()} {parts.path}?{query}".encode()).hexdigest()[:16]
+        slug = parts.path.strip('/').replace('/', '_') or 'root'
+        return f"{slug[-60:]}-{digest}"
+
+    def save(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        key = self.key(method, url)
+        meta = {
+            'method': method.upper(),
+            'url': url,
+            'status': status,
+            'headers': {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS}
+        }
+        (self.directory / f"{key}.body").write_bytes(body)
+        (self.directory / f"{key}.json").write_text(json.dumps(meta, indent=2), encoding='utf-8')
+
+    def load(self, method: str, url: str) -> Optional[Tuple[Dict, bytes]]:
+        """(metadatos, cuerpo) grabados para la petición, o None"""
+        key = self.key(method, url)
+        meta_path = self.directory / f"{key}.json"
+        if not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        return meta, (self.directory / f"{key}.body").read_bytes()
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    Adaptador que delega en el real y graba las respuestas 200
+
+    Los errores (429, 5xx) no se graban para no pisar una grabación buena.
+    En este modo el cuerpo se lee completo aunque se pida en streaming.
+    """
+
+    def __init__(self, adapter: BaseAdapter, store: ResponseStore):
+        super().__init__()
+        self.adapter = adapter
+        self.store = store
+
+    def send(self, request, **kwargs):
+        response = self.adapter.send(request, **kwargs)
+        if response.status_code == 200:
+            self.store.save(request.method, request.url, response.status_code,
+                            dict(response.headers), response.content)
+            logger.debug("Grabado %s", request.url)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Adaptador que responde desde un ResponseStore sin tocar la red
+
+    Una petición sin grabación recibe un 404 (y un aviso en el log).
+    """
+
+    def __init__(self, store: ResponseStore):
+        super().__init__()
+        self.store = store
+
+    def send(self, request, **kwargs):
+        recorded = self.store.load(request.method, request.url)
+        if recorded is None:
+            logger.warning("Sin grabación para %s %s", request.method, request.url)
+            meta, body = {'status': 404, 'headers': {'Content-Type': 'text/plain'}}, b"not recorded"
+        else:
+            meta, body = recorded
+
+        response = requests.Response()
+        response.status_code = meta['status']
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.headers['Content-Length'] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response.reason = 'OK' if meta['status'] == 200 else 'Not Found'
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def use_transport(session: requests.Session, mode: str, directory: str):
+    """
+    Montar el modo de transporte en una sesión
+
+    Args:
+        session: Sesión compartida por los clientes (p. ej. PooledSession)
+        mode: 'live' (red real), 'record' (red real + grabación) o
+            'replay' (solo grabaciones, sin red)
+        directory: Directorio de grabaciones
+    """
+    if mode not in TRANSPORT_MODES:
+        raise ValueError(f"Modo de transporte desconocido: {mode} (usar {', '.join(TRANSPORT_MODES)})")
+    if mode == 'live':
+        return
+
+    store = ResponseStore(directory)
+    for prefix in ("https://", "http://"):
+        if mode == 'record':
+            adapter = RecordingAdapter(session.get_adapter(prefix), store)
+        else:
+            adapter = ReplayAdapter(store)
+        session.mount(prefix, adapter)
+    logger.info("Transporte HTTP en modo %s (%s)", mode, directory)
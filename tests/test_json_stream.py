@@ -0,0 +1,36 @@
+"""Pruebas de src/utils/json_stream.py"""
+import json
+
+import pytest
+
+from src.utils.json_stream import iter_json_array, projecting_hook
+
+DOCUMENT = (
+    '[0.1, -12, 3e5, 1.5E-3, 7, "año ⚽", true, false, null,'
+    ' {"a": [1, 2.25, {"b": "c"}], "d": -0.0}, [], {}, [[1], [2, 3]] ]'
+)
+
+
+@pytest.mark.parametrize("document", [DOCUMENT, DOCUMENT.replace(' ', ''), '[]', '[42]', '[1.25]'])
+def test_every_two_chunk_split_matches_json_loads(document):
+    data = document.encode('utf-8')
+    expected = json.loads(document)
+    # Cada corte posible, incluidos los que parten un número o un carácter UTF-8
+    for cut in range(len(data) + 1):
+        assert list(iter_json_array([data[:cut], data[cut:]])) == expected, cut
+
+
+def test_one_byte_chunks():
+    data = DOCUMENT.encode('utf-8')
+    assert list(iter_json_array(data[i:i + 1] for i in range(len(data)))) == json.loads(DOCUMENT)
+
+
+def test_projecting_hook_keeps_only_fields():
+    chunks = [b'[{"a": 1, "b": {"a": 2, "c": 3}}, ', b'{"c": 4}]']
+    assert list(iter_json_array(chunks, projecting_hook(['a', 'b']))) == [{'a': 1, 'b': {'a': 2}}, {}]
+
+
+@pytest.mark.parametrize("document", ['{"a": 1}', '[1 2]', '[1,', '[0.1x]'])
+def test_invalid_documents_raise(document):
+    with pytest.raises(ValueError):
+        list(iter_json_array([document.encode('utf-8')]))